@@ -0,0 +1,166 @@
+"""
+Video Whisper – Fortschrittskanal für transcribe.py, die Download-Skripte und den Daemon.
+Nur Standardbibliothek: die Download-Skripte laufen damit ohne transcribe.py (numpy, Modell-Konfiguration).
+"""
+import atexit
+import json
+import os
+import socket
+import stat
+import threading
+import time
+from typing import Any, Dict, Optional
+
+PROGRESS_MIN_INTERVAL = 0.1  # ui_spinner liest alle 0,1 s – häufigere Zeilen sieht niemand
+PROGRESS_SOCKET_PREFIX = "unix:"
+
+
+class ProgressChannel:
+    """
+    Fortschrittskanal zu start.sh oder einem anderen Leser, ohne Syscall-Sturm: Aktualisierungen werden
+    gebündelt – höchstens eine pro min_interval, die jeweils letzte gewinnt, ein Timer liefert die
+    zurückgehaltene nach. Phasenwechsel (neues "stage") gehen sofort raus.
+    Ziel (progress_file):
+      Datei        eine Zeile Text für ui_spinner (tail -1): Deskriptor bleibt offen, ein pwrite an Offset 0,
+                   kürzere Zeilen mit Leerzeichen aufgefüllt – kein open/truncate/fsync pro Aktualisierung
+      FIFO         JSON Lines, nicht blockierend (ohne Leser oder bei voller Pipe wird verworfen)
+      unix:<Pfad>  Unix-Datagramm-Socket, ein JSON-Objekt pro Ereignis
+    Ereignis: {"time", "text", "stage", "percent", "bytes", "total_bytes", "speed", "eta", …} – nur gesetzte Felder.
+    """
+
+    def __init__(self, target: str, min_interval: float = PROGRESS_MIN_INTERVAL):
+        self.target = target
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._last_sent = 0.0
+        self._last_stage: Optional[str] = None
+        self._timer: Optional[threading.Timer] = None
+        self._fd: Optional[int] = None
+        self._width = 0
+        self._sock: Optional[socket.socket] = None
+        self._socket_path = target[len(PROGRESS_SOCKET_PREFIX):] if target.startswith(PROGRESS_SOCKET_PREFIX) else None
+        self._fifo = False
+        if self._socket_path is None:
+            try:
+                self._fifo = stat.S_ISFIFO(os.stat(target).st_mode)
+            except OSError:
+                pass
+
+    def send(self, text: str, **fields: Any) -> None:
+        event = {"time": round(time.time(), 3), "text": text, **{k: v for k, v in fields.items() if v is not None}}
+        with self._lock:
+            now = time.monotonic()
+            stage_changed = event.get("stage") is not None and event["stage"] != self._last_stage
+            wait = self.min_interval - (now - self._last_sent)
+            if wait > 0 and not stage_changed:
+                self._pending = event
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            self._pending = None
+            self._deliver(event, now)
+
+    def flush(self) -> None:
+        """Zurückgehaltenes Ereignis sofort ausliefern (Timer, Programmende)."""
+        with self._lock:
+            self._timer = None
+            if self._pending is not None:
+                event, self._pending = self._pending, None
+                self._deliver(event, time.monotonic())
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self.flush()
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+
+    def _deliver(self, event: Dict[str, Any], now: float) -> None:
+        self._last_sent = now
+        if event.get("stage") is not None:
+            self._last_stage = event["stage"]
+        try:
+            if self._socket_path is not None:
+                self._send_datagram(json.dumps(event, ensure_ascii=False).encode("utf-8"))
+            elif self._fifo:
+                self._write_fifo((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+            else:
+                self._write_line(event["text"])
+        except OSError:
+            pass  # Fortschritt ist Beiwerk – nie die Transkription stören
+
+    def _write_line(self, text: str) -> None:
+        if self._fd is None:
+            self._fd = os.open(self.target, os.O_WRONLY | os.O_CREAT, 0o644)
+            self._width = os.fstat(self._fd).st_size
+        data = text.replace("\n", " ").encode("utf-8")
+        # Auffüllen statt ftruncate: ein einziger Syscall, und tail -1 sieht nie eine halbe Zeile
+        data = data.ljust(self._width - 1) + b"\n"
+        os.pwrite(self._fd, data, 0)
+        self._width = max(self._width, len(data))
+
+    def _write_fifo(self, data: bytes) -> None:
+        if self._fd is None:
+            try:
+                self._fd = os.open(self.target, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError:
+                return  # (noch) kein Leser – beim nächsten Ereignis erneut versuchen
+        try:
+            os.write(self._fd, data)
+        except BlockingIOError:
+            pass  # Pipe voll: Leser hängt hinterher, dieses Ereignis verfällt
+        except BrokenPipeError:
+            os.close(self._fd)
+            self._fd = None
+
+    def _send_datagram(self, data: bytes) -> None:
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._sock.setblocking(False)
+        try:
+            self._sock.sendto(data, self._socket_path)
+        except (BlockingIOError, FileNotFoundError, ConnectionRefusedError):
+            pass  # kein Empfänger oder Puffer voll – verwerfen
+
+
+_PROGRESS_CHANNELS: Dict[str, ProgressChannel] = {}
+_PROGRESS_CHANNELS_LOCK = threading.Lock()
+
+
+def progress_channel(target: str) -> ProgressChannel:
+    """Ein Kanal pro Ziel und Prozess (Threads teilen ihn); beim Beenden wird Zurückgehaltenes ausgeliefert."""
+    with _PROGRESS_CHANNELS_LOCK:
+        channel = _PROGRESS_CHANNELS.get(target)
+        if channel is None:
+            channel = _PROGRESS_CHANNELS[target] = ProgressChannel(target)
+        return channel
+
+
+def close_progress_channels(target: Optional[str] = None) -> None:
+    """Zurückgehaltenes ausliefern und schließen – alle Kanäle oder nur den für target."""
+    with _PROGRESS_CHANNELS_LOCK:
+        if target is None:
+            channels = list(_PROGRESS_CHANNELS.values())
+            _PROGRESS_CHANNELS.clear()
+        else:
+            channels = [c for c in (_PROGRESS_CHANNELS.pop(target, None),) if c is not None]
+    for channel in channels:
+        channel.close()
+
+
+atexit.register(close_progress_channels)
+
+
+def write_progress(progress_file: Optional[str], text: str, **fields: Any) -> None:
+    """Text für ui_spinner, dazu strukturierte Felder (stage, percent, bytes, eta, …) für FIFO-/Socket-Leser."""
+    if not progress_file:
+        return
+    progress_channel(progress_file).send(text, **fields)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Video Whisper – Benchmark: Durchsatz der Transkriptions-Pipeline auf dieser Hardware messen.
+Läuft über ein festes Korpus (synthetisch per FFmpeg erzeugt oder eigene Dateien) und variiert
+Modell, Compute-Typ, batch_size und Threads. Jede Kombination läuft in einem eigenen Prozess
+(saubere Messung von Ladezeit und Spitzen-RSS). Ergebnis: Tabelle auf der Konsole + JSON.
+
+Aufruf:
+  benchmark.py [--models tiny,base] [--compute-types int8,float32] [--batch-sizes 4,16] [--threads 0,4]
+               [--corpus ORDNER] [--repeat N] [--language en] [--device cpu] [--json DATEI] [--online]
+Standard ist offline (HF_HUB_OFFLINE=1): Modelle müssen vorher einmal geladen worden sein (z. B. per
+start.sh). Empfohlen vor und nach ./scripts/update.sh, um Regressionen zu erkennen.
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+CORPUS_DIR = PROJECT_DIR / "cache" / "benchmark"
+RESULTS_DIR = PROJECT_DIR / "logs"
+
+# Festes synthetisches Korpus (Dauer in s). Reproduzierbar: gleiche FFmpeg-Ausdrücke, gleicher Seed.
+CORPUS_SECONDS = (30, 90)
+CORPUS_TEXT = (
+    "The quick brown fox jumps over the lazy dog. She sells sea shells by the sea shore. "
+    "Benchmarking speech recognition requires a fixed and reproducible input. "
+)
+# Fallback ohne libflite: stimmähnliches Signal (gleitende Grundfrequenz, Silbenrhythmus ~4 Hz)
+_VOICE_EXPR = (
+    "0.4*sin(2*PI*(140+40*sin(2*PI*0.3*t))*t)*(0.55+0.45*sin(2*PI*4*t))"
+    "+0.15*sin(2*PI*(280+80*sin(2*PI*0.3*t))*t)*(0.55+0.45*sin(2*PI*4*t))"
+)
+
+
+def _ffmpeg_generate(target: Path, seconds: int) -> None:
+    """Korpusdatei als 16 kHz mono WAV erzeugen: Sprachsynthese (flite), sonst synthetisches Signal."""
+    text = (CORPUS_TEXT * (seconds // 8 + 1)).replace(":", " ").replace("'", " ")
+    sources = [
+        ["-f", "lavfi", "-i", f"flite=text='{text}':voice=slt"],
+        ["-f", "lavfi", "-i", f"aevalsrc='{_VOICE_EXPR}':s=16000",
+         "-f", "lavfi", "-i", "anoisesrc=c=pink:a=0.02:seed=42:r=16000"],
+    ]
+    for source in sources:
+        mix = ["-filter_complex", "amix=inputs=2:duration=first"] if source.count("-i") == 2 else []
+        cmd = ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-y", *source, *mix,
+               "-t", str(seconds), "-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le", str(target)]
+        if subprocess.run(cmd, capture_output=True).returncode == 0 and target.is_file() and target.stat().st_size > 0:
+            return
+        target.unlink(missing_ok=True)
+    raise RuntimeError(f"FFmpeg konnte die Korpusdatei nicht erzeugen: {target}")
+
+
+def ensure_corpus(corpus_dir: Path) -> list:
+    """Synthetisches Korpus anlegen (nur fehlende Dateien) und die Dateien sortiert zurückgeben."""
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for idx, seconds in enumerate(CORPUS_SECONDS, start=1):
+        target = corpus_dir / f"corpus-{idx}-{seconds}s.wav"
+        if not target.is_file():
+            print(f"Erzeuge Korpus: {target.name}", file=sys.stderr, flush=True)
+            _ffmpeg_generate(target, seconds)
+        files.append(target)
+    return files
+
+
+def collect_corpus(corpus: Path) -> list:
+    sys.path.insert(0, str(PROJECT_DIR))
+    from transcribe import MEDIA_EXTENSIONS
+
+    files = sorted(p for p in corpus.iterdir() if p.is_file() and p.suffix.lower().lstrip(".") in MEDIA_EXTENSIONS)
+    if not files:
+        raise SystemExit(f"Keine Mediendateien im Korpus: {corpus}")
+    return files
+
+
+# ============================================================================
+# Einzelmessung (läuft im Kindprozess)
+# ============================================================================
+
+def run_case(case: dict, files: list, repeat: int) -> dict:
+    """Eine Parameterkombination messen: Modell laden, Korpus decodieren, repeat-mal transkribieren."""
+    sys.path.insert(0, str(PROJECT_DIR))
+    import transcribe
+
+    import_start = time.perf_counter()
+    transcribe._import_ml()
+    import_seconds = time.perf_counter() - import_start
+
+    logger = logging.getLogger("benchmark")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    config = transcribe.TranscriptionConfig(
+        file_path=Path(files[0]),
+        output_path=CORPUS_DIR,
+        model_size=case["model"],
+        language=case["language"],
+        device=case["device"],
+        compute_type=case["compute_type"],
+        batch_size=case["batch_size"],
+        threads=case["threads"],
+        use_cache=False,
+        use_profile=False,  # gemessen wird genau die Kombination des Falls
+    )
+
+    load_start = time.perf_counter()
+    model = transcribe.load_model(config, logger)
+    load_seconds = time.perf_counter() - load_start
+
+    decode_start = time.perf_counter()
+    audios = [transcribe.load_audio_pcm(Path(f), logger) for f in files]
+    decode_seconds = time.perf_counter() - decode_start
+    audio_seconds = sum(a.shape[0] for a in audios) / transcribe.SAMPLE_RATE
+
+    # Aufwärmen (erste Aufrufe enthalten Lazy-Init von CTranslate2/VAD) – nicht gemessen
+    warmup = transcribe.transcribe_audio(model, config, logger, audio=audios[0][: 10 * transcribe.SAMPLE_RATE])
+    if "batch_size" in warmup:
+        config = replace(config, batch_size=warmup["batch_size"])  # Speichermangel: gesenkter Wert gilt weiter
+
+    walls = []
+    segments = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        segments = 0
+        for audio in audios:
+            result = transcribe.transcribe_audio(model, config, logger, audio=audio)
+            if "batch_size" in result:
+                config = replace(config, batch_size=result["batch_size"])
+            segments += len(result.get("segments", []))
+        walls.append(time.perf_counter() - start)
+
+    wall = statistics.median(walls)
+    return {
+        **case,
+        "status": "ok",
+        "files": len(files),
+        "audio_s": round(audio_seconds, 2),
+        "import_s": round(import_seconds, 3),
+        "load_s": round(load_seconds, 3),
+        "decode_s": round(decode_seconds, 3),
+        "wall_s": round(wall, 3),
+        "wall_runs_s": [round(w, 3) for w in walls],
+        "audio_per_wall": round(audio_seconds / wall, 3) if wall > 0 else None,
+        "rtf": round(wall / audio_seconds, 4) if audio_seconds > 0 else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "segments": segments,
+        # Nach Speichermangel tatsächlich gemessene batch_size (sonst gleich case["batch_size"])
+        "batch_size_used": config.batch_size,
+    }
+
+
+# ============================================================================
+# Sweep (Elternprozess)
+# ============================================================================
+
+def _child_env(threads: int, online: bool) -> dict:
+    env = dict(os.environ)
+    if not online:
+        env.setdefault("HF_HUB_OFFLINE", "1")
+        env.setdefault("TRANSFORMERS_OFFLINE", "1")
+    if threads > 0:
+        # OpenMP/MKL lesen die Variablen beim Import von torch – daher pro Kindprozess setzen
+        env["OMP_NUM_THREADS"] = env["MKL_NUM_THREADS"] = str(threads)
+    return env
+
+
+def measure(case: dict, files: list, repeat: int, online: bool, timeout: float) -> dict:
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--case", json.dumps(case),
+           "--repeat", str(repeat), *[str(f) for f in files]]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, env=_child_env(case["threads"], online),
+                              timeout=timeout or None)
+    except subprocess.TimeoutExpired:
+        return {**case, "status": "error", "error": f"Zeitlimit ({timeout:.0f} s) überschritten"}
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        tail = (proc.stderr.strip().splitlines() or ["unbekannter Fehler"])[-1]
+        return {**case, "status": "error", "error": tail}
+    return json.loads(lines[-1])
+
+
+def format_table(results: list) -> list:
+    header = f"{'Modell':<10} {'Compute':<8} {'Batch':>5} {'Thr':>4} {'Laden s':>8} {'Audio s/s':>10} {'RTF':>7} {'Peak MB':>8}  Status"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        if r["status"] == "ok":
+            lines.append(
+                f"{r['model']:<10} {r['compute_type']:<8} {r['batch_size']:>5} {r['threads'] or '-':>4} "
+                f"{r['load_s']:>8.2f} {r['audio_per_wall']:>10.2f} {r['rtf']:>7.3f} {r['peak_rss_mb']:>8.0f}  OK"
+            )
+        else:
+            lines.append(
+                f"{r['model']:<10} {r['compute_type']:<8} {r['batch_size']:>5} {r['threads'] or '-':>4} "
+                f"{'':>8} {'':>10} {'':>7} {'':>8}  FEHLER: {r['error']}"
+            )
+    return lines
+
+
+def _csv(value: str, cast=str) -> list:
+    return [cast(v.strip()) for v in value.split(",") if v.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="benchmark.py",
+        description="Durchsatz von transcribe.py über Modell/Compute-Typ/batch_size/Threads messen (offline).",
+    )
+    parser.add_argument("--models", default="tiny,base", help="Modelle, kommagetrennt (Standard: tiny,base)")
+    parser.add_argument("--compute-types", default="int8,float32", help="Compute-Typen (Standard: int8,float32)")
+    parser.add_argument("--batch-sizes", default="4,16", help="batch_size-Werte (Standard: 4,16)")
+    parser.add_argument("--threads", default="0", help="Thread-Zahlen, 0 = Vorgabe (Standard: 0)")
+    parser.add_argument("--device", default="cpu", help="Device (Standard: cpu)")
+    parser.add_argument("--language", default="en", help="Feste Sprache, vermeidet Spracherkennung (Standard: en)")
+    parser.add_argument("--corpus", default=None, help="Eigener Korpus-Ordner statt des synthetischen Korpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Messdurchläufe pro Kombination, Median zählt (Standard: 3)")
+    parser.add_argument("--timeout", type=float, default=0, help="Zeitlimit pro Kombination in s (0 = keins)")
+    parser.add_argument("--json", default=None, help="Ergebnis-JSON (Standard: logs/benchmark-<Zeitstempel>.json)")
+    parser.add_argument("--online", action="store_true", help="Modell-Downloads erlauben (Standard: offline)")
+    parser.add_argument("--case", default=None, help=argparse.SUPPRESS)  # intern: Kindprozess
+    parser.add_argument("files", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(json.loads(args.case), args.files, max(1, args.repeat))), flush=True)
+        return
+
+    files = collect_corpus(Path(args.corpus)) if args.corpus else ensure_corpus(CORPUS_DIR)
+    cases = [
+        {"model": m, "compute_type": c, "batch_size": b, "threads": t, "device": args.device,
+         "language": args.language or None}
+        for m, c, b, t in itertools.product(
+            _csv(args.models), _csv(args.compute_types), _csv(args.batch_sizes, int), _csv(args.threads, int)
+        )
+    ]
+    print(f"Korpus: {len(files)} Dateien, {len(cases)} Kombinationen, {args.repeat} Durchläufe je Kombination",
+          file=sys.stderr, flush=True)
+
+    results = []
+    for idx, case in enumerate(cases, start=1):
+        print(f"[{idx}/{len(cases)}] {case['model']} {case['compute_type']} batch={case['batch_size']} "
+              f"threads={case['threads'] or '-'} …", file=sys.stderr, flush=True)
+        results.append(measure(case, files, max(1, args.repeat), args.online, args.timeout))
+
+    print("\n".join(format_table(results)))
+
+    json_path = Path(args.json) if args.json else RESULTS_DIR / f"benchmark-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "corpus": [str(f) for f in files],
+        "repeat": args.repeat,
+        "results": results,
+    }
+    json_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"\nJSON: {json_path}", file=sys.stderr)
+    sys.exit(1 if any(r["status"] != "ok" for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Video Whisper – Download und Transkription überlappend: jede URL wird transkribiert, sobald ihr Download
+fertig ist, während die nächsten Downloads weiterlaufen (Netzwerk und Inferenz laufen gleichzeitig).
+Ein Modell für alle Dateien (wie transcribe.py --batch). Gegendruck: höchstens --max-pending Dateien sind
+gleichzeitig heruntergeladen bzw. im Download, aber noch nicht transkribiert – medien/ läuft nicht voll.
+Im Modus mp3 wird die Originalspur geladen und direkt decodiert (kein Umweg über FFmpegExtractAudio);
+--keep-mp3 erzwingt die MP3-Datei.
+
+Aufruf:
+  download_and_transcribe.py <video|mp3|audio|pcm> <Ausgabeordner> [URL …] [--media-dir medien] [--jobs N]
+                             [--max-pending M] [--base-title T] [--model M] [--language L] [--progress-file F]
+                             [Optionen wie transcribe.py: --formats, --align, --stream, …]
+  URLs als Argumente oder eine pro Zeile auf stdin.
+Mit --progress-file (start.sh) geht die Konsolenausgabe ins Log; auf stdout steht dann pro Eintrag eine Zeile
+(Reihenfolge = Fertigstellung, Nr ab 1): "OK<Tab>Nr<Tab>Sekunden<Tab>Transkript" bzw.
+"FEHLER<Tab>Nr<Tab>Sekunden<Tab>URL oder Datei<Tab>Fehler". Exit-Code 1, wenn ein Eintrag fehlgeschlagen ist.
+"""
+import argparse
+import queue
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+import download_from_url  # noqa: E402  (gleiches Verzeichnis)
+import transcribe  # noqa: E402
+
+DEFAULT_JOBS = 2
+DEFAULT_MAX_PENDING = 4
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(
+        prog="download_and_transcribe.py",
+        description="URLs herunterladen und jede Datei transkribieren, sobald sie da ist.",
+    )
+    parser.add_argument("mode", choices=sorted(download_from_url.EXTENSIONS), help="video, mp3, audio (Originalspur) oder pcm (16 kHz mono WAV)")
+    parser.add_argument("output", help="Ausgabeordner für Transkripte")
+    parser.add_argument("urls", nargs="*", help="URLs (ohne Angabe: von stdin)")
+    parser.add_argument("--media-dir", default=str(PROJECT_DIR / "medien"), help="Zielordner der Downloads (Standard: medien/)")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Gleichzeitige Downloads (Standard: {DEFAULT_JOBS})")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help=f"Höchstens so viele Dateien warten auf die Transkription bzw. laden gerade (Standard: {DEFAULT_MAX_PENDING})")
+    parser.add_argument("--base-title", default="", help='Basis-Titel → "Basis 1", "Basis 2", … (Standard: Videotitel)')
+    parser.add_argument("--keep-mp3", action="store_true", help="Im Modus mp3 wirklich nach MP3 umwandeln")
+    parser.add_argument("--no-meta-cache", action="store_true", help="Metadaten-Cache (cache/downloads/) nicht verwenden")
+    parser.add_argument("-m", "--model", default="small", help="Modell (Standard: small)")
+    parser.add_argument("-l", "--language", default="", help="Sprache (leer = automatische Erkennung)")
+    parser.add_argument("--progress-file", default=None, help="Fortschrittsdatei (für ui_spinner in start.sh)")
+    transcribe._add_pipeline_options(parser)
+    args = parser.parse_intermixed_args(argv)
+    if args.jobs < 1 or args.max_pending < 1:
+        parser.error("--jobs und --max-pending müssen >= 1 sein")
+    if args.model not in transcribe.TranscriptionConfig.SUPPORTED_MODELS:
+        parser.error(f"unbekanntes Modell: {args.model}")
+    urls = [u.strip() for u in (args.urls or sys.stdin.read().splitlines())]
+    args.urls = [u for u in urls if u and not u.startswith("#")]
+    if not args.urls:
+        parser.error("keine URLs angegeben")
+    return args
+
+
+def print_result_line(nr: int, result: "transcribe.BatchItemResult", source: str) -> None:
+    """Maschinenlesbare Ergebniszeile (siehe Modul-Docstring) – auf das echte stdout, auch wenn es ins Log umgeleitet ist."""
+    if result.error is None:
+        fields = ["OK", str(nr), f"{result.seconds:.1f}", str(result.output_file)]
+    else:
+        fields = ["FEHLER", str(nr), f"{result.seconds:.1f}", source, " ".join(result.error.split())]
+    print("\t".join(fields), file=sys.__stdout__, flush=True)
+
+
+def run_pipeline(args, logger) -> int:
+    """
+    Downloads in einem Thread-Pool, Transkription im Hauptthread (ein Modell, aus dem Modell-Cache).
+    Ein Zuführ-Thread startet den nächsten Download erst, wenn ein Platz (--max-pending) frei ist;
+    frei wird er nach der Transkription bzw. sofort bei einem fehlgeschlagenen Download.
+    Gibt die Anzahl Fehler (Download oder Transkription) zurück.
+    """
+    ydl_module = download_from_url._import_yt_dlp()
+    mode = "audio" if args.mode == "mp3" and not args.keep_mp3 else args.mode
+    media_dir = Path(args.media_dir).expanduser().resolve()
+    media_dir.mkdir(parents=True, exist_ok=True)
+    output_path = Path(args.output).expanduser().resolve()
+    output_path.mkdir(parents=True, exist_ok=True)
+    urls = args.urls
+    progress_file = args.progress_file
+    base_title = args.base_title.strip()
+    config_kwargs = transcribe._pipeline_config_kwargs(args)
+
+    slots = threading.BoundedSemaphore(args.max_pending)
+    finished: "queue.Queue[tuple]" = queue.Queue()
+    stop = threading.Event()
+    downloads_done = [0]
+    counter_lock = threading.Lock()
+
+    def download(index: int, url: str) -> None:
+        source = [None]
+
+        def remember_source(info: dict) -> None:
+            source[0] = download_from_url.source_key(info)
+
+        try:
+            path = download_from_url.download_one(
+                ydl_module, url, mode, media_dir, base_title, download_from_url._bulk_suffix(index, base_title),
+                use_cache=not args.no_meta_cache, on_info=remember_source,
+            )
+            finished.put((index, path, None if path else "keine Datei erzeugt", source[0]))
+        except Exception as e:
+            finished.put((index, None, str(e), source[0]))
+        finally:
+            with counter_lock:
+                downloads_done[0] += 1
+
+    def feed(pool: ThreadPoolExecutor) -> None:
+        for index, url in enumerate(urls):
+            # Gegendruck: warten, bis eine Datei transkribiert ist
+            while not slots.acquire(timeout=0.5):
+                if stop.is_set():
+                    return
+            if stop.is_set():
+                return
+            pool.submit(download, index, url)
+
+    first = transcribe.TranscriptionConfig(
+        file_path=media_dir, output_path=output_path, model_size=args.model,
+        language=args.language.strip() or None, **config_kwargs,
+    )
+    load_seconds = 0.0
+
+    def _load():
+        nonlocal load_seconds
+        load_start = time.perf_counter()
+        model = transcribe.get_model(first, logger)
+        load_seconds += time.perf_counter() - load_start
+        return model
+
+    transcribe._silence_console_logging()
+    start = time.perf_counter()
+    results = []
+    pool = ThreadPoolExecutor(max_workers=args.jobs)
+    feeder = threading.Thread(target=feed, args=(pool,), daemon=True)
+    feeder.start()
+    try:
+        for done in range(1, len(urls) + 1):
+            index, path, error, source = finished.get()
+            nr = f"[{index + 1}/{len(urls)}]"
+            if path is None:
+                slots.release()
+                logger.error(f"Pipeline: Download fehlgeschlagen ({urls[index]}): {error}")
+                results.append(transcribe.BatchItemResult(Path(urls[index]), 0.0, error=f"Download: {error}"))
+                if progress_file:
+                    print_result_line(index + 1, results[-1], urls[index])
+                else:
+                    print(f"{nr} {transcribe.C_RED}✗ Download fehlgeschlagen:{transcribe.C_OFF} {urls[index]}", flush=True)
+                continue
+            # Sprach-Cache pro Kanal: Videos einer Quelle sind fast immer in derselben Sprache
+            config = replace(first, file_path=Path(path), language_source=first.language_source or source)
+            logger.info(f"--- Pipeline {nr}: {config.file_path} ---")
+            transcribe._write_progress(progress_file, f"Datei {done}/{len(urls)}: {config.file_path.name} "
+                                                      f"(Downloads {downloads_done[0]}/{len(urls)})")
+            if not progress_file:
+                print(f"{nr} {transcribe.C_BLD}{config.file_path.name}{transcribe.C_OFF}", flush=True)
+            item_start = time.perf_counter()
+            try:
+                output_file = transcribe._transcribe_file(config, _load, logger, progress_file)
+                results.append(transcribe.BatchItemResult(config.file_path, time.perf_counter() - item_start,
+                                                          output_file=output_file))
+                if not progress_file:
+                    print(f"  {transcribe.C_GRN}✓{transcribe.C_OFF} {output_file}", flush=True)
+            except Exception as e:
+                logger.error(f"Pipeline: Transkription fehlgeschlagen ({config.file_path.name}): {e}")
+                logger.debug(traceback.format_exc())
+                results.append(transcribe.BatchItemResult(config.file_path, time.perf_counter() - item_start,
+                                                          error=str(e)))
+                if not progress_file:
+                    print(f"  {transcribe.C_RED}✗ Fehler: {e}{transcribe.C_OFF}", flush=True)
+            finally:
+                slots.release()
+            if progress_file:
+                print_result_line(index + 1, results[-1], str(config.file_path))
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    summary = transcribe._format_batch_summary(results, load_seconds, time.perf_counter() - start)
+    for line in summary:
+        logger.info(line)
+    if not progress_file:
+        print(f"\n{transcribe.C_CYN}{'═'*60}{transcribe.C_OFF}")
+        for line in summary:
+            print(line)
+        print(f"{transcribe.C_CYN}{'═'*60}{transcribe.C_OFF}\n")
+    transcribe._write_progress(progress_file, "100%", stage="done")
+    return sum(1 for r in results if r.error is not None)
+
+
+def main() -> None:
+    args = parse_arguments(sys.argv[1:])
+    logger = transcribe.setup_logging()
+    logger.info("=" * 60)
+    logger.info(f"Video Whisper - Download + Transkription ({len(args.urls)} URLs, {args.mode})")
+    logger.info("=" * 60)
+    log_stream = transcribe._redirect_console_to_log() if args.progress_file else None
+    try:
+        failed = run_pipeline(args, logger)
+    except KeyboardInterrupt:
+        logger.info("Pipeline cancelled by user")
+        sys.exit(130)
+    finally:
+        transcribe._restore_console(log_stream)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,47 @@
 #!/usr/bin/env python3
 """
-Lädt ein Video oder nur Audio (MP3) von einer URL (YouTube u. a. via yt-dlp)
+Lädt ein Video oder nur Audio von einer URL (YouTube u. a. via yt-dlp): mp3, "audio" (Originalspur ohne
+Umwandlung) oder "pcm" (16 kHz mono WAV – liest transcribe.py ohne weiteres Decodieren)
 und gibt den Pfad der heruntergeladenen Datei auf stdout aus.
 Dateiname: standardmäßig Videotitel (bereinigt); bei Kollision "Titel (2).ext" …
   Optional eigener Titel (Einzel-URL) oder Basis-Titel für Bulk → "Basis 1", "Basis 2", …
 yt-dlp erkennt automatisch Einzelvideo vs. Playlist; bei Playlist-URL wird nur ein Video geladen (noplaylist).
-Aufruf: download_from_url.py <url> <video|mp3> [ausgabe_verzeichnis] [fortschrittsdatei] [titel_suffix] [basis_titel]
+Aufruf: download_from_url.py <url> <video|mp3|audio|pcm> [ausgabe_verzeichnis] [fortschrittsdatei] [titel_suffix] [basis_titel]
   titel_suffix: für Bulk z. B. " 1", " 2" → "Basis 1.mp4", "Basis 2.mp4".
   basis_titel: wenn gesetzt, wird dieser statt Videotitel verwendet (Einzel-URL oder Bulk).
+Bulk: download_from_url.py --bulk <video|mp3|audio|pcm> <ausgabe_verzeichnis> [--jobs N] [--base-title T] [--progress-file F] [URL …]
+  URLs als Argumente oder eine pro Zeile auf stdin; N Downloads laufen gleichzeitig (ein Prozess, yt-dlp einmal importiert).
+  --no-meta-cache: Metadaten nicht aus cache/downloads/ lesen/dorthin schreiben (TTL: VIDEO_WHISPER_DL_CACHE_TTL, Standard 3600 s).
+  Pro fertigem Eintrag eine Zeile auf stdout: "OK<Tab>Nr<Tab>Pfad" bzw. "FEHLER<Tab>Nr<Tab>URL" (Nr ab 1, Reihenfolge = Fertigstellung).
+Fortschrittsdatei: auch FIFO oder "unix:<Pfad>" (Datagramm-Socket, JSON-Ereignisse), siehe progress.py.
 """
+import argparse
+import hashlib
+import json
 import re
+import shutil
 import sys
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+import progress  # noqa: E402  (Fortschrittskanal, nur Standardbibliothek)
+
+# audio: Originalspur ohne Umwandlung (Endung laut Format, z. B. m4a/webm) – für die Transkription genügt das
+# pcm: direkt 16 kHz mono PCM-WAV, das Format, das transcribe.py ohne FFmpeg einliest (ein Decode statt zwei)
+EXTENSIONS = {"video": "mp4", "mp3": "mp3", "audio": "m4a", "pcm": "wav"}
+DEFAULT_BULK_JOBS = 3
+
+# Pfade, die in diesem Prozess bereits vergeben sind (Bulk: mehrere Worker wählen gleichzeitig Namen)
+_CLAIM_LOCK = threading.Lock()
+_CLAIMED: set = set()
+
 
 def _sanitize_filename(s: str, max_len: int = 200) -> str:
     """Titel für Dateisystem: Sonderzeichen ersetzen, Länge begrenzen."""
@@ -26,96 +54,109 @@ def _sanitize_filename(s: str, max_len: int = 200) -> str:
 
 
 def _next_free_path(out_dir: Path, base: str, ext: str) -> Path:
-    """Nächsten freien Pfad finden: base.ext, base (2).ext, base (3).ext …"""
-    cand = out_dir / f"{base}.{ext}"
-    if not cand.exists():
-        return cand
-    n = 2
-    while True:
-        cand = out_dir / f"{base} ({n}).{ext}"
-        if not cand.exists():
+    """
+    Nächsten freien Pfad finden und belegen: base.ext, base (2).ext, base (3).ext …
+    Der Pfad wird atomar (O_EXCL) als leere Platzhalterdatei angelegt und im Prozess vorgemerkt –
+    zwei gleichzeitige Downloads (auch aus getrennten Prozessen) bekommen so nie denselben Namen.
+    Der fertige Download ersetzt den Platzhalter (os.replace), bei Fehlschlag räumt _release_path ihn weg.
+    """
+    with _CLAIM_LOCK:
+        n = 1
+        while True:
+            cand = out_dir / (f"{base}.{ext}" if n == 1 else f"{base} ({n}).{ext}")
+            n += 1
+            if cand in _CLAIMED:
+                continue
+            try:
+                fd = os.open(cand, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            _CLAIMED.add(cand)
             return cand
-        n += 1
-
-
-def main():
-    if len(sys.argv) < 3:
-        print(
-            "Aufruf: download_from_url.py <url> <video|mp3> [ausgabe_verzeichnis] [fortschrittsdatei] [titel_suffix] [basis_titel]",
-            file=sys.stderr,
-        )
-        sys.exit(1)
-    url = sys.argv[1].strip()
-    mode = sys.argv[2].strip().lower()
-    out_dir = Path(sys.argv[3]) if len(sys.argv) > 3 else Path.cwd()
-    progress_file = sys.argv[4] if len(sys.argv) > 4 else None
-    title_suffix = (sys.argv[5] or "").strip() if len(sys.argv) > 5 else ""
-    base_override = (sys.argv[6] or "").strip() if len(sys.argv) > 6 else ""
-    out_dir.mkdir(parents=True, exist_ok=True)
 
-    if mode not in ("video", "mp3"):
-        print("Modus muss 'video' oder 'mp3' sein.", file=sys.stderr)
-        sys.exit(1)
 
+def _release_path(path: Path) -> None:
+    """Platzhalter eines fehlgeschlagenen Downloads entfernen (nur wenn leer)."""
     try:
-        import yt_dlp as ydl_module
-    except ImportError:
-        print("yt-dlp fehlt. Bitte: pip install yt-dlp", file=sys.stderr)
-        sys.exit(1)
+        if path.stat().st_size == 0:
+            path.unlink()
+    except OSError:
+        pass
 
-    ext = "mp4" if mode == "video" else "mp3"
+
+def _base_name(info, base_override: str, title_suffix: str) -> str:
+    """Dateiname ohne Endung: eigener Titel bzw. Videotitel (bereinigt) aus den Metadaten + Suffix."""
     if base_override:
         base_from_title = _sanitize_filename(base_override)
     else:
-        base_from_title = "video"
-        try:
-            with ydl_module.YoutubeDL({"quiet": True, "no_warnings": True, "extract_flat": False}) as ydl:
-                info = ydl.extract_info(url, download=False)
-                if info and info.get("title"):
-                    base_from_title = _sanitize_filename(info["title"])
-        except Exception:
-            pass
-
+        base_from_title = _sanitize_filename((info or {}).get("title") or "video")
     base_name = base_from_title + title_suffix
-    if not base_name.strip():
-        base_name = "video"
-    out_path = _next_free_path(out_dir, base_name, ext)
-    outtmpl = str(out_path)
-    downloaded_path = [None]
+    return base_name if base_name.strip() else "video"
 
-    def progress_hook(d):
-        if d.get("status") == "finished" and d.get("filename"):
-            downloaded_path[0] = d["filename"]
-        if progress_file and d.get("status") == "downloading":
-            total = d.get("total_bytes") or d.get("total_bytes_estimate")
-            done = d.get("downloaded_bytes") or 0
-            if total and total > 0:
-                pct = min(100.0, 100.0 * done / total)
-                try:
-                    with open(progress_file, "w", encoding="utf-8") as f:
-                        f.write(" {:5.1f}%\n".format(pct))
-                except OSError:
-                    pass
-            else:
-                try:
-                    with open(progress_file, "w", encoding="utf-8") as f:
-                        mb = done / (1024 * 1024)
-                        f.write(" {:.1f} MB\n".format(mb))
-                except OSError:
-                    pass
-        elif progress_file and d.get("status") == "finished":
-            try:
-                with open(progress_file, "w", encoding="utf-8") as f:
-                    f.write(" 100%\n")
-            except OSError:
-                pass
 
+# ============================================================================
+# Metadaten-Cache (pro URL + Modus, für wiederholte Läufe derselben Liste)
+# ============================================================================
+
+META_CACHE_DIR = PROJECT_DIR / "cache" / "downloads"
+# Gültigkeit in Sekunden; Format-URLs (z. B. YouTube) laufen nach einigen Stunden ab. 0 = aus
+META_CACHE_TTL = float(os.environ.get("VIDEO_WHISPER_DL_CACHE_TTL", "3600") or 0)
+
+
+def _meta_cache_path(url: str, mode: str) -> Path:
+    # Modus gehört zum Schlüssel: die Formatauswahl in den Metadaten hängt von ihm ab
+    return META_CACHE_DIR / (hashlib.sha256(f"{mode}\n{url}".encode("utf-8")).hexdigest()[:32] + ".json")
+
+
+def load_cached_info(url: str, mode: str):
+    """Gespeicherte Metadaten einer URL, wenn jünger als META_CACHE_TTL (sonst None)."""
+    if META_CACHE_TTL <= 0:
+        return None
+    path = _meta_cache_path(url, mode)
+    try:
+        if time.time() - path.stat().st_mtime > META_CACHE_TTL:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_info(url: str, mode: str, info: dict) -> None:
+    if META_CACHE_TTL <= 0:
+        return
+    path = _meta_cache_path(url, mode)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(info, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _ydl_options(mode: str, outtmpl: str, progress_hook) -> dict:
+    """Gemeinsame yt-dlp-Optionen für Einzel- und Bulk-Download."""
     # noplaylist: Bei Playlist-URL nur ein Video laden (Einzel-URL = eine Datei)
-    if mode == "mp3":
-        ydl_opts = {
+    opts = {
+        "outtmpl": outtmpl,
+        "noplaylist": True,
+        "quiet": True,
+        "no_warnings": True,
+        "noprogress": True,  # Fortschritt kommt über progress_hooks, stderr bleibt für Fehler
+        "progress_hooks": [progress_hook],
+    }
+    if mode == "audio":
+        opts["format"] = "bestaudio/best"
+    elif mode == "pcm":
+        opts.update({
+            "format": "bestaudio/best",
+            "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "wav"}],
+            "postprocessor_args": {"extractaudio+ffmpeg_o": ["-ar", "16000", "-ac", "1", "-acodec", "pcm_s16le"]},
+        })
+    elif mode == "mp3":
+        opts.update({
             "format": "bestaudio/best",
-            "outtmpl": outtmpl,
-            "noplaylist": True,
             "postprocessors": [
                 {
                     "key": "FFmpegExtractAudio",
@@ -123,53 +164,308 @@ def main():
                     "preferredquality": "192",
                 }
             ],
-            "quiet": True,
-            "no_warnings": True,
-            "progress_hooks": [progress_hook],
-        }
+        })
     else:
-        ydl_opts = {
+        opts.update({
             "format": "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
-            "outtmpl": outtmpl,
             "merge_output_format": "mp4",
-            "noplaylist": True,
-            "quiet": True,
-            "no_warnings": True,
-            "progress_hooks": [progress_hook],
-        }
+        })
+    return opts
+
+
+def _progress_text(d: dict):
+    """Fortschritt eines yt-dlp-Hooks als kurzer Text (" 42.0%", " 3.1 MB", " 100%") oder None."""
+    if d.get("status") == "downloading":
+        total = d.get("total_bytes") or d.get("total_bytes_estimate")
+        done = d.get("downloaded_bytes") or 0
+        if total and total > 0:
+            return " {:5.1f}%".format(min(100.0, 100.0 * done / total))
+        return " {:.1f} MB".format(done / (1024 * 1024))
+    if d.get("status") == "finished":
+        return " 100%"
+    return None
+
+
+def _progress_fields(d: dict) -> dict:
+    """Strukturierte Felder eines yt-dlp-Hooks für den Fortschrittskanal (Bytes, Gesamtgröße, Rate, ETA)."""
+    total = d.get("total_bytes") or d.get("total_bytes_estimate")
+    done = d.get("downloaded_bytes")
+    return {
+        "stage": "download",
+        "bytes": done,
+        "total_bytes": total,
+        "percent": round(100.0 * done / total, 1) if done is not None and total else None,
+        "speed": d.get("speed"),
+        "eta": d.get("eta"),
+    }
+
+
+def source_key(info: dict):
+    """Quelle für den Sprach-Cache von transcribe.py: Extractor + Kanal/Uploader (z. B. "Youtube:UC…"), sonst None."""
+    owner = info.get("channel_id") or info.get("uploader_id") or info.get("channel") or info.get("uploader")
+    if not owner:
+        return None
+    return f"{info.get('extractor_key') or info.get('extractor') or 'web'}:{owner}"
+
+
+def download_one(ydl_module, url: str, mode: str, out_dir: Path, base_override: str = "", title_suffix: str = "",
+                 on_progress=None, use_cache: bool = True, on_info=None):
+    """
+    Eine URL nach out_dir laden; gibt den absoluten Pfad zurück (None, wenn keine Datei entstand).
+    Die URL wird genau einmal aufgelöst: extract_info liefert Titel (Dateiname) und Formate, der Download
+    läuft danach mit denselben Metadaten über process_ie_result. Mit use_cache kommen die Metadaten bei
+    wiederholten Läufen aus cache/downloads/ – sind sie veraltet, wird die URL einmal neu aufgelöst.
+    yt-dlp arbeitet in einem privaten Temp-Ordner in out_dir: Zwischendateien (z. B. Titel.webm vor der
+    Umwandlung nach mp3/wav) kollidieren so nie mit vorhandenen Dateien gleichen Namens. Das Ergebnis ersetzt
+    danach den belegten Platzhalter (bzw. bekommt einen eigenen freien Namen, falls die Endung abweicht).
+    Wirft die Exception von yt-dlp weiter, wenn keine Datei vorhanden ist.
+    on_info (optional) erhält die aufgelösten Metadaten, bevor der Download beginnt.
+    on_progress (optional) erhält pro Hook-Aufruf den Text (" 42.0%") und die Felder aus _progress_fields.
+    """
+    downloaded_path = [None]
 
+    def progress_hook(d):
+        if d.get("status") == "finished" and d.get("filename"):
+            downloaded_path[0] = d["filename"]
+        if on_progress is not None:
+            # Wird pro Datenblock aufgerufen (hunderte Male pro Sekunde) – gebündelt wird im Fortschrittskanal
+            text = _progress_text(d)
+            if text is not None:
+                on_progress(text, **_progress_fields(d))
+
+    with ydl_module.YoutubeDL(_ydl_options(mode, "%(title)s.%(ext)s", progress_hook)) as ydl:
+        info = load_cached_info(url, mode) if use_cache else None
+        from_cache = info is not None
+        if info is None:
+            info = ydl.sanitize_info(ydl.extract_info(url, download=False), remove_private_keys=True)
+            if use_cache:
+                store_cached_info(url, mode, info)
+        if on_info is not None:
+            on_info(info)
+
+        ext = (info.get("ext") or EXTENSIONS[mode]) if mode == "audio" else EXTENSIONS[mode]
+        base = _base_name(info, base_override, title_suffix)
+        out_path = _next_free_path(out_dir, base, ext)
+        work_dir = Path(tempfile.mkdtemp(prefix=".download-", dir=out_dir))
+        # %(ext)s statt fester Endung: yt-dlp hängt sonst bei abweichendem Container eine zweite an ("x.mp3.webm")
+        ydl.params["outtmpl"]["default"] = str(work_dir / out_path.stem) + ".%(ext)s"
+        error = None
+        try:
+            try:
+                try:
+                    ydl.process_ie_result(info, download=True)
+                except Exception:
+                    if not from_cache:
+                        raise
+                    # Gecachte Format-URLs abgelaufen o. Ä.: einmal frisch auflösen (wie download_with_info_file)
+                    ydl.download([url])
+            except Exception as e:
+                error = e
+            path = _move_result(_resolve_path(downloaded_path[0], work_dir / out_path.name, work_dir), out_path, base)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    if path != str(out_path.resolve()):
+        _release_path(out_path)
+    if error is not None:
+        if not path:
+            raise error
+        print(f"Fehler: {error}", file=sys.stderr)
+    return path
+
+
+def _move_result(found, out_path: Path, base: str):
+    """
+    Fertige Datei aus dem Temp-Ordner nach out_path (ersetzt den Platzhalter); weicht die Endung ab
+    (Originalspur in anderem Container), bekommt sie einen eigenen freien Namen. Gibt den Pfad zurück.
+    """
+    if not found:
+        return None
+    found = Path(found)
+    target = out_path if found.suffix == out_path.suffix else _next_free_path(out_path.parent, base, found.suffix.lstrip("."))
+    os.replace(found, target)
+    return str(target.resolve())
+
+
+def _import_yt_dlp():
     try:
-        with ydl_module.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-        path = _resolve_path(downloaded_path[0], out_path)
-        if path:
-            print(str(path), flush=True)
-            sys.exit(0)
-        print("Download fehlgeschlagen oder keine Datei erzeugt.", file=sys.stderr)
+        import yt_dlp as ydl_module
+    except ImportError:
+        print("yt-dlp fehlt. Bitte: pip install yt-dlp", file=sys.stderr)
+        sys.exit(1)
+    return ydl_module
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--bulk":
+        main_bulk(sys.argv[2:])
+        return
+    if len(sys.argv) < 3:
+        print(
+            "Aufruf: download_from_url.py <url> <video|mp3|audio|pcm> [ausgabe_verzeichnis] [fortschrittsdatei] [titel_suffix] [basis_titel]",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    url = sys.argv[1].strip()
+    mode = sys.argv[2].strip().lower()
+    out_dir = Path(sys.argv[3]) if len(sys.argv) > 3 else Path.cwd()
+    progress_file = sys.argv[4] if len(sys.argv) > 4 else None
+    title_suffix = (sys.argv[5] or "").strip() if len(sys.argv) > 5 else ""
+    base_override = (sys.argv[6] or "").strip() if len(sys.argv) > 6 else ""
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if mode not in EXTENSIONS:
+        print("Modus muss 'video', 'mp3', 'audio' oder 'pcm' sein.", file=sys.stderr)
         sys.exit(1)
+
+    ydl_module = _import_yt_dlp()
+    on_progress = (lambda text, **fields: progress.write_progress(progress_file, text, **fields)) if progress_file else None
+    try:
+        path = download_one(ydl_module, url, mode, out_dir, base_override, title_suffix, on_progress)
     except Exception as e:
         print(f"Fehler: {e}", file=sys.stderr)
-        path = _resolve_path(downloaded_path[0], out_path)
-        if path:
-            print(str(path), file=sys.stderr)
-            print(str(path), flush=True)
-            sys.exit(0)
         sys.exit(1)
+    if path:
+        print(str(path), flush=True)
+        sys.exit(0)
+    print("Download fehlgeschlagen oder keine Datei erzeugt.", file=sys.stderr)
+    sys.exit(1)
 
 
-def _resolve_path(downloaded_path, expected_path):
-    """Absoluten Pfad zur Datei: zuerst erwarteter Pfad, sonst neueste Datei im Ordner."""
-    if isinstance(expected_path, Path) and expected_path.is_file():
-        return str(expected_path.resolve())
-    if downloaded_path and os.path.isfile(downloaded_path):
-        return str(Path(downloaded_path).resolve())
-    out_dir = Path(expected_path).parent if isinstance(expected_path, Path) else Path(downloaded_path or ".").parent
-    if not out_dir.is_dir():
-        return None
-    files = [f for f in out_dir.iterdir() if f.is_file()]
+# ============================================================================
+# Bulk: mehrere URLs gleichzeitig
+# ============================================================================
+
+class BulkProgress:
+    """
+    Fortschritt aller laufenden Downloads in einer Zeile (für ui_spinner: letzte Zeile der Datei),
+    z. B. "2/5 fertig │ #3  41.0% │ #4 12.3 MB". Weitergereicht wird nur, wenn sich die Zeile ändert;
+    der Fortschrittskanal bündelt zusätzlich auf höchstens eine Aktualisierung pro 0,1 s.
+    """
+
+    def __init__(self, progress_file, total: int):
+        self.progress_file = progress_file
+        self.total = total
+        self.done = 0
+        self.running: dict = {}
+        self.fields: dict = {}
+        self.lock = threading.Lock()
+        self.last_line = ""
+
+    def update(self, nr: int, text: str, **fields) -> None:
+        with self.lock:
+            self.running[nr] = text.strip()
+            self.fields[nr] = {k: v for k, v in fields.items() if k != "stage" and v is not None}
+            self._flush()
+
+    def finish(self, nr: int) -> None:
+        with self.lock:
+            self.running.pop(nr, None)
+            self.fields.pop(nr, None)
+            self.done += 1
+            self._flush()
+
+    def _flush(self) -> None:
+        parts = [f"{self.done}/{self.total} fertig"]
+        parts += [f"#{nr} {text}" for nr, text in sorted(self.running.items())]
+        line = " │ ".join(parts)
+        if line != self.last_line and self.progress_file:
+            self.last_line = line
+            progress.write_progress(self.progress_file, line, stage="download", done=self.done, total=self.total,
+                                    items={str(nr): f for nr, f in sorted(self.fields.items())})
+
+
+def _bulk_suffix(index: int, base_title: str) -> str:
+    """Wie bisher in start.sh: mit Basis-Titel " 1", " 2", …; ohne erst ab dem zweiten Eintrag."""
+    if base_title or index > 0:
+        return f" {index + 1}"
+    return ""
+
+
+def download_bulk(urls: list, mode: str, out_dir: Path, jobs: int = DEFAULT_BULK_JOBS, base_title: str = "",
+                  progress_file=None, on_result=None, use_cache: bool = True) -> list:
+    """
+    URLs mit höchstens `jobs` gleichzeitigen Downloads laden (Threads; yt-dlp wird einmal importiert,
+    jeder Download bekommt eine eigene YoutubeDL-Instanz mit denselben Optionen).
+    Ergebnis in Eingabereihenfolge: Pfad oder None. on_result(nr, url, path, error) sofort pro Eintrag.
+    """
+    ydl_module = _import_yt_dlp()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    bulk_progress = BulkProgress(progress_file, len(urls))
+    results: list = [None] * len(urls)
+
+    def work(index: int, url: str):
+        nr = index + 1
+        bulk_progress.update(nr, "…")
+        try:
+            return download_one(ydl_module, url, mode, out_dir, base_title, _bulk_suffix(index, base_title),
+                                lambda text, **fields: bulk_progress.update(nr, text, **fields), use_cache=use_cache)
+        finally:
+            bulk_progress.finish(nr)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(work, i, url): i for i, url in enumerate(urls)}
+        for future in as_completed(futures):
+            index = futures[future]
+            error = None
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                error = str(e)
+            if on_result is not None:
+                on_result(index + 1, urls[index], results[index], error)
+    return results
+
+
+def main_bulk(argv: list) -> None:
+    parser = argparse.ArgumentParser(
+        prog="download_from_url.py --bulk",
+        description="Mehrere URLs gleichzeitig herunterladen (URLs als Argumente oder eine pro Zeile auf stdin).",
+    )
+    parser.add_argument("mode", choices=sorted(EXTENSIONS), help="video, mp3, audio (Originalspur) oder pcm (16 kHz mono WAV)")
+    parser.add_argument("out_dir", help="Ausgabeverzeichnis")
+    parser.add_argument("urls", nargs="*", help="URLs (ohne Angabe: von stdin)")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_BULK_JOBS,
+                        help=f"Gleichzeitige Downloads (Standard: {DEFAULT_BULK_JOBS})")
+    parser.add_argument("--base-title", default="", help='Basis-Titel → "Basis 1", "Basis 2", … (Standard: Videotitel)')
+    parser.add_argument("--progress-file", default=None, help="Fortschrittszeile für ui_spinner")
+    parser.add_argument("--no-meta-cache", action="store_true", help="Metadaten-Cache (cache/downloads/) nicht verwenden")
+    args = parser.parse_intermixed_args(argv)
+
+    urls = [u.strip() for u in (args.urls or sys.stdin.read().splitlines())]
+    urls = [u for u in urls if u and not u.startswith("#")]
+    if not urls:
+        print("Keine URLs angegeben.", file=sys.stderr)
+        sys.exit(1)
+
+    print_lock = threading.Lock()
+
+    def on_result(nr, url, path, error):
+        with print_lock:
+            if path:
+                print(f"OK\t{nr}\t{path}", flush=True)
+            else:
+                print(f"Fehler [{nr}] {url}: {error or 'keine Datei erzeugt'}", file=sys.stderr, flush=True)
+                print(f"FEHLER\t{nr}\t{url}", flush=True)
+
+    results = download_bulk(urls, args.mode, Path(args.out_dir), args.jobs, args.base_title.strip(),
+                            args.progress_file, on_result, use_cache=not args.no_meta_cache)
+    sys.exit(0 if any(results) else 1)
+
+
+def _resolve_path(downloaded_path, expected_path: Path, work_dir: Path):
+    """
+    Ergebnis im Temp-Ordner: zuerst der erwartete Pfad, dann der von yt-dlp gemeldete, sonst die neueste
+    fertige Datei darin (der Ordner gehört nur diesem Download). None, wenn nichts entstanden ist.
+    """
+    if expected_path.is_file() and expected_path.stat().st_size > 0:
+        return expected_path
+    if downloaded_path and os.path.isfile(downloaded_path) and Path(downloaded_path).parent == work_dir:
+        return Path(downloaded_path)
+    files = [f for f in work_dir.iterdir()
+             if f.is_file() and f.stat().st_size > 0 and f.suffix not in (".part", ".ytdl")]
     if not files:
         return None
-    return str(max(files, key=lambda p: p.stat().st_mtime).resolve())
+    return max(files, key=lambda p: p.stat().st_mtime)
 
 
 if __name__ == "__main__":
@@ -9,14 +9,15 @@ get_state_path() {
     echo "${SCRIPT_DIR}/.video_whisper_state"
 }
 
-# Prüft, ob Video Whisper installiert ist (venv existiert + whisperx importierbar).
+# Prüft, ob Video Whisper installiert ist (venv existiert + whisperx/torch vorhanden).
+# transcribe.py --check kommt ohne den mehrsekündigen Import von torch/whisperx aus.
 # Rückgabe: 0 = installiert, 1 = nicht installiert
 is_installed() {
     local venv_path="${VENV_PATH:-${SCRIPT_DIR}/venv}"
     if [ ! -d "$venv_path" ] || [ ! -x "${venv_path}/bin/python3" ]; then
         return 1
     fi
-    if ! "${venv_path}/bin/python3" -c "import whisperx" 2>/dev/null; then
+    if ! "${venv_path}/bin/python3" "${SCRIPT_DIR}/transcribe.py" --check --quiet 2>/dev/null; then
         return 1
     fi
     return 0
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Video Whisper – Volltextsuche über alle Transkripte (SQLite/FTS5-Speicher transcripts.db).
+Jeder Lauf von transcribe.py trägt seine Segmente dort ein (--no-store schaltet das ab); die Suche
+liefert Datei, Start und Ende in Millisekunden und den Segmenttext.
+
+Aufruf:
+  search_transcripts.py "Suchbegriff" [--limit N] [--language de] [--file Teil] [--raw] [--json] [--db PFAD]
+  search_transcripts.py --stats
+  search_transcripts.py --add <Transkript.json> [<Medien-Datei>]   vorhandenes JSON-Transkript eintragen
+Standard: Phrasensuche (Wörter in dieser Reihenfolge). --raw: FTS5-Syntax (AND, OR, NOT, NEAR, Präfix*).
+"""
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+import transcribe  # noqa: E402
+
+
+def _clock_ms(ms: int) -> str:
+    seconds, ms = divmod(int(ms), 1000)
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}.{ms:03d}" if hours else f"{rest // 60}:{rest % 60:02d}.{ms:03d}"
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(
+        prog="search_transcripts.py",
+        description="Phrase in allen Transkripten finden (Datei + Start/Ende in ms).",
+    )
+    parser.add_argument("query", nargs="?", help="Suchbegriff bzw. Phrase")
+    parser.add_argument("-n", "--limit", type=int, default=50, help="Höchstens so viele Treffer (Standard: 50)")
+    parser.add_argument("-l", "--language", default=None, help="Nur Transkripte dieser Sprache")
+    parser.add_argument("-f", "--file", default=None, help="Nur Quelldateien, deren Pfad diesen Text enthält")
+    parser.add_argument("--raw", action="store_true", help="Suchbegriff als FTS5-Ausdruck (AND, OR, NEAR, Präfix*)")
+    parser.add_argument("--json", action="store_true", help="Treffer als JSON Lines ausgeben")
+    parser.add_argument("--db", default=None, help="Datenbank (Standard: $VIDEO_WHISPER_STORE oder transcripts.db)")
+    parser.add_argument("--stats", action="store_true", help="Umfang des Speichers anzeigen")
+    parser.add_argument("--add", nargs="+", metavar="DATEI",
+                        help="JSON-Transkript (--formats json) eintragen; optional die Mediendatei als Quelle")
+    args = parser.parse_args(argv)
+    if not (args.query or args.stats or args.add):
+        parser.error("Suchbegriff, --stats oder --add angeben")
+    if args.add and len(args.add) > 2:
+        parser.error("--add erwartet <Transkript.json> [<Medien-Datei>]")
+    return args
+
+
+def add_json(store: "transcribe.TranscriptStore", json_path: Path, source: Path) -> int:
+    result = json.loads(json_path.read_text(encoding="utf-8"))
+    return store.put(source.resolve(), result, json_path.resolve())
+
+
+def print_hits(hits, as_json: bool) -> None:
+    if as_json:
+        for hit in hits:
+            print(json.dumps(hit, ensure_ascii=False))
+        return
+    for hit in hits:
+        speaker = f"[{hit['speaker']}] " if hit["speaker"] else ""
+        print(f"{transcribe.C_BLD}{hit['source']}{transcribe.C_OFF}  "
+              f"{transcribe.C_CYN}{_clock_ms(hit['start_ms'])}–{_clock_ms(hit['end_ms'])}{transcribe.C_OFF} "
+              f"{transcribe.C_DIM}({hit['start_ms']}–{hit['end_ms']} ms){transcribe.C_OFF}")
+        print(f"  {speaker}{hit['text']}")
+
+
+def main() -> None:
+    args = parse_arguments(sys.argv[1:])
+    try:
+        store = transcribe.TranscriptStore(Path(args.db).expanduser() if args.db else None)
+    except sqlite3.Error as e:
+        print(f"Datenbank nicht lesbar: {e}", file=sys.stderr)
+        sys.exit(1)
+    with store:
+        if args.add:
+            json_path = Path(args.add[0]).expanduser()
+            source = Path(args.add[1]).expanduser() if len(args.add) > 1 else json_path
+            try:
+                count = add_json(store, json_path, source)
+            except (OSError, ValueError) as e:
+                print(f"Transkript nicht lesbar: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(f"{transcribe.C_GRN}✓{transcribe.C_OFF} {count} Segmente eingetragen ({source})")
+        if args.stats:
+            info = store.stats()
+            print(f"{transcribe.C_BLD}Speicher:{transcribe.C_OFF} {info['path']}")
+            print(f"  Dateien:  {info['files']}")
+            print(f"  Segmente: {info['segments']}")
+            print(f"  Größe:    {info['bytes'] / 1024 / 1024:.1f} MB" + ("" if info["fts5"] else " (ohne FTS5: LIKE-Suche)"))
+        if args.query:
+            try:
+                hits = store.search(args.query, args.limit, args.language, args.file, args.raw)
+            except sqlite3.OperationalError as e:
+                print(f"Ungültige Suche: {e}", file=sys.stderr)
+                sys.exit(2)
+            print_hits(hits, args.json)
+            if not hits:
+                sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Video Whisper – Transkriptions-Daemon: langlebiger Prozess mit Job-Warteschlange und warmen Modellen.
+Modelle bleiben nach dem ersten Job geladen (Schlüssel: Modell, Device, Compute-Typ), weitere Jobs
+sparen Import- und Ladezeit. Kommunikation über einen Unix-Socket (eine JSON-Zeile pro Anfrage/Antwort).
+
+Aufruf:
+  transcribe_daemon.py serve                 Daemon starten (läuft im Vordergrund; mit & in den Hintergrund)
+  transcribe_daemon.py submit [--wait] <Eingabedatei> <Ausgabeordner> [Modell] [Sprache] [Fortschrittsdatei] [Optionen]
+                                             Job einreihen (Parameter/Optionen wie transcribe.py); --wait: auf Ende warten
+  transcribe_daemon.py status [job_id]       Status aller Jobs bzw. eines Jobs (JSON)
+  transcribe_daemon.py ping                  Exit 0, wenn ein Daemon erreichbar ist
+  transcribe_daemon.py stop                  Daemon beenden
+Socket: $VIDEO_WHISPER_SOCKET, sonst $XDG_RUNTIME_DIR (bzw. /tmp)/video-whisper-<uid>.sock
+"""
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def default_socket_path() -> Path:
+    """Socket-Pfad: kurz halten (Unix-Sockets erlauben max. ~108 Zeichen)."""
+    env = os.environ.get("VIDEO_WHISPER_SOCKET", "").strip()
+    if env:
+        return Path(env)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return Path(runtime_dir) / f"video-whisper-{os.getuid()}.sock"
+
+
+# ============================================================================
+# Client
+# ============================================================================
+
+def request(sock_path: Path, payload: dict, timeout: float = 5.0) -> dict:
+    """Eine Anfrage senden, eine Antwort (JSON-Zeile) lesen."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(sock_path))
+        s.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        with s.makefile("r", encoding="utf-8") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("Keine Antwort vom Daemon")
+    return json.loads(line)
+
+
+def is_running(sock_path: Path) -> bool:
+    try:
+        return request(sock_path, {"cmd": "ping"}, timeout=1.0).get("ok", False)
+    except (OSError, ValueError):
+        return False
+
+
+def submit_and_wait(sock_path: Path, job: dict, wait: bool) -> int:
+    reply = request(sock_path, {"cmd": "submit", "job": job})
+    if not reply.get("ok"):
+        print(f"Fehler: {reply.get('error', 'unbekannt')}", file=sys.stderr)
+        return 1
+    job_id = reply["job"]["id"]
+    if not wait:
+        print(job_id, flush=True)
+        return 0
+    while True:
+        time.sleep(0.5)
+        info = request(sock_path, {"cmd": "status", "id": job_id}).get("job") or {}
+        state = info.get("state")
+        if state == "done":
+            print(info.get("output_file", ""), flush=True)
+            return 0
+        if state == "failed" or state is None:
+            print(f"Fehler: {info.get('error', 'Job unbekannt')}", file=sys.stderr)
+            return 1
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+class JobQueue:
+    """Jobs nacheinander abarbeiten (ein Worker-Thread); Status bleibt für Abfragen erhalten."""
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.jobs: dict = {}
+        self.configs: dict = {}
+        self.pending: "queue.Queue[str]" = queue.Queue()
+        self.lock = threading.Lock()
+        self.worker = threading.Thread(target=self._work, daemon=True)
+        self.worker.start()
+
+    def submit(self, params: dict) -> dict:
+        """Job anlegen: argv wird wie die Kommandozeile von transcribe.py geparst (gleiche Parameter/Optionen)."""
+        import transcribe
+
+        argv = [str(a) for a in params.get("argv") or []]
+        cwd = Path(params.get("cwd") or "/")
+        try:
+            config, progress_file = transcribe.parse_arguments(argv, cwd=cwd)
+        except SystemExit:
+            raise ValueError(f"Ungültige Argumente: {' '.join(argv)}")
+        job = {
+            "id": uuid.uuid4().hex[:12],
+            "state": "queued",
+            "file": str(config.file_path),
+            "output": str(config.output_path),
+            "model": config.model_size,
+            "language": config.language,
+            "argv": argv,
+            "progress_file": progress_file,
+            "submitted_at": time.time(),
+        }
+        with self.lock:
+            self.jobs[job["id"]] = job
+            self.configs[job["id"]] = config
+        self.pending.put(job["id"])
+        self.logger.info(f"Daemon: Job {job['id']} eingereiht ({job['file']})")
+        return dict(job)
+
+    def status(self, job_id=None):
+        with self.lock:
+            if job_id:
+                job = self.jobs.get(job_id)
+                return dict(job) if job else None
+            queued = [j["id"] for j in self.jobs.values() if j["state"] == "queued"]
+            return [dict(j, queue_position=(queued.index(j["id"]) + 1 if j["id"] in queued else 0))
+                    for j in self.jobs.values()]
+
+    def _work(self) -> None:
+        import progress
+        import transcribe
+
+        while True:
+            job_id = self.pending.get()
+            with self.lock:
+                job = self.jobs[job_id]
+                config = self.configs.pop(job_id)
+                job["state"] = "running"
+                job["started_at"] = time.time()
+            try:
+                config.validate()
+                output_file = transcribe._transcribe_file(
+                    config, lambda: transcribe.get_model(config, self.logger), self.logger, job["progress_file"]
+                )
+                progress.write_progress(job["progress_file"], "100%", stage="done")
+                with self.lock:
+                    job.update(state="done", output_file=str(output_file))
+            except Exception as e:
+                self.logger.error(f"Daemon: Job {job_id} fehlgeschlagen: {e}")
+                self.logger.debug(traceback.format_exc())
+                with self.lock:
+                    job.update(state="failed", error=str(e))
+            finally:
+                # Fortschrittsdateien gehören dem Client (mktemp) – Deskriptor pro Job wieder freigeben
+                progress.close_progress_channels(job["progress_file"])
+                with self.lock:
+                    job["finished_at"] = time.time()
+                    job["seconds"] = round(job["finished_at"] - job["started_at"], 2)
+                self.logger.info(f"Daemon: Job {job_id} → {job['state']} ({job['seconds']} s)")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            msg = json.loads(line)
+            reply = self.server.dispatch(msg)
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, sock_path: Path, jobs: JobQueue):
+        self.jobs = jobs
+        super().__init__(str(sock_path), _Handler)
+
+    def dispatch(self, msg: dict) -> dict:
+        cmd = msg.get("cmd")
+        if cmd == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if cmd == "submit":
+            return {"ok": True, "job": self.jobs.submit(msg.get("job") or {})}
+        if cmd == "status":
+            if msg.get("id"):
+                return {"ok": True, "job": self.jobs.status(msg["id"])}
+            return {"ok": True, "jobs": self.jobs.status()}
+        if cmd == "stop":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unbekannter Befehl: {cmd}"}
+
+
+def serve(sock_path: Path) -> int:
+    if is_running(sock_path):
+        print(f"Daemon läuft bereits: {sock_path}", file=sys.stderr)
+        return 1
+    sock_path.unlink(missing_ok=True)  # verwaister Socket eines abgestürzten Daemons
+
+    sys.path.insert(0, str(PROJECT_DIR))
+    import transcribe
+
+    logger = transcribe.setup_logging()
+    transcribe._silence_console_logging()
+    jobs = JobQueue(logger)
+    # Socket schon beim bind nur für diesen Benutzer anlegen – ein nachträgliches chmod ließe ein Zeitfenster,
+    # in dem andere lokale Benutzer Jobs unter unserer Kennung einreichen könnten
+    old_umask = os.umask(0o077)
+    try:
+        server = DaemonServer(sock_path, jobs)
+    finally:
+        os.umask(old_umask)
+    os.chmod(sock_path, 0o600)
+    logger.info(f"Daemon gestartet: {sock_path} (PID {os.getpid()})")
+    print(f"Daemon läuft: {sock_path}", flush=True)
+
+    # Ab hier nur noch ins Log (tqdm/Bibliotheken)
+    log_stream = transcribe._redirect_console_to_log()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        sock_path.unlink(missing_ok=True)
+        logger.info("Daemon beendet")
+        transcribe._restore_console(log_stream)
+    return 0
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if not args or args[0] not in ("serve", "submit", "status", "ping", "stop"):
+        print(__doc__.strip().split("\n\nAufruf:")[-1], file=sys.stderr)
+        sys.exit(1)
+    cmd, rest = args[0], args[1:]
+    sock_path = default_socket_path()
+
+    if cmd == "serve":
+        sys.exit(serve(sock_path))
+    if cmd == "ping":
+        sys.exit(0 if is_running(sock_path) else 1)
+    if not is_running(sock_path):
+        print(f"Kein Daemon erreichbar ({sock_path}). Starten: scripts/transcribe_daemon.py serve", file=sys.stderr)
+        sys.exit(1)
+    if cmd == "stop":
+        request(sock_path, {"cmd": "stop"})
+        sys.exit(0)
+    if cmd == "status":
+        reply = request(sock_path, {"cmd": "status", "id": rest[0] if rest else None})
+        print(json.dumps(reply.get("job") if rest else reply.get("jobs"), indent=2, ensure_ascii=False))
+        sys.exit(0)
+
+    wait = "--wait" in rest
+    rest = [a for a in rest if a != "--wait"]
+    if len(rest) < 2:
+        print("Aufruf: transcribe_daemon.py submit [--wait] <Eingabedatei> <Ausgabeordner> [Modell] [Sprache] [Fortschrittsdatei] [Optionen]",
+              file=sys.stderr)
+        sys.exit(1)
+    # Relative Pfade löst der Daemon gegen das Arbeitsverzeichnis des Clients auf
+    job = {"argv": rest, "cwd": os.getcwd()}
+    sys.exit(submit_and_wait(sock_path, job, wait))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 #!/usr/bin/env bash
-# Video Whisper – Vollständiger Rückbau: Projekt-Ressourcen (venv, State, txt, logs) und
+# Video Whisper – Vollständiger Rückbau: Projekt-Ressourcen (venv, State, txt, cache, logs) und
 # von der Installation gesetzte System-Pakete (laut logs/install.json). Alles wird in whisper.log protokolliert.
 
 set -euo pipefail
@@ -85,6 +85,28 @@ else
     log_info_quiet "Ordner txt nicht vorhanden, übersprungen."
 fi
 
+log_info_quiet "Entferne cache/ (Transkriptions-Cache)"
+if [ -d "${SCRIPT_DIR}/cache" ]; then
+    log_run_cmd "rm -rf cache" rm -rf "${SCRIPT_DIR}/cache" 2>/dev/null || true
+    log_info_quiet "cache entfernt."
+else
+    log_info_quiet "Ordner cache nicht vorhanden, übersprungen."
+fi
+
+log_info_quiet "Entferne Transkript-Speicher (transcripts.db)"
+if [ -f "${SCRIPT_DIR}/transcripts.db" ]; then
+    log_run_cmd "rm -f transcripts.db*" rm -f "${SCRIPT_DIR}/transcripts.db" "${SCRIPT_DIR}/transcripts.db-wal" "${SCRIPT_DIR}/transcripts.db-shm" || true
+else
+    log_info_quiet "Transkript-Speicher nicht vorhanden, übersprungen."
+fi
+
+log_info_quiet "Entferne Autotune-Profil (.video_whisper_profile.json)"
+if [ -f "${SCRIPT_DIR}/.video_whisper_profile.json" ]; then
+    log_run_cmd "rm -f .video_whisper_profile.json" rm -f "${SCRIPT_DIR}/.video_whisper_profile.json" || true
+else
+    log_info_quiet "Autotune-Profil nicht vorhanden, übersprungen."
+fi
+
 # System-Pakete (nur wenn im Manifest und nicht leer)
 if [ -n "$SYSTEM_PACKAGES_JSON" ] && [ "$SYSTEM_PACKAGES_JSON" != "[]" ]; then
     log_info_quiet "System-Pakete im Manifest: $SYSTEM_PACKAGES_JSON"
@@ -75,6 +75,8 @@ fi
 ui_section "Updates verfügbar"
 echo "$outdated"
 echo ""
+ui_log "Tipp: Durchsatz vor/nach dem Update vergleichen: ./venv/bin/python3 scripts/benchmark.py"
+echo ""
 
 # Kompatibilität: venv-Python muss im Bereich 3.10–3.13 sein (bereits oben geprüft)
 # Wenn nicht kompatibel, würden wir hier schon mit exit 1 raus sein.
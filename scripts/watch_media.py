@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Video Whisper – Überwachter Ordner: neue oder geänderte Mediendateien in medien/ automatisch transkribieren.
+Ein persistenter Index (Pfad, Größe, mtime, Inhalts-Hash, Status, Ausgabe) überlebt Neustarts – erledigte
+Dateien werden nie doppelt transkribiert. Umbenennungen (z. B. prass1, prass2, … aus start.sh) erkennt der
+Inhalts-Hash: der Eintrag zieht mit um, es wird nicht neu transkribiert.
+Erkennung per Polling mit os.scandir (ein stat pro Datei; gehasht wird nur, was neu ist oder sich geändert hat).
+Dateien, die noch geschrieben werden (mtime jünger als --settle), werden erst im nächsten Durchlauf bearbeitet.
+
+Aufruf:
+  watch_media.py [Ordner] [Ausgabeordner] [--model M] [--language L] [--interval S] [--once] [--retry-failed]
+                 [Optionen wie transcribe.py: --formats, --align, --stream, …]
+  watch_media.py --status [Ordner]          Index anzeigen
+Standard: Ordner medien/, Ausgabe txt/, Index cache/watch_index.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from dataclasses import replace
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+import transcribe  # noqa: E402
+
+INDEX_FILE = PROJECT_DIR / "cache" / "watch_index.json"
+INDEX_VERSION = 1
+DEFAULT_INTERVAL = 5.0
+DEFAULT_SETTLE = 2.0
+
+
+class MediaIndex:
+    """
+    Persistenter Index der überwachten Dateien: {Pfad: {size, mtime_ns, hash, status, output, error, updated_at}}.
+    status: "done" | "failed". Einträge verschwundener Dateien bleiben als missing erhalten – so wird auch
+    eine Umbenennung erkannt, die passiert ist, während der Watcher nicht lief.
+    """
+
+    def __init__(self, path: Path = INDEX_FILE):
+        self.path = path
+        self.files: dict = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                self.files = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    def save(self) -> None:
+        """Atomar schreiben (Temp-Datei + os.replace): ein Abbruch hinterlässt nie einen halben Index."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "files": self.files}, indent=1, ensure_ascii=False),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def is_current(self, path: str, size: int, mtime_ns: int) -> bool:
+        entry = self.files.get(path)
+        return bool(entry) and not entry.get("missing") and entry["size"] == size and entry["mtime_ns"] == mtime_ns
+
+    def find_moved(self, content_hash: str, existing: set):
+        """Pfad eines Eintrags mit gleichem Inhalt, dessen Datei es nicht mehr gibt (→ umbenannt)."""
+        for path, entry in self.files.items():
+            if entry.get("hash") == content_hash and path not in existing and entry.get("status") == "done":
+                return path
+        return None
+
+    def record(self, path: str, size: int, mtime_ns: int, content_hash: str, **fields) -> None:
+        entry = dict(self.files.get(path) or {})
+        entry.update(size=size, mtime_ns=mtime_ns, hash=content_hash, updated_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        entry.pop("missing", None)
+        entry.update(fields)
+        self.files[path] = entry
+
+
+def scan_media(folder: Path) -> dict:
+    """Mediendateien im Ordner (nicht rekursiv): {absoluter Pfad: (size, mtime_ns)}."""
+    found = {}
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                if Path(entry.name).suffix.lower().lstrip(".") not in transcribe.MEDIA_EXTENSIONS:
+                    continue
+                st = entry.stat()
+                found[str(Path(entry.path).resolve())] = (st.st_size, st.st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return found
+
+
+class Watcher:
+    """Ein Durchlauf (poll) vergleicht den Ordner mit dem Index und transkribiert, was neu oder geändert ist."""
+
+    def __init__(self, folder: Path, base_config, index: MediaIndex, logger, settle: float = DEFAULT_SETTLE,
+                 retry_failed: bool = False):
+        self.folder = folder
+        self.base_config = base_config
+        self.index = index
+        self.logger = logger
+        self.settle = settle
+        self.retry_failed = retry_failed
+
+    def _load_model(self):
+        return transcribe.get_model(self.base_config, self.logger)
+
+    def poll(self) -> int:
+        """Gibt die Anzahl der in diesem Durchlauf transkribierten Dateien zurück."""
+        found = scan_media(self.folder)
+        existing = set(found)
+        changed = False
+        for path, entry in self.index.files.items():
+            if path not in existing and not entry.get("missing") and Path(path).parent == self.folder:
+                entry["missing"] = True
+                changed = True
+
+        processed = 0
+        now_ns = time.time_ns()
+        for path, (size, mtime_ns) in sorted(found.items()):
+            entry = self.index.files.get(path)
+            if self.index.is_current(path, size, mtime_ns):
+                if not (self.retry_failed and entry.get("status") == "failed"):
+                    continue
+            if now_ns - mtime_ns < self.settle * 1e9:
+                continue  # wird vermutlich noch geschrieben – nächster Durchlauf
+            content_hash = transcribe.file_content_hash(Path(path))
+            if entry and entry.get("hash") == content_hash and entry.get("status") == "done":
+                # Nur berührt (mtime), Inhalt gleich
+                self.index.record(path, size, mtime_ns, content_hash)
+                changed = True
+                continue
+            moved_from = self.index.find_moved(content_hash, existing)
+            if moved_from:
+                self.logger.info(f"Watch: Umbenennung erkannt {Path(moved_from).name} → {Path(path).name} (nicht neu transkribiert)")
+                print(f"  {transcribe.C_DIM}↪ {Path(moved_from).name} → {Path(path).name} (umbenannt, bereits transkribiert){transcribe.C_OFF}",
+                      flush=True)
+                moved = self.index.files.pop(moved_from)
+                self.index.files[path] = moved
+                self.index.record(path, size, mtime_ns, content_hash, renamed_from=moved_from)
+                changed = True
+                continue
+            self._transcribe(path, size, mtime_ns, content_hash)
+            self.index.save()
+            changed = False
+            processed += 1
+        if changed:
+            self.index.save()
+        return processed
+
+    def _transcribe(self, path: str, size: int, mtime_ns: int, content_hash: str) -> None:
+        config = replace(self.base_config, file_path=Path(path))
+        self.logger.info(f"--- Watch: {path} ---")
+        print(f"{transcribe.C_BLD}{Path(path).name}{transcribe.C_OFF}", flush=True)
+        start = time.perf_counter()
+        try:
+            output_file = transcribe._transcribe_file(config, self._load_model, self.logger)
+        except Exception as e:
+            self.logger.error(f"Watch: Transkription fehlgeschlagen ({Path(path).name}): {e}")
+            self.logger.debug(traceback.format_exc())
+            self.index.record(path, size, mtime_ns, content_hash, status="failed", error=str(e), output=None)
+            print(f"  {transcribe.C_RED}✗ Fehler: {e}{transcribe.C_OFF}", flush=True)
+            return
+        seconds = time.perf_counter() - start
+        self.index.record(path, size, mtime_ns, content_hash, status="done", error=None, output=str(output_file),
+                          seconds=round(seconds, 2))
+        print(f"  {transcribe.C_GRN}✓{transcribe.C_OFF} {output_file} ({seconds:.1f} s)", flush=True)
+
+
+def print_status(index: MediaIndex, folder: Path) -> None:
+    entries = {p: e for p, e in index.files.items() if Path(p).parent == folder}
+    if not entries:
+        print(f"Index leer für {folder} ({index.path})")
+        return
+    for path, entry in sorted(entries.items()):
+        state = "fehlt" if entry.get("missing") else {"done": "erledigt", "failed": "Fehler"}.get(entry.get("status"), "?")
+        extra = entry.get("error") if entry.get("status") == "failed" else (entry.get("output") or "")
+        print(f"  {state:<9} {Path(path).name:<40} {extra}")
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(
+        prog="watch_media.py",
+        description="Ordner überwachen und neue/geänderte Mediendateien transkribieren (Index überlebt Neustarts).",
+    )
+    parser.add_argument("folder", nargs="?", default=str(PROJECT_DIR / "medien"), help="Überwachter Ordner (Standard: medien/)")
+    parser.add_argument("output", nargs="?", default=str(PROJECT_DIR / "txt"), help="Ausgabeordner (Standard: txt/)")
+    parser.add_argument("-m", "--model", default="small", help="Modell (Standard: small)")
+    parser.add_argument("-l", "--language", default="", help="Sprache (leer = automatische Erkennung)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"Sekunden zwischen zwei Durchläufen (Standard: {DEFAULT_INTERVAL:g})")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE,
+                        help=f"Datei erst bearbeiten, wenn sie so viele Sekunden unverändert ist (Standard: {DEFAULT_SETTLE:g})")
+    parser.add_argument("--once", action="store_true", help="Einen Durchlauf machen und beenden")
+    parser.add_argument("--retry-failed", action="store_true", help="Fehlgeschlagene Dateien erneut versuchen")
+    parser.add_argument("--index", default=str(INDEX_FILE), help="Index-Datei (Standard: cache/watch_index.json)")
+    parser.add_argument("--status", action="store_true", help="Index anzeigen und beenden")
+    transcribe._add_pipeline_options(parser)
+    args = parser.parse_args(argv)
+    if args.model not in transcribe.TranscriptionConfig.SUPPORTED_MODELS:
+        parser.error(f"unbekanntes Modell: {args.model}")
+    return args
+
+
+def main() -> None:
+    args = parse_arguments(sys.argv[1:])
+    folder = Path(args.folder).expanduser().resolve()
+    index = MediaIndex(Path(args.index).expanduser())
+    if args.status:
+        print_status(index, folder)
+        sys.exit(0)
+    if not folder.is_dir():
+        print(f"Ordner nicht gefunden: {folder}", file=sys.stderr)
+        sys.exit(1)
+    output_path = Path(args.output).expanduser().resolve()
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    logger = transcribe.setup_logging()
+    transcribe._silence_console_logging()
+    base_config = transcribe.TranscriptionConfig(
+        file_path=folder, output_path=output_path, model_size=args.model,
+        language=args.language.strip() or None, **transcribe._pipeline_config_kwargs(args),
+    )
+    watcher = Watcher(folder, base_config, index, logger, settle=args.settle, retry_failed=args.retry_failed)
+    logger.info(f"Watch: {folder} → {output_path} (Index {index.path}, {len(index.files)} Einträge)")
+    if not args.once:
+        print(f"Überwache {folder} (alle {args.interval:g} s, Strg+C beendet) …", flush=True)
+    try:
+        while True:
+            watcher.poll()
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        logger.info("Watch beendet")
+    finally:
+        index.save()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -113,7 +113,8 @@ require_installed() {
     fi
     local tmp_ec
     tmp_ec=$(mktemp 2>/dev/null) || tmp_ec="/tmp/vw_whisperx_$$.ec"
-    ( "${VENV_PATH}/bin/python3" -c "import whisperx" 2>/dev/null; echo $? > "$tmp_ec" ) & local pid=$!
+    # transcribe.py --check prüft die Pakete ohne torch/whisperx zu importieren (Millisekunden)
+    ( "${VENV_PATH}/bin/python3" "${SCRIPT_DIR}/transcribe.py" --check --quiet 2>/dev/null; echo $? > "$tmp_ec" ) & local pid=$!
     if type ui_spinner &>/dev/null && [ -t 1 ]; then
         ui_spinner "$pid" "WhisperX prüfen…"
     else
@@ -197,6 +198,23 @@ rename_media_to_prass() {
     ui_ok "Umbenannt: ${#files[@]} Dateien → prass1, prass2, …"
 }
 
+# Download-Modus wählen; gibt video, mp3, audio oder pcm aus (siehe scripts/download_from_url.py)
+select_download_mode() {
+    echo -e "${BOLD}${YELLOW}Als was herunterladen?${NC}" >&2
+    echo -e "  ${GREEN}1${NC}) Video (MP4)" >&2
+    echo -e "  ${GREEN}2${NC}) Nur Audio (MP3)" >&2
+    echo -e "  ${GREEN}3${NC}) Nur Audio, Originalspur ${DIM}(ohne Umwandlung – schnellster Download)${NC}" >&2
+    echo -e "  ${GREEN}4${NC}) Für Transkription: WAV 16 kHz mono ${DIM}(wird ohne weiteres Decodieren transkribiert)${NC}" >&2
+    local format_choice
+    read -rp "$(echo -e "${YELLOW}→ Auswahl (1–4): ${NC}")" format_choice
+    case "$format_choice" in
+        2) echo "mp3" ;;
+        3) echo "audio" ;;
+        4) echo "pcm" ;;
+        *) echo "video" ;;
+    esac
+}
+
 # Bulk-Download: mehrere URLs (eine pro Zeile), alle in medien/, dann eine für Transkription wählen.
 download_bulk_choice() {
     local selected_out="$1"
@@ -214,56 +232,42 @@ download_bulk_choice() {
         ui_fail "Keine gültigen URLs eingegeben."
         return 1
     fi
-    echo -e "${BOLD}${YELLOW}Als was herunterladen?${NC}" >&2
-    echo -e "  ${GREEN}1${NC}) Video (MP4)" >&2
-    echo -e "  ${GREEN}2${NC}) Nur Audio (MP3)" >&2
-    read -rp "$(echo -e "${YELLOW}→ Auswahl (1–2): ${NC}")" format_choice
-    local mode="video"
-    [ "$format_choice" = "2" ] && mode="mp3"
+    local mode
+    mode=$(select_download_mode)
     echo -e "${BOLD}${YELLOW}Basis-Titel für alle Dateinamen?${NC} ${DIM}(z. B. „Video“ → Video 1, Video 2, …; Enter = Videotitel pro Video)${NC}" >&2
     read -rp "$(echo -e "${YELLOW}→ Basis-Titel: ${NC}")" bulk_base
     bulk_base=$(echo "$bulk_base" | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
-    local -a downloaded=()
-    local i url prog_f stdout_f err_f out_path ec title_suffix base_arg
-    for i in "${!urls[@]}"; do
-        url="${urls[$i]}"
-        [ "$i" -gt 0 ] && echo "" >&2
-        ui_info "Download $((i + 1))/${#urls[@]} ($mode) …"
-        prog_f=$(mktemp 2>/dev/null) || prog_f="/tmp/vw_dl_prog_$$_$i"
-        stdout_f=$(mktemp 2>/dev/null) || stdout_f="/tmp/vw_dl_stdout_$$_$i"
-        err_f=$(mktemp 2>/dev/null) || err_f="/tmp/vw_dl_err_$$_$i"
-        : > "$prog_f" ; : > "$stdout_f" ; : > "$err_f"
-        if [ -n "$bulk_base" ]; then
-            title_suffix=" $((i + 1))"
-            base_arg="$bulk_base"
-        else
-            [ "$i" -gt 0 ] && title_suffix=" $((i + 1))" || title_suffix=""
-            base_arg=""
-        fi
-        if [ -n "$base_arg" ]; then
-            PYTHONUNBUFFERED=1 "${VENV_PATH}/bin/python3" "${SCRIPT_DIR}/scripts/download_from_url.py" "$url" "$mode" "$MEDIA_DIR" "$prog_f" "$title_suffix" "$base_arg" > "$stdout_f" 2> "$err_f" & local pid=$!
-        else
-            PYTHONUNBUFFERED=1 "${VENV_PATH}/bin/python3" "${SCRIPT_DIR}/scripts/download_from_url.py" "$url" "$mode" "$MEDIA_DIR" "$prog_f" "$title_suffix" > "$stdout_f" 2> "$err_f" & local pid=$!
-        fi
-        if type ui_spinner &>/dev/null && [ -t 1 ]; then
-            ui_spinner "$pid" "Download $((i + 1))/${#urls[@]} ($mode)…" "$prog_f"
-        else
-            wait "$pid" 2>/dev/null || true
-        fi
+    # Ein Prozess für alle URLs: yt-dlp wird einmal geladen, bis zu VIDEO_WHISPER_DL_JOBS Downloads parallel
+    local jobs="${VIDEO_WHISPER_DL_JOBS:-3}"
+    local prog_f stdout_f err_f
+    prog_f=$(mktemp 2>/dev/null) || prog_f="/tmp/vw_dl_prog_$$"
+    stdout_f=$(mktemp 2>/dev/null) || stdout_f="/tmp/vw_dl_stdout_$$"
+    err_f=$(mktemp 2>/dev/null) || err_f="/tmp/vw_dl_err_$$"
+    : > "$prog_f" ; : > "$stdout_f" ; : > "$err_f"
+    printf '%s\n' "${urls[@]}" | PYTHONUNBUFFERED=1 "${VENV_PATH}/bin/python3" "${SCRIPT_DIR}/scripts/download_from_url.py" \
+        --bulk "$mode" "$MEDIA_DIR" --jobs "$jobs" --base-title "$bulk_base" --progress-file "$prog_f" > "$stdout_f" 2> "$err_f" & local pid=$!
+    if type ui_spinner &>/dev/null && [ -t 1 ]; then
+        ui_spinner "$pid" "Download von ${#urls[@]} URLs ($mode, ${jobs} parallel)…" "$prog_f"
+    else
         wait "$pid" 2>/dev/null || true
-        ec=$?
-        # Pfad aus stdout: oft letzte Zeile (falls Skript vorher andere Zeilen ausgibt)
-        out_path=$(grep -E '\.(mp4|mp3|m4a|webm)$' "$stdout_f" 2>/dev/null | tail -1 | tr -d '\n\r' | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
-        [ -z "$out_path" ] && out_path=$(sed -n '1p' "$stdout_f" 2>/dev/null | tr -d '\n\r' | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
-        rm -f "$prog_f" "$stdout_f" "$err_f"
-        # Erfolg wenn Datei existiert (Skript kann trotz Exit-Code 0 die Datei geschrieben haben)
-        if [ -n "$out_path" ] && [ -f "$out_path" ]; then
-            downloaded+=( "$out_path" )
-            ui_ok "Gespeichert: $(basename "$out_path")"
-        else
-            ui_fail "Fehlgeschlagen: $url"
+    fi
+    wait "$pid" 2>/dev/null || true
+    # Ergebnisse: "OK<Tab>Nr<Tab>Pfad" / "FEHLER<Tab>Nr<Tab>URL" in Fertigstellungsreihenfolge → nach Nr sortieren
+    local -a downloaded=()
+    local status nr value
+    while IFS=$'\t' read -r status nr value; do
+        if [ "$status" = "OK" ] && [ -f "$value" ]; then
+            downloaded+=( "$value" )
+            ui_ok "Gespeichert: $(basename "$value")"
+        elif [ "$status" = "FEHLER" ] || [ "$status" = "OK" ]; then
+            ui_fail "Fehlgeschlagen: $value"
         fi
-    done
+    done < <(sort -t $'\t' -k2,2n "$stdout_f" 2>/dev/null)
+    if [ ${#downloaded[@]} -lt ${#urls[@]} ] && [ -s "$err_f" ]; then
+        echo -e "  ${DIM}Fehlerausgabe:${NC}" >&2
+        sed 's/^/    /' "$err_f" >&2
+    fi
+    rm -f "$prog_f" "$stdout_f" "$err_f"
     if [ ${#downloaded[@]} -eq 0 ]; then
         ui_fail "Kein Download erfolgreich."
         return 1
@@ -287,6 +291,68 @@ download_bulk_choice() {
     done
 }
 
+# Pipeline: mehrere URLs; jede Datei wird transkribiert, sobald ihr Download fertig ist (Modell/Sprache vorab).
+download_pipeline_choice() {
+    echo -e "${BOLD}${YELLOW}URLs eingeben${NC} (eine pro Zeile). ${DIM}Zum Beenden: nur Enter drücken (nichts tippen).${NC}" >&2
+    echo "" >&2
+    local urls=()
+    local line
+    while true; do
+        read -rp "$(echo -e "${YELLOW}→ URL (oder Enter = fertig):${NC} ")" line
+        line=$(echo "$line" | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
+        [ -z "$line" ] && break
+        [[ "$line" =~ ^https?:// ]] && urls+=( "$line" )
+    done
+    if [ ${#urls[@]} -eq 0 ]; then
+        ui_fail "Keine gültigen URLs eingegeben."
+        return 1
+    fi
+    local mode
+    mode=$(select_download_mode)
+    echo "" >&2
+    local model language
+    model=$(select_model)
+    ui_ok "$model"
+    language=$(select_language)
+    ui_ok "${language:-Automatisch}"
+    echo "" >&2
+
+    local jobs="${VIDEO_WHISPER_DL_JOBS:-2}"
+    local prog_f stdout_f
+    prog_f=$(mktemp 2>/dev/null) || prog_f="/tmp/vw_pipe_prog_$$"
+    stdout_f=$(mktemp 2>/dev/null) || stdout_f="/tmp/vw_pipe_out_$$"
+    : > "$prog_f" ; : > "$stdout_f"
+    printf '%s\n' "${urls[@]}" | PYTHONUNBUFFERED=1 "${VENV_PATH}/bin/python3" "${SCRIPT_DIR}/scripts/download_and_transcribe.py" \
+        "$mode" "$OUTPUT_PATH" --media-dir "$MEDIA_DIR" --jobs "$jobs" --model "$model" --language "$language" \
+        --progress-file "$prog_f" > "$stdout_f" & local pid=$!
+    if type ui_spinner &>/dev/null && [ -t 1 ]; then
+        ui_spinner "$pid" "Download + Transkription (${#urls[@]} URLs)…" "$prog_f"
+    else
+        wait "$pid" 2>/dev/null || true
+    fi
+    local exit_code=0
+    wait "$pid" 2>/dev/null || exit_code=$?
+    # Ergebnisse: "OK<Tab>Nr<Tab>Sekunden<Tab>Transkript" / "FEHLER<Tab>Nr<Tab>Sekunden<Tab>Quelle<Tab>Fehler"
+    # in Fertigstellungsreihenfolge → nach Nr sortieren
+    local ok_count=0 status nr seconds value error
+    while IFS=$'\t' read -r status nr seconds value error; do
+        if [ "$status" = "OK" ]; then
+            ok_count=$((ok_count + 1))
+            ui_ok "$(basename "$value") (${seconds} s)"
+        elif [ "$status" = "FEHLER" ]; then
+            ui_fail "${value}: ${error}"
+        fi
+    done < <(sort -t $'\t' -k2,2n "$stdout_f" 2>/dev/null)
+    rm -f "$prog_f" "$stdout_f"
+    if [ "$exit_code" -eq 0 ] && [ "$ok_count" -eq "${#urls[@]}" ]; then
+        ui_ok "Alle Dateien transkribiert (${ok_count}/${#urls[@]})."
+    else
+        ui_warn "Nicht alle URLs erfolgreich: ${ok_count}/${#urls[@]} (Details: logs/whisper.log)."
+    fi
+    ui_log "Ausgabe: ${OUTPUT_PATH}/"
+    return 0
+}
+
 # Download von URL (YouTube etc.): Video oder MP3. Schreibt Pfad in selected_out.
 download_from_url_choice() {
     local selected_out="$1"
@@ -297,12 +363,8 @@ download_from_url_choice() {
         ui_fail "Keine URL eingegeben."
         return 1
     fi
-    echo -e "${BOLD}${YELLOW}Als was herunterladen?${NC}" >&2
-    echo -e "  ${GREEN}1${NC}) Video (MP4)" >&2
-    echo -e "  ${GREEN}2${NC}) Nur Audio (MP3)" >&2
-    read -rp "$(echo -e "${YELLOW}→ Auswahl (1–2): ${NC}")" format_choice
-    local mode="video"
-    [ "$format_choice" = "2" ] && mode="mp3"
+    local mode
+    mode=$(select_download_mode)
     echo -e "${BOLD}${YELLOW}Eigenen Dateinamen?${NC} ${DIM}(Enter = Videotitel von YouTube)${NC}" >&2
     read -rp "$(echo -e "${YELLOW}→ Dateiname: ${NC}")" custom_title
     custom_title=$(echo "$custom_title" | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
@@ -325,11 +387,11 @@ download_from_url_choice() {
     fi
     wait "$pid" 2>/dev/null || true
     ec=$?
-    out_path=$(grep -E '\.(mp4|mp3|m4a|webm)$' "$stdout_f" 2>/dev/null | tail -1 | tr -d '\n\r' | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
+    out_path=$(grep -E '\.(mp4|mp3|m4a|webm|opus|ogg|wav)$' "$stdout_f" 2>/dev/null | tail -1 | tr -d '\n\r' | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
     [ -z "$out_path" ] && out_path=$(sed -n '1p' "$stdout_f" 2>/dev/null | tr -d '\n\r' | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
     # Fallback: Datei wurde geschrieben, aber Pfad kam nicht auf stdout – neueste Datei in medien/ seit Start (start_marker wird nicht überschrieben, prog_f schon)
     if { [ -z "$out_path" ] || [ ! -f "$out_path" ]; } && [ -d "$MEDIA_DIR" ] && [ -f "$start_marker" ]; then
-        newest=$(find "$MEDIA_DIR" -maxdepth 1 -type f \( -iname "*.mp4" -o -iname "*.mp3" -o -iname "*.m4a" -o -iname "*.webm" \) -newer "$start_marker" -printf '%T@ %p\n' 2>/dev/null | sort -rn | head -1 | sed 's/^[0-9][0-9]* //')
+        newest=$(find "$MEDIA_DIR" -maxdepth 1 -type f \( -iname "*.mp4" -o -iname "*.mp3" -o -iname "*.m4a" -o -iname "*.webm" -o -iname "*.opus" -o -iname "*.ogg" -o -iname "*.wav" \) -newer "$start_marker" -printf '%T@ %p\n' 2>/dev/null | sort -rn | head -1 | sed 's/^[0-9][0-9]* //')
         [ -n "$newest" ] && [ -f "$newest" ] && out_path=$newest
     fi
     if [ -z "$out_path" ] || [ ! -f "$out_path" ]; then
@@ -362,8 +424,9 @@ select_file() {
     echo -e "  ${GREEN}2${NC}) ${DIM}Eine URL herunterladen (YouTube etc.) – Video oder MP3${NC}" >&2
     echo -e "  ${GREEN}3${NC}) ${DIM}Bulk-Download: mehrere URLs (eine pro Zeile)${NC}" >&2
     echo -e "  ${GREEN}4${NC}) ${DIM}Alle Dateien in medien/ zu prass1, prass2, … umbenennen${NC}" >&2
+    echo -e "  ${GREEN}5${NC}) ${DIM}Mehrere URLs laden und sofort transkribieren (Pipeline)${NC}" >&2
     echo "" >&2
-    read -rp "$(echo -e "${YELLOW}→ Auswahl (1–4): ${NC}")" source_choice
+    read -rp "$(echo -e "${YELLOW}→ Auswahl (1–5): ${NC}")" source_choice
 
     if [ "$source_choice" = "2" ]; then
         download_from_url_choice "$selected_out" || exit 1
@@ -373,6 +436,12 @@ select_file() {
         download_bulk_choice "$selected_out" || exit 1
         return 0
     fi
+    if [ "$source_choice" = "5" ]; then
+        # Transkribiert selbst – leere Auswahl signalisiert main(), dass nichts mehr zu tun ist
+        download_pipeline_choice || exit 1
+        : > "$selected_out"
+        return 0
+    fi
     if [ "$source_choice" = "4" ]; then
         rename_media_to_prass
         echo "" >&2
@@ -483,6 +552,17 @@ select_language() {
     fi
 }
 
+# Nach einer Transkription: zurück ins Menü? (Exit 0 = ja; ohne Terminal immer nein)
+ask_again() {
+    [ -t 0 ] || return 1
+    local again
+    read -rp "$(echo -e "${YELLOW}Noch eine transkribieren? (j/n):${RESET} ")" again
+    case "${again^^}" in
+        J|JA|Y|YES) return 0 ;;
+        *) return 1 ;;
+    esac
+}
+
 # Main function
 main() {
     local selected_file
@@ -524,6 +604,12 @@ main() {
         select_file "$selected_file"
         local file_path
         file_path=$(cat "$selected_file")
+        if [ -z "$file_path" ]; then
+            # Pipeline (Auswahl 5) hat bereits transkribiert
+            echo ""
+            ask_again && { echo "" ; continue ; }
+            break
+        fi
         ui_ok "$(basename "$file_path")"
         echo ""
 
@@ -552,7 +638,13 @@ main() {
         local prog_f
         prog_f=$(mktemp)
         trap 'rm -f "${prog_f:-}"' EXIT
-        PYTHONUNBUFFERED=1 "${VENV_PATH}/bin/python3" "${SCRIPT_DIR}/transcribe.py" "$file_path" "$OUTPUT_PATH" "$model" "$language" "$prog_f" &
+        # Läuft ein Daemon (scripts/transcribe_daemon.py serve), Job dort einreihen – Modell ist bereits geladen
+        if "${VENV_PATH}/bin/python3" "${SCRIPT_DIR}/scripts/transcribe_daemon.py" ping 2>/dev/null; then
+            ui_log "Daemon aktiv – Job wird an den laufenden Daemon übergeben."
+            PYTHONUNBUFFERED=1 "${VENV_PATH}/bin/python3" "${SCRIPT_DIR}/scripts/transcribe_daemon.py" submit --wait "$file_path" "$OUTPUT_PATH" "$model" "$language" "$prog_f" > /dev/null 2>> "${SCRIPT_DIR}/logs/whisper.log" &
+        else
+            PYTHONUNBUFFERED=1 "${VENV_PATH}/bin/python3" "${SCRIPT_DIR}/transcribe.py" "$file_path" "$OUTPUT_PATH" "$model" "$language" "$prog_f" &
+        fi
         local pid=$!
         if type ui_spinner &>/dev/null && [ -t 1 ]; then
             ui_spinner "$pid" "Transkribieren…" "$prog_f"
@@ -584,16 +676,8 @@ main() {
         echo ""
 
         # Zurück ins Menü (ohne erneuten Update-Check) oder Beenden
-        if [ -t 0 ]; then
-            local again
-            read -rp "$(echo -e "${YELLOW}Noch eine transkribieren? (j/n):${RESET} ")" again
-            case "${again^^}" in
-                J|JA|Y|YES) echo "" ; continue ;;
-                *) break ;;
-            esac
-        else
-            break
-        fi
+        ask_again && { echo "" ; continue ; }
+        break
     done
 
     if [ -t 0 ]; then
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR / "scripts"))
+
+import benchmark  # noqa: E402
+
+
+def test_collect_corpus_finds_media_files(tmp_path):
+    for name in ("b.wav", "a.MP4", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "sub.mp3").mkdir()
+
+    assert benchmark.collect_corpus(tmp_path) == [tmp_path / "a.MP4", tmp_path / "b.wav"]
@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+import transcribe  # noqa: E402
+
+DIARIZATION = {"turns": [[0.0, 1.5, "SPEAKER_00"], [1.5, 3.0, "SPEAKER_01"]], "embeddings": {"SPEAKER_00": [0.1, 0.2]}}
+
+
+def test_store_and_load_round_trip(tmp_path):
+    cache = transcribe.DiarizationCache(tmp_path)
+    cache.store("abc", DIARIZATION, {"audio_hash": "h"})
+
+    assert cache.load("abc") == DIARIZATION
+    stored = json.loads((tmp_path / "abc.json").read_text(encoding="utf-8"))
+    assert set(stored) == {"meta", "diarization"}
+    assert cache.load("missing") is None
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    cache = transcribe.DiarizationCache(tmp_path)
+    cache.store("old", DIARIZATION, {})
+    entry_size = (tmp_path / "old.json").stat().st_size
+    cache.max_bytes = entry_size * 5 // 2  # Platz für zwei Einträge
+    os.utime(tmp_path / "old.json", (1, 1))
+    cache.store("used", DIARIZATION, {})
+    os.utime(tmp_path / "used.json", (2, 2))
+    cache.load("old")  # Zugriff: "old" ist jetzt der jüngste Eintrag
+    cache.store("new", DIARIZATION, {})
+
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["new", "old"]
+    assert cache.clear() == 2
@@ -0,0 +1,75 @@
+import functools
+import http.server
+import shutil
+import sys
+import threading
+import wave
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR / "scripts"))
+
+import download_from_url  # noqa: E402
+
+yt_dlp = pytest.importorskip("yt_dlp")
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def media_url(tmp_path):
+    """Lokaler HTTP-Server mit einer kurzen WAV-Datei "Titel.wav" (yt-dlp: generischer Extractor)."""
+    served = tmp_path / "served"
+    served.mkdir()
+    with wave.open(str(served / "Titel.wav"), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(b"\x01\x00" * 16000)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(served)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/Titel.wav"
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrent_downloads_claim_distinct_names(tmp_path, media_url):
+    out_dir = tmp_path / "medien"
+    out_dir.mkdir()
+    (out_dir / "Titel.wav").write_bytes(b"vorhanden")
+    paths = []
+
+    def work():
+        paths.append(download_from_url.download_one(yt_dlp, media_url, "audio", out_dir, use_cache=False))
+
+    threads = [threading.Thread(target=work) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(Path(p).name for p in paths) == ["Titel (2).wav", "Titel (3).wav", "Titel (4).wav"]
+    assert all(Path(p).stat().st_size > 1000 for p in paths)
+    assert (out_dir / "Titel.wav").read_bytes() == b"vorhanden"
+    assert sorted(p.name for p in out_dir.iterdir()) == ["Titel (2).wav", "Titel (3).wav", "Titel (4).wav", "Titel.wav"]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg fehlt")
+def test_conversion_keeps_existing_file_with_intermediate_name(tmp_path, media_url):
+    # mp3: yt-dlp lädt erst Titel.wav und wandelt dann um – eine vorhandene Titel.wav darf das nicht treffen
+    out_dir = tmp_path / "medien"
+    out_dir.mkdir()
+    (out_dir / "Titel.wav").write_bytes(b"vorhanden")
+
+    path = download_from_url.download_one(yt_dlp, media_url, "mp3", out_dir, use_cache=False)
+
+    assert Path(path) == (out_dir / "Titel.mp3").resolve()
+    assert Path(path).stat().st_size > 0
+    assert (out_dir / "Titel.wav").read_bytes() == b"vorhanden"
+    assert sorted(p.name for p in out_dir.iterdir()) == ["Titel.mp3", "Titel.wav"]
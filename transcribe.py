@@ -5,17 +5,31 @@ Uses WhisperX for accurate transcription with word-level timestamps
 """
 
 import os
+import resource
 import sys
+import argparse
+import bisect
+import contextlib
+import gc
+import concurrent.futures
+import hashlib
+import importlib.util
+import inspect
+import io
+import json
 import logging
+import multiprocessing
+import shutil
+import sqlite3
 import subprocess
-import tempfile
 import threading
 import time
 import traceback
 import warnings
+import wave
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Iterator, Tuple, Callable, TextIO
+from dataclasses import dataclass, replace
 
 # Bekannte harmlose Warnungen unterdrücken (Ausgabe ruhiger halten)
 # – torchcodec: pyannote nutzt es optional; WhisperX lädt Audio per FFmpeg
@@ -26,9 +40,16 @@ warnings.filterwarnings("ignore", message=".*TensorFloat-32.*", category=UserWar
 warnings.filterwarnings("ignore", message=".*TF32.*", category=UserWarning)
 warnings.filterwarnings("ignore", message=".*Lightning automatically upgraded.*", category=UserWarning)
 
-import torch
-import whisperx
-from tqdm import tqdm
+import numpy as np
+
+# Fortschrittskanal (Datei für start.sh, FIFO, Unix-Socket) – eigenes Modul, damit die Download-Skripte ohne
+# dieses Modul auskommen; _write_progress bleibt der Name, den die Skripte hier schon verwenden
+from progress import PROGRESS_SOCKET_PREFIX, write_progress as _write_progress
+
+# torch und whisperx kosten mehrere Sekunden Importzeit – erst laden, wenn ein Modell gebraucht wird
+# (siehe _import_ml). Hilfe, Argumentfehler, validate() und Cache-Treffer kommen ohne sie aus.
+torch: Any = None
+whisperx: Any = None
 
 # ANSI-Farben für Konsolen-Ausgabe (nur wenn stdout ein Terminal ist)
 if sys.stdout.isatty():
@@ -42,6 +63,9 @@ if sys.stdout.isatty():
 else:
     C_GRN = C_RED = C_YEL = C_CYN = C_BLD = C_DIM = C_OFF = ""
 
+# Unterstützte Endungen (wie AUDIO_VIDEO_EXTENSIONS in start.sh)
+MEDIA_EXTENSIONS = {"mp3", "wav", "m4a", "flac", "aac", "ogg", "opus", "mp4", "mkv", "avi", "mov", "webm", "wmv"}
+
 
 # ============================================================================
 # Configuration and Types
@@ -56,10 +80,30 @@ class TranscriptionConfig:
     language: Optional[str] = None
     device: str = "auto"
     compute_type: str = "auto"
-    batch_size: int = 16
+    batch_size: int = 0  # 0 = Autotune-Profil, sonst DEFAULT_BATCH_SIZE
+    stream: bool = False
+    stream_window: float = 300.0
+    stream_overlap: float = 10.0
+    use_cache: bool = True
+    threads: int = 0  # CPU-Threads pro Prozess (0 = Standard von WhisperX/torch)
+    progress_json: Optional[Path] = None  # JSON-Lines-Fortschritt (maschinenlesbar)
+    use_profile: bool = True  # Autotune-Profil (.video_whisper_profile.json) für "auto"-Werte verwenden
+    report: bool = False  # Laufbericht zusätzlich als <Name>.report.json neben das Transkript
+    skip_silence: bool = False  # Energie-Vorlauf: lange Stille nicht transkribieren
+    align: bool = False  # Wort-Zeitstempel per Alignment (wav2vec2), eigene Phase im Laufbericht
+    formats: Tuple[str, ...] = ("txt",)  # Ausgabeformate, in einem Durchgang geschrieben (txt, srt, vtt, json, tsv)
+    checkpoint: bool = True  # Streaming: Stand nach jedem Fenster sichern, abgebrochene Läufe dort fortsetzen
+    language_probe: bool = True  # Sprache "auto": per Kurzprobe erkennen und cachen, bevor das ganze Audio decodiert wird
+    language_threshold: float = 0.8  # Mindest-Wahrscheinlichkeit der Kurzprobe, darunter volle Erkennung in model.transcribe
+    language_source: Optional[str] = None  # Quelle (z. B. Kanal) – Sprach-Cache gilt dann auch für neue Dateien daraus
+    store: bool = True  # Segmente zusätzlich in den durchsuchbaren Transkript-Speicher (transcripts.db) schreiben
+    diarize: bool = False  # Sprecher zuordnen (pyannote), eigene Phase im Laufbericht
+    min_speakers: int = 0  # Diarisierung: Unter-/Obergrenze der Sprecherzahl (0 = automatisch)
+    max_speakers: int = 0
     
     SUPPORTED_MODELS = {"tiny", "base", "small", "medium", "large", "large-v2", "large-v3"}
     SUPPORTED_LANGUAGES = {"en", "fr", "de", "es", "it", "pt", "ru", "ja", "zh"}
+    SUPPORTED_FORMATS = ("txt", "srt", "vtt", "json", "tsv")
     
     def validate(self) -> None:
         """Validate configuration parameters"""
@@ -71,6 +115,19 @@ class TranscriptionConfig:
         
         if self.language and self.language not in self.SUPPORTED_LANGUAGES:
             raise ValueError(f"Unsupported language: {self.language}")
+        
+        unknown = [fmt for fmt in self.formats if fmt not in self.SUPPORTED_FORMATS]
+        if unknown or not self.formats:
+            raise ValueError(f"Unsupported output format: {', '.join(unknown) or '(none)'}")
+        
+        if self.stream and not (30.0 <= self.stream_window and 0.0 <= self.stream_overlap < self.stream_window / 2):
+            raise ValueError("Streaming: window must be >= 30 s and overlap < window / 2")
+        
+        if self.diarize and self.stream:
+            raise ValueError("Diarization needs the whole recording and is not available in streaming mode")
+        
+        if self.min_speakers < 0 or self.max_speakers < 0 or (self.max_speakers and self.min_speakers > self.max_speakers):
+            raise ValueError("Speakers: 0 <= min_speakers <= max_speakers")
 
 
 # ============================================================================
@@ -103,12 +160,33 @@ def setup_logging() -> logging.Logger:
 # Device Detection
 # ============================================================================
 
+_ML_IMPORT_LOCK = threading.Lock()
+
+
+def ml_imported() -> bool:
+    return whisperx is not None
+
+
+def _import_ml() -> None:
+    """torch und whisperx importieren (einmal pro Prozess, idempotent)."""
+    global torch, whisperx
+    if whisperx is not None:
+        return
+    with _ML_IMPORT_LOCK:
+        if whisperx is None:
+            import torch as _torch
+            import whisperx as _whisperx
+            torch = _torch
+            whisperx = _whisperx
+
+
 def detect_device() -> tuple[str, str]:
     """
     Detect optimal device and compute type for transcription
     Returns: (device, compute_type)
     """
     logger = logging.getLogger(__name__)
+    _import_ml()
     
     # Check for CUDA (NVIDIA GPU)
     if torch.cuda.is_available():
@@ -134,34 +212,83 @@ def detect_device() -> tuple[str, str]:
     compute_type = "int8"
     logger.info("💻 Using CPU (slower, but works)")
     
-    # Check if running on modern CPU with AVX2
-    try:
-        import cpuinfo
-        info = cpuinfo.get_cpu_info()
-        if 'avx2' in info.get('flags', []):
-            logger.info(f"   CPU: {info.get('brand_raw', 'Unknown')}")
-            logger.info("   AVX2 acceleration available")
-    except Exception:
-        pass
+    # CPU-Flags direkt aus /proc/cpuinfo (py-cpuinfo startet Unterprozesse und kostet ~1 s)
+    flags = cpu_flags()
+    if 'avx2' in flags:
+        logger.info("   AVX2 acceleration available")
+    if flags & {'avx512_vnni', 'avx_vnni'}:
+        logger.info("   VNNI available (schnelles int8)")
     
     return device, compute_type
 
 
+def cpu_flags() -> set:
+    """CPU-Flags (Linux, x86); leer, wenn nicht ermittelbar."""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+
+DEFAULT_BATCH_SIZE = 16
+_DETECTED_DEVICE: Optional[Tuple[str, str]] = None
+
+
+def resolve_device(config: TranscriptionConfig) -> TranscriptionConfig:
+    """
+    "auto"-Werte auflösen: device (Erkennung einmal pro Prozess), dann compute_type, batch_size (0)
+    und threads (0) aus dem Autotune-Profil für Modell + Device, sonst die Vorgaben des Devices.
+    Ausdrücklich gesetzte Werte bleiben unverändert.
+    """
+    global _DETECTED_DEVICE
+    device = config.device
+    if device == "auto" or config.compute_type == "auto":
+        if _DETECTED_DEVICE is None:
+            _DETECTED_DEVICE = detect_device()
+        if device == "auto":
+            device = _DETECTED_DEVICE[0]
+    profile = load_profile(config.model_size, device) if config.use_profile else None
+    profile = profile or {}
+    compute_type = config.compute_type
+    if compute_type == "auto":
+        compute_type = profile.get("compute_type") or ("float16" if device == "cuda" else "int8")
+    return replace(
+        config,
+        device=device,
+        compute_type=compute_type,
+        batch_size=config.batch_size or int(profile.get("batch_size") or DEFAULT_BATCH_SIZE),
+        threads=config.threads or int(profile.get("threads") or 0),
+    )
+
+
 # ============================================================================
 # Transcription Functions
 # ============================================================================
 
 def load_model(config: TranscriptionConfig, logger: logging.Logger) -> Any:
     """Load WhisperX model with automatic device detection"""
+    _import_ml()
+    config = resolve_device(config)
     logger.info(f"Loading model: {config.model_size}")
     logger.info(f"Device: {config.device}, Compute type: {config.compute_type}")
     
     try:
+        kwargs: Dict[str, Any] = {}
+        if config.threads > 0:
+            # CTranslate2 (cpu_threads) und torch (Intra-Op) auf das Thread-Budget begrenzen
+            kwargs["threads"] = config.threads
+            torch.set_num_threads(config.threads)
+            logger.info(f"Threads: {config.threads}")
         model = whisperx.load_model(
             config.model_size,
             device=config.device,
             compute_type=config.compute_type,
-            language=config.language
+            language=config.language,
+            **kwargs,
         )
         logger.info("✓ Model loaded successfully")
         return model
@@ -171,55 +298,415 @@ def load_model(config: TranscriptionConfig, logger: logging.Logger) -> Any:
         raise
 
 
-def _extract_audio_to_wav(source: Path, logger: logging.Logger) -> Path:
-    """FFmpeg: Audio aus Video/Container in temp WAV (16 kHz mono) extrahieren. Umgeht Codec-/Pipe-Probleme."""
-    fd, wav_path = tempfile.mkstemp(suffix=".wav", prefix="vw_audio_")
-    os.close(fd)
-    wav_path = Path(wav_path)
+# Geladene Modelle, Schlüssel (model_size, device, compute_type). Batch- und Daemon-Läufe teilen sie.
+_MODEL_CACHE: Dict[tuple, Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def model_cache_key(config: TranscriptionConfig) -> tuple:
+    config = resolve_device(config)
+    return (config.model_size, config.device, config.compute_type)
+
+
+def get_model(config: TranscriptionConfig, logger: logging.Logger) -> Any:
+    """
+    Modell aus dem Prozess-Cache holen oder einmalig laden.
+    Sprache wird nicht fest ins Modell geladen, sondern pro Aufruf an transcribe() übergeben –
+    so kann ein warmes Modell Jobs mit beliebiger Sprache bedienen.
+    """
+    config = resolve_device(config)
+    key = model_cache_key(config)
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = load_model(replace(config, language=None), logger)
+            _MODEL_CACHE[key] = model
+        else:
+            logger.info(f"Modell aus Cache: {key}")
+        return model
+
+
+SAMPLE_RATE = 16000  # WhisperX erwartet 16 kHz mono float32
+
+# FFmpeg-Streamauswahl: zuerst nur Audio (-vn, ohne Untertitel/Daten) – umgeht Fehler wie
+# "Output file does not contain any stream"; danach explizit erster Audio-Stream.
+_FFMPEG_STREAM_SELECTIONS = (
+    ["-vn", "-sn", "-dn"],
+    ["-map", "0:a:0", "-vn"],
+)
+
+
+def _ffmpeg_pcm_command(source: Path, selection: List[str], max_seconds: Optional[float] = None) -> List[str]:
+    return [
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-threads", "0", "-i", str(source),
+        *selection,
+        *(["-t", f"{max_seconds:g}"] if max_seconds else []),
+        "-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+
+
+def open_native_wav(source: Path) -> Optional["wave.Wave_read"]:
+    """
+    WAV, das schon im Zielformat vorliegt (16 kHz, mono, 16 Bit PCM – z. B. Download-Modus "pcm"),
+    zum direkten Lesen öffnen; None für alles andere (das geht weiter über FFmpeg).
+    """
+    if source.suffix.lower() != ".wav":
+        return None
     try:
-        subprocess.run(
-            [
-                "ffmpeg", "-y", "-i", str(source),
-                "-vn", "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1",
-                str(wav_path),
-            ],
-            check=True,
-            capture_output=True,
+        wav = wave.open(str(source), "rb")
+    except (wave.Error, EOFError, OSError):
+        return None
+    if (wav.getnchannels(), wav.getsampwidth(), wav.getframerate(), wav.getcomptype()) != (1, 2, SAMPLE_RATE, "NONE"):
+        wav.close()
+        return None
+    return wav
+
+
+def _pcm16_to_float(data: bytes) -> "np.ndarray":
+    # Gleiche Skalierung wie FFmpeg bei s16 → f32le
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def _iter_windows(
+    read: Callable[[int], "np.ndarray"],
+    window: int,
+    hop: int,
+    start: int = 0,
+) -> Iterator[Tuple[float, "np.ndarray"]]:
+    """
+    Fenster mit Überlappung aus einer Quelle, die pro Aufruf bis zu n Samples liefert (leer = Ende).
+    start > 0: die Quelle steht bereits bei Sample start (Fortsetzen) – die Fenster sind dieselben wie ab 0.
+    """
+    offset = start
+    tail = np.zeros(0, dtype=np.float32)
+    if start:
+        # Überlappung des vorherigen Fensters, wie im durchgehenden Lauf
+        tail = read(window - hop)
+    while True:
+        need = window - tail.shape[0]
+        data = read(need)
+        if not data.shape[0]:
+            break
+        samples = np.concatenate([tail, data])
+        yield offset / SAMPLE_RATE, samples
+        if data.shape[0] < need:
+            break  # EOF innerhalb des Fensters
+        tail = samples[hop:]
+        offset += hop
+
+
+def load_audio_pcm(source: Path, logger: logging.Logger, max_seconds: Optional[float] = None) -> "np.ndarray":
+    """
+    Audio mit einem einzigen FFmpeg-Prozess decodieren: 16 kHz mono float32 direkt aus der Pipe
+    in ein NumPy-Array (ersetzt Temp-WAV + whisperx.load_audio, also kein zweites Decodieren).
+    WAV im Zielformat wird ohne FFmpeg direkt gelesen. max_seconds: nur den Anfang decodieren.
+    """
+    wav = open_native_wav(source)
+    if wav is not None:
+        with wav:
+            logger.info("WAV 16 kHz mono: direkt gelesen (ohne FFmpeg)")
+            frames = wav.getnframes()
+            if max_seconds:
+                frames = min(frames, int(max_seconds * SAMPLE_RATE))
+            return _pcm16_to_float(wav.readframes(frames))
+    last_error = ""
+    for selection in _FFMPEG_STREAM_SELECTIONS:
+        cmd = _ffmpeg_pcm_command(source, selection, max_seconds)
+        logger.info(f"FFmpeg-Decode: {' '.join(selection)}")
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            logger.error("FFmpeg nicht gefunden")
+            raise
+        buf = bytearray()
+        while True:
+            chunk = proc.stdout.read(1 << 20)
+            if not chunk:
+                break
+            buf += chunk
+        stderr = proc.stderr.read().decode("utf-8", errors="replace").strip()
+        proc.wait()
+        if proc.returncode == 0 and buf:
+            # bytearray → beschreibbares Array ohne Kopie
+            return np.frombuffer(buf, dtype=np.float32)
+        last_error = stderr.splitlines()[-1] if stderr else f"Exit-Code {proc.returncode}, keine Audiodaten"
+        logger.warning(f"FFmpeg-Decode fehlgeschlagen ({' '.join(selection)}): {last_error}")
+    raise RuntimeError(f"Audio konnte nicht decodiert werden: {last_error}")
+
+
+def window_samples(window_seconds: float, overlap_seconds: float) -> Tuple[int, int]:
+    """(Fensterlänge, Schrittweite) in Samples – Fenster n beginnt bei Sample n * Schrittweite."""
+    window = int(window_seconds * SAMPLE_RATE)
+    return window, window - int(overlap_seconds * SAMPLE_RATE)
+
+
+def iter_audio_windows(
+    source: Path,
+    logger: logging.Logger,
+    window_seconds: float,
+    overlap_seconds: float,
+    start_sample: int = 0,
+) -> Iterator[Tuple[float, "np.ndarray"]]:
+    """
+    Audio in festen Fenstern mit Überlappung decodieren: (Startzeit in s, Samples).
+    Ein FFmpeg-Prozess, aus dessen Pipe blockweise gelesen wird – im Speicher liegt nie mehr als ein Fenster.
+    start_sample (Vielfaches der Schrittweite): ab diesem Fenster fortsetzen. FFmpeg decodiert dafür von vorn
+    und verwirft die Samples davor – so sind die Fenster bitgleich mit einem durchgehenden Lauf.
+    """
+    window, hop = window_samples(window_seconds, overlap_seconds)
+    wav = open_native_wav(source)
+    if wav is not None:
+        with wav:
+            logger.info("WAV 16 kHz mono: direkt gelesen (ohne FFmpeg)")
+            if start_sample:
+                wav.setpos(min(start_sample, wav.getnframes()))
+            yield from _iter_windows(lambda n: _pcm16_to_float(wav.readframes(n)), window, hop, start_sample)
+        return
+    last_error = ""
+    for selection in _FFMPEG_STREAM_SELECTIONS:
+        proc = subprocess.Popen(
+            _ffmpeg_pcm_command(source, selection), stdout=subprocess.PIPE, stderr=subprocess.PIPE
         )
-        return wav_path
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
-        logger.warning(f"FFmpeg-Extraktion fehlgeschlagen: {e}")
-        if wav_path.exists():
-            wav_path.unlink(missing_ok=True)
-        raise
+        yielded = False
+        received = False
+
+        def read(n: int) -> "np.ndarray":
+            nonlocal received
+            data = np.frombuffer(proc.stdout.read(n * 4), dtype=np.float32)
+            received = received or data.shape[0] > 0
+            return data
+
+        try:
+            skip = start_sample
+            while skip > 0:
+                got = read(min(skip, 60 * SAMPLE_RATE)).shape[0]
+                if not got:
+                    break
+                skip -= got
+            for item in _iter_windows(read, window, hop, start_sample):
+                yielded = True
+                yield item
+            stderr = proc.stderr.read().decode("utf-8", errors="replace").strip()
+            proc.wait()
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        if proc.returncode == 0 and received:
+            return
+        last_error = stderr.splitlines()[-1] if stderr else f"Exit-Code {proc.returncode}, keine Audiodaten"
+        if yielded:
+            raise RuntimeError(f"FFmpeg-Decode abgebrochen: {last_error}")
+        logger.warning(f"FFmpeg-Decode fehlgeschlagen ({' '.join(selection)}): {last_error}")
+    raise RuntimeError(f"Audio konnte nicht decodiert werden: {last_error}")
+
+
+# ============================================================================
+# Silence Skipping (Energie-Vorlauf auf 16-kHz-PCM)
+# ============================================================================
+
+SILENCE_FRAME_SECONDS = 0.03
+SILENCE_MIN_SECONDS = 1.0  # kürzere Pausen bleiben drin (Sprechpausen, Satzgrenzen)
+SILENCE_PAD_SECONDS = 0.25  # Rand um jede Sprachregion, damit Wortanfänge/-enden nicht abgeschnitten werden
+SILENCE_MARGIN_DB = 12.0  # Schwelle über dem Grundrauschen (10. Perzentil der Frame-Pegel)
+SILENCE_FLOOR_DB = -60.0  # darunter immer Stille
+SILENCE_QUIET_DB = -45.0  # Abschnitt ohne Dynamik und leiser als das: komplett Stille
+
+
+def detect_speech_regions(
+    audio: "np.ndarray",
+    min_silence: float = SILENCE_MIN_SECONDS,
+    pad: float = SILENCE_PAD_SECONDS,
+) -> List[Tuple[int, int]]:
+    """
+    Sprachregionen als (Start, Ende) in Samples: RMS-Pegel pro 30-ms-Frame, Schwelle relativ zum
+    Grundrauschen. Nur Stille ab min_silence Sekunden wird ausgespart. Ohne erkennbare Dynamik
+    bleibt das ganze Audio eine Region (z. B. durchgehend Musik) – außer es ist insgesamt leise
+    (z. B. ein Streaming-Fenster mit nur Raumrauschen), dann ist es keine.
+    """
+    total = audio.shape[0]
+    frame = int(SILENCE_FRAME_SECONDS * SAMPLE_RATE)
+    n_frames = total // frame
+    if n_frames < 2:
+        return [(0, total)]
+    frames = audio[: n_frames * frame].reshape(n_frames, frame)
+    level_db = 10.0 * np.log10(np.mean(np.square(frames, dtype=np.float32), axis=1) + 1e-10)
+    threshold = max(float(np.percentile(level_db, 10)) + SILENCE_MARGIN_DB, SILENCE_FLOOR_DB)
+    if threshold >= float(level_db.max()):
+        return [] if level_db.max() < SILENCE_QUIET_DB else [(0, total)]
+
+    active = level_db > threshold
+    # Übergänge aktiv/inaktiv → Läufe inaktiver Frames
+    edges = np.flatnonzero(np.diff(np.concatenate(([1], active.astype(np.int8), [1]))))
+    silences = [(a, b) for a, b in zip(edges[::2], edges[1::2]) if (b - a) * SILENCE_FRAME_SECONDS >= min_silence]
+
+    regions: List[Tuple[int, int]] = []
+    pad_samples = int(pad * SAMPLE_RATE)
+    cursor = 0
+    for a, b in ((int(a), int(b)) for a, b in silences):
+        start_silence = a * frame + (pad_samples if a > 0 else 0)
+        end_silence = b * frame - (pad_samples if b < n_frames else 0)
+        if b >= n_frames:
+            end_silence = total  # Stille bis zum Ende (inkl. Rest < 1 Frame)
+        if start_silence > cursor:
+            regions.append((cursor, start_silence))
+        cursor = max(cursor, end_silence)
+    if cursor < total:
+        regions.append((cursor, total))
+    return regions
+
+
+def _remap_time(t: float, starts_compact: List[float], mapping: List[Tuple[float, float, float]]) -> float:
+    """Zeit im zusammengeschnittenen Audio → Zeit in der Originalaufnahme."""
+    idx = max(0, bisect.bisect_right(starts_compact, t) - 1)
+    compact_start, original_start, length = mapping[idx]
+    return original_start + min(t - compact_start, length)
+
+
+def _remap_segments(segments: List[Dict[str, Any]], mapping: List[Tuple[float, float, float]]) -> List[Dict[str, Any]]:
+    starts_compact = [m[0] for m in mapping]
+
+    def _fix(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {**item, **{k: _remap_time(item[k], starts_compact, mapping) for k in ("start", "end") if k in item}}
+
+    remapped = []
+    for segment in segments:
+        fixed = _fix(segment)
+        if "words" in segment:
+            fixed["words"] = [_fix(w) for w in segment["words"]]
+        remapped.append(fixed)
+    return remapped
+
+
+def _transcribe_samples(
+    model,
+    audio: "np.ndarray",
+    config: TranscriptionConfig,
+    language: Optional[str],
+    logger: logging.Logger,
+    on_fraction: Optional[Callable[[float], None]] = None,
+) -> Dict[str, Any]:
+    """
+    model.transcribe, mit config.skip_silence nur über die Sprachregionen: Regionen werden zu einem
+    Array zusammengesetzt, die Zeitstempel danach auf die Originalzeitachse zurückgerechnet.
+    Übersprungene Sekunden stehen in result["silence_skipped"].
+    """
+    if not config.skip_silence:
+        return _model_transcribe(model, audio, config, language, on_fraction)
+
+    scan_start = time.perf_counter()
+    regions = detect_speech_regions(audio)
+    speech = sum(b - a for a, b in regions)
+    skipped = (audio.shape[0] - speech) / SAMPLE_RATE
+    logger.info(
+        f"Stille-Vorlauf: {len(regions)} Sprachregionen, {skipped:.1f} s von {audio.shape[0] / SAMPLE_RATE:.1f} s "
+        f"übersprungen ({time.perf_counter() - scan_start:.2f} s)"
+    )
+    if not regions:
+        return {"segments": [], "language": language, "silence_skipped": round(skipped, 2)}
+    if skipped < SILENCE_MIN_SECONDS:
+        result = _model_transcribe(model, audio, config, language, on_fraction)
+        result["silence_skipped"] = 0.0
+        return result
+
+    mapping: List[Tuple[float, float, float]] = []
+    position = 0
+    for a, b in regions:
+        mapping.append((position / SAMPLE_RATE, a / SAMPLE_RATE, (b - a) / SAMPLE_RATE))
+        position += b - a
+    compact = np.concatenate([audio[a:b] for a, b in regions])
+    result = _model_transcribe(model, compact, config, language, on_fraction)
+    del compact
+    result["segments"] = _remap_segments(result.get("segments", []), mapping)
+    result["silence_skipped"] = round(skipped, 2)
+    return result
+
+
+def _model_transcribe(
+    model,
+    audio: "np.ndarray",
+    config: TranscriptionConfig,
+    language: Optional[str],
+    on_fraction: Optional[Callable[[float], None]] = None,
+) -> Dict[str, Any]:
+    """
+    model.transcribe mit echtem Fortschritt (Anteil der abgearbeiteten VAD-Chunks), sofern WhisperX ihn meldet.
+    Speichermangel: batch_size halbieren und erneut versuchen. config bleibt unverändert – der gesenkte Wert
+    steht in result["batch_size"], der Aufrufer übernimmt ihn per replace() für den Rest des Laufs.
+    """
+    attempt = config
+    while True:
+        try:
+            result = _model_transcribe_once(model, audio, attempt, language, on_fraction)
+        except (MemoryError, RuntimeError) as e:
+            if not _is_out_of_memory(e) or attempt.batch_size <= 1:
+                raise
+            lowered = max(1, attempt.batch_size // 2)
+            logging.getLogger(__name__).warning(
+                f"Speichermangel bei batch_size={attempt.batch_size} – neuer Versuch mit {lowered}: {e}"
+            )
+            attempt = replace(attempt, batch_size=lowered)
+            _release_memory()
+            continue
+        if attempt is not config:
+            result["batch_size"] = attempt.batch_size
+        return result
+
+
+def _model_transcribe_once(
+    model,
+    audio: "np.ndarray",
+    config: TranscriptionConfig,
+    language: Optional[str],
+    on_fraction: Optional[Callable[[float], None]] = None,
+) -> Dict[str, Any]:
+    if on_fraction is None:
+        return model.transcribe(audio, batch_size=config.batch_size, language=language)
+    try:
+        supports_progress = "print_progress" in inspect.signature(model.transcribe).parameters
+    except (TypeError, ValueError):
+        supports_progress = False
+    if not supports_progress:
+        return model.transcribe(audio, batch_size=config.batch_size, language=language)
+    with contextlib.redirect_stdout(_ProgressLineParser(on_fraction, sys.stdout)):
+        return model.transcribe(audio, batch_size=config.batch_size, language=language, print_progress=True)
+
+
+def _is_out_of_memory(error: BaseException) -> bool:
+    if isinstance(error, MemoryError):
+        return True
+    text = str(error).lower()
+    return "out of memory" in text or "cannot allocate memory" in text or "failed to allocate" in text
+
+
+def _release_memory() -> None:
+    gc.collect()
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
 
 
 def transcribe_audio(
     model,
     config: TranscriptionConfig,
     logger: logging.Logger,
-    audio_path: Optional[Path] = None,
+    audio: Optional["np.ndarray"] = None,
+    on_fraction: Optional[Callable[[float], None]] = None,
 ) -> Dict[str, Any]:
-    """Transcribe audio/video file (API wie WhisperX README: load_audio → transcribe)."""
-    path_to_load = audio_path if audio_path is not None else config.file_path
+    """Transcribe audio/video file (API wie WhisperX README: Audio laden → transcribe)."""
     logger.info(f"Starting transcription: {config.file_path.name}")
     logger.info(f"Language: {'Auto-detect' if not config.language else config.language}")
     logger.info(f"Batch size: {config.batch_size}")
 
     try:
-        logger.info(f"Lade Audio: whisperx.load_audio({path_to_load.name})")
-        audio = whisperx.load_audio(str(path_to_load))
-        if hasattr(audio, "shape") and len(audio.shape) >= 1:
-            logger.info(f"Audio geladen: {audio.shape[0]} Samples (ca. {audio.shape[0] / 16000:.1f} s bei 16 kHz)")
-        else:
-            logger.info("Audio geladen (WhisperX load_audio).")
+        if audio is None:
+            logger.info(f"Lade Audio: {config.file_path.name}")
+            audio = load_audio_pcm(config.file_path, logger)
+        logger.info(f"Audio geladen: {audio.shape[0]} Samples (ca. {audio.shape[0] / SAMPLE_RATE:.1f} s bei 16 kHz)")
 
         logger.info(f"Starte model.transcribe (batch_size={config.batch_size}, language={config.language or 'auto'})")
-        result = model.transcribe(
-            audio,
-            batch_size=config.batch_size,
-            language=config.language
-        )
+        result = _transcribe_samples(model, audio, config, config.language, logger, on_fraction)
 
         detected_language = result.get("language", "unknown")
         segments = result.get("segments", [])
@@ -235,30 +722,160 @@ def transcribe_audio(
         raise
 
 
+def _shift_segment(segment: Dict[str, Any], offset: float) -> Dict[str, Any]:
+    """Zeitstempel eines Fenster-Segments (inkl. Wörter) auf die absolute Zeitachse verschieben."""
+    shifted = dict(segment)
+    for key in ("start", "end"):
+        if key in shifted:
+            shifted[key] = shifted[key] + offset
+    if "words" in segment:
+        shifted["words"] = [
+            {**w, **{k: w[k] + offset for k in ("start", "end") if k in w}} for w in segment["words"]
+        ]
+    return shifted
+
+
+def transcribe_streaming(
+    model,
+    config: TranscriptionConfig,
+    logger: logging.Logger,
+    on_segments: Callable[[List[Dict[str, Any]]], None],
+    on_window: Optional[Callable[[float], None]] = None,
+    on_position: Optional[Callable[[float], None]] = None,
+    aligner: Optional[Callable[[List[Dict[str, Any]], "np.ndarray", str], List[Dict[str, Any]]]] = None,
+    checkpoint: Optional["StreamCheckpoint"] = None,
+) -> Dict[str, Any]:
+    """
+    Lange Aufnahmen fensterweise transkribieren (config.stream_window / stream_overlap).
+    Segmente werden auf absolute Zeit verschoben; in der Überlappung gilt der Schnittpunkt in ihrer Mitte:
+    Segmente, die davor beginnen, stammen aus dem früheren Fenster, alle anderen aus dem späteren.
+    Fertige Segmente gehen sofort an on_segments (inkrementelles Schreiben); im Speicher liegt nur ein Fenster Audio.
+    on_position erhält die absolute Audioposition (s) innerhalb des laufenden Fensters.
+    aligner (optional) richtet die Segmente eines Fensters mit dessen Samples aus, bevor sie verschoben werden.
+    checkpoint (optional): Stand nach jedem Fenster sichern; ein vorhandener Stand wird fortgesetzt –
+    seine Segmente gehen zuerst an on_segments, dann geht es beim nächsten Fenster weiter.
+    """
+    language = config.language
+    half_overlap = config.stream_overlap / 2
+    _, hop = window_samples(config.stream_window, config.stream_overlap)
+    chunks: List[SegmentTable] = []  # eine Tabelle pro Fenster – zusammengefügt wird einmal am Ende
+    held: List[Dict[str, Any]] = []  # Segmente nach dem Schnittpunkt – werden vom nächsten Fenster ersetzt
+    windows = 0
+    skipped = 0.0
+
+    state = checkpoint.load() if checkpoint is not None else None
+    if state:
+        windows = state["windows"]
+        language = state["language"]
+        skipped = state["silence_skipped"]
+        chunks = [SegmentTable.from_columns(state["segments"])]
+        held = state["held"]
+        logger.info(
+            f"Checkpoint gefunden: setze nach Fenster {windows} fort ({state['position']:.1f} s, "
+            f"{len(chunks[0])} Segmente, Sprache={language})"
+        )
+        if len(chunks[0]):
+            on_segments(chunks[0])
+
+    for offset, samples in iter_audio_windows(
+        config.file_path, logger, config.stream_window, config.stream_overlap, start_sample=windows * hop
+    ):
+        windows += 1
+        window_end = offset + samples.shape[0] / SAMPLE_RATE
+        logger.info(f"Fenster {windows}: {offset:.1f}–{window_end:.1f} s")
+        on_fraction = None
+        if on_position is not None:
+            window_len = window_end - offset
+            on_fraction = lambda frac, o=offset, n=window_len: on_position(o + frac * n)  # noqa: E731
+        result = _transcribe_samples(model, samples, config, language, logger, on_fraction)
+        if "batch_size" in result:
+            config = replace(config, batch_size=result.pop("batch_size"))  # gesenkt: gilt für die weiteren Fenster
+        skipped += result.get("silence_skipped", 0.0)
+        if language is None:
+            language = result.get("language")
+            logger.info(f"Sprache aus erstem Fenster: {language} (gilt für alle weiteren Fenster)")
+        if aligner is not None and language:
+            result["segments"] = aligner(result.get("segments", []), samples, language)
+
+        cut_prev = offset + half_overlap if windows > 1 else float("-inf")
+        cut_next = window_end - half_overlap
+        final: List[Dict[str, Any]] = []
+        held = []
+        for segment in result.get("segments", []):
+            segment = _shift_segment(segment, offset)
+            start = segment.get("start", 0.0)
+            if start < cut_prev:
+                continue
+            (final if start < cut_next else held).append(segment)
+        if final:
+            chunks.append(SegmentTable.from_segments(final))
+            on_segments(final)
+        if checkpoint is not None:
+            checkpoint.append({
+                "windows": windows, "position": windows * hop / SAMPLE_RATE, "language": language,
+                "silence_skipped": skipped, "segments": SegmentTable.from_segments(final).to_columns(), "held": held,
+            })
+        if on_window is not None:
+            on_window(cut_next)
+
+    # Letztes Fenster: Segmente nach dem Schnittpunkt sind ebenfalls endgültig
+    if held:
+        chunks.append(SegmentTable.from_segments(held))
+        on_segments(held)
+    all_segments = SegmentTable.concat(chunks)
+    logger.info(f"Streaming fertig: {windows} Fenster, {len(all_segments)} Segmente, Sprache={language}")
+    result: Dict[str, Any] = {"segments": all_segments, "language": language}
+    if config.skip_silence:
+        # Überlappungen werden doppelt gezählt – als Näherung für den Bericht genügt das
+        result["silence_skipped"] = round(skipped, 2)
+    return result
+
+
+# Alignment-Modelle (wav2vec2) pro (Sprache, Device) – Batch- und Daemon-Läufe laden sie nur einmal
+_ALIGN_MODEL_CACHE: Dict[Tuple[str, str], Tuple[Any, Dict[str, Any]]] = {}
+_ALIGN_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def get_align_model(language: str, device: str, logger: logging.Logger) -> Tuple[Any, Dict[str, Any]]:
+    """Alignment-Modell und Metadaten aus dem Prozess-Cache holen oder einmalig laden."""
+    _import_ml()
+    key = (language, device)
+    with _ALIGN_MODEL_CACHE_LOCK:
+        cached = _ALIGN_MODEL_CACHE.get(key)
+        if cached is None:
+            logger.info(f"Lade Alignment-Modell: {language} ({device})")
+            cached = whisperx.load_align_model(language_code=language, device=device)
+            _ALIGN_MODEL_CACHE[key] = cached
+        else:
+            logger.info(f"Alignment-Modell aus Cache: {key}")
+        return cached
+
+
 def align_segments(
     segments: List[Dict[str, Any]],
-    audio_path: Path,
+    audio: "np.ndarray",
     language: str,
     device: str,
     logger: logging.Logger
 ) -> Optional[Dict[str, Any]]:
     """
-    Align segments for word-level timestamps (optional enhancement)
+    Align segments for word-level timestamps (optional enhancement).
+    Nutzt das bereits decodierte Audio-Array (kein erneutes Decodieren der Datei).
     Returns aligned result or None if alignment fails
     """
+    if not segments:
+        return None
     try:
         logger.info("Aligning segments for word-level timestamps...")
-        model_a, metadata = whisperx.load_align_model(
-            language_code=language,
-            device=device
-        )
-        
+        model_a, metadata = get_align_model(language, device, logger)
+
         result_aligned = whisperx.align(
             segments,
             model_a,
             metadata,
-            str(audio_path),
-            device
+            audio,
+            device,
+            return_char_alignments=False,
         )
         
         logger.info("✓ Alignment completed")
@@ -268,38 +885,40 @@ def align_segments(
         return None
 
 
+def _speaker_prefix(segment: Dict[str, Any]) -> str:
+    """Präfix "[SPEAKER_00] " vor dem Text, wenn die Diarisierung einen Sprecher zugeordnet hat."""
+    return f"[{segment['speaker']}] " if segment.get("speaker") else ""
+
+
+def _format_segment(segment: Dict[str, Any], include_word_timestamps: bool = False) -> List[str]:
+    """Zeilen für ein Segment: "[start - end] Text", optional eingerückte Wort-Zeitstempel."""
+    start_time = segment.get('start', 0.0)
+    end_time = segment.get('end', 0.0)
+    text = segment.get('text', '').strip()
+    
+    # Segment-level timestamp
+    lines = [f"[{start_time:.2f}s - {end_time:.2f}s] {_speaker_prefix(segment)}{text}"]
+    
+    # Optional: Word-level timestamps
+    if include_word_timestamps and 'words' in segment:
+        for word_info in segment['words']:
+            word = word_info.get('word', '')
+            w_start = word_info.get('start', 0.0)
+            lines.append(f"  [{w_start:.2f}s] {word}")
+    return lines
+
+
 def format_transcription(
     result: Dict[str, Any],
     include_word_timestamps: bool = False
 ) -> str:
-    """Format transcription result as text with timestamps"""
-    if 'segments' not in result or not result['segments']:
-        return "No transcription data available."
-    
-    output_lines = []
-    
-    for segment in result['segments']:
-        start_time = segment.get('start', 0.0)
-        end_time = segment.get('end', 0.0)
-        text = segment.get('text', '').strip()
-        
-        # Segment-level timestamp
-        output_lines.append(f"[{start_time:.2f}s - {end_time:.2f}s] {text}")
-        
-        # Optional: Word-level timestamps
-        if include_word_timestamps and 'words' in segment:
-            word_lines = []
-            for word_info in segment['words']:
-                word = word_info.get('word', '')
-                w_start = word_info.get('start', 0.0)
-                w_end = word_info.get('end', 0.0)
-                word_lines.append(f"  [{w_start:.2f}s] {word}")
-            if word_lines:
-                output_lines.extend(word_lines)
-        
-        output_lines.append("")  # Empty line between segments
-    
-    return "\n".join(output_lines)
+    """Format transcription result as text with timestamps (gleiches Layout wie die .txt-Ausgabe)"""
+    buffer = io.StringIO()
+    writer = TxtWriter(buffer, include_word_timestamps)
+    for segment in result.get('segments') or []:
+        writer.write(segment)
+    writer.close(result.get('language'))
+    return buffer.getvalue()
 
 
 def save_transcription(
@@ -322,206 +941,2521 @@ def save_transcription(
 
 
 # ============================================================================
-# Main Transcription Pipeline
+# Segment Table (kompakte Segmente für sehr lange Transkripte)
 # ============================================================================
 
-def _write_progress(progress_file: Optional[str], text: str) -> None:
-    if not progress_file:
-        return
-    try:
-        with open(progress_file, "w", encoding="utf-8") as f:
-            f.write(text + "\n")
-            f.flush()
-            if hasattr(os, "fsync"):
-                os.fsync(f.fileno())
-    except OSError:
-        pass
+def _text_buffer(texts: List[str]) -> Tuple[str, "np.ndarray"]:
+    """Texte in einem String + Offsets (n + 1): Text i = buffer[offsets[i]:offsets[i + 1]]."""
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    if texts:
+        np.cumsum([len(t) for t in texts], out=offsets[1:])
+    return "".join(texts), offsets
 
 
-def run_transcription(
-    config: TranscriptionConfig,
-    logger: logging.Logger,
-    progress_file: Optional[str] = None,
-) -> None:
-    """Main transcription pipeline. Wenn progress_file gesetzt: nur dort Fortschritt, keine Konsole."""
-    try:
-        # Bibliotheken (z. B. Lightning) dürfen nicht auf die Konsole loggen – nur in Datei
-        root = logging.getLogger()
-        for h in root.handlers[:]:
-            if isinstance(h, logging.StreamHandler) and getattr(h, "stream", None) in (sys.stdout, sys.stderr):
-                root.removeHandler(h)
-        logger.info("=== Pipeline start ===")
-        config.validate()
-        logger.info("Configuration validated")
-        logger.info(f"Input: {config.file_path} ({config.file_path.stat().st_size / 1024 / 1024:.2f} MB)")
-        logger.info(f"Output dir: {config.output_path}")
-        logger.info(f"Model: {config.model_size}, Device: {config.device}, Compute: {config.compute_type}")
+def _nan_array(values: List[Optional[float]]) -> "np.ndarray":
+    """Fehlende Werte (None) als NaN – z. B. Wörter ohne Zeitstempel (Zahlen, die das Alignment nicht zuordnet)."""
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
 
-        _write_progress(progress_file, "Lade Modell…")
-        if not progress_file and sys.stdout.isatty():
-            print(f"  {C_CYN}⟳{C_OFF} Lade Modell …", flush=True)
-        logger.info("Lade WhisperX-Modell (whisperx.load_model)...")
-        model = load_model(config, logger)
-
-        temp_wav: Optional[Path] = None
-        if config.file_path.suffix.lower() != ".wav":
-            logger.info("Extrahiere Audio per FFmpeg (WAV 16 kHz mono) …")
-            temp_wav = _extract_audio_to_wav(config.file_path, logger)
-
-        _write_progress(progress_file, "Transkribiere…")
-        if progress_file:
-            _write_progress(progress_file, " 0%")
-        if not progress_file and sys.stdout.isatty():
-            print(f"  {C_CYN}⟳{C_OFF} Transkribiere …", flush=True)
-        logger.info("Starte Transkription (load_audio + model.transcribe)...")
-
-        stop_fake_progress = threading.Event()
-        fake_progress_done = threading.Event()
-
-        def _fake_progress_while_transcribing() -> None:
-            """Während transcribe_audio() läuft: Anzeige von 1% auf 89% hochziehen (alle ~2 s)."""
-            for pct in range(1, 90):
-                if stop_fake_progress.wait(timeout=2.0):
-                    break
-                _write_progress(progress_file, f" {pct}%")
-            fake_progress_done.set()
 
-        if progress_file:
-            t = threading.Thread(target=_fake_progress_while_transcribing, daemon=True)
-            t.start()
-        try:
-            result = transcribe_audio(
-                model, config, logger,
-                audio_path=temp_wav if temp_wav is not None else None,
-            )
-        finally:
-            stop_fake_progress.set()
-            if progress_file:
-                fake_progress_done.wait(timeout=1.0)
-            if temp_wav is not None and temp_wav.exists():
-                try:
-                    temp_wav.unlink()
-                except OSError:
-                    pass
-
-        # Format output + Fortschritt in % (Segment-Schleife: 90% → 100%)
-        if result.get('segments'):
-            total_segments = len(result['segments'])
-            logger.info(f"Processing {total_segments} segments...")
-            if progress_file and total_segments > 0:
-                last_pct = 89
-                for idx in range(total_segments):
-                    # Segment-Fortschritt auf 90–100% abbilden
-                    pct = 90 + int(10.0 * (idx + 1) / total_segments)
-                    if pct > 100:
-                        pct = 100
-                    if pct != last_pct:
-                        _write_progress(progress_file, f" {pct}%")
-                        last_pct = pct
-            elif not progress_file:
-                for _ in tqdm(
-                    result['segments'],
-                    desc='  Segmente',
-                    unit='segment',
-                    ncols=80,
-                    leave=True,
-                    file=sys.stdout,
-                ):
-                    pass
-        
-        transcription_text = format_transcription(result)
-        logger.info(f"Formatiert: {len(transcription_text)} Zeichen, {len(result.get('segments', []))} Segmente")
+class SegmentTable:
+    """
+    Segmente spaltenweise statt als Liste von Dicts: Zeiten in NumPy-Arrays, alle Texte in einem String
+    mit Offsets, Sprecher als Index in eine Namensliste; Wörter (Alignment) genauso, pro Segment ein Bereich.
+    Eine 10-h-Aufnahme mit --align sind dann ein paar Dutzend große Objekte statt Millionen kleiner Dicts.
+    Kompatibel mit dem WhisperX-Format: len(), Iteration und table[i] liefern Segment-Dicts
+    (start, end, text, speaker, words) – gebaut erst beim Zugriff, nicht gespeichert.
+    """
 
-        output_file = save_transcription(transcription_text, config, logger)
-        if output_file.exists():
-            logger.info(f"Datei geschrieben: {output_file} ({output_file.stat().st_size} Bytes)")
-        logger.info("=== Pipeline Ende (Erfolg) ===")
+    def __init__(self, columns: Dict[str, Any]):
+        self.start = np.asarray(columns["start"], dtype=np.float64)
+        self.end = np.asarray(columns["end"], dtype=np.float64)
+        self.text_buffer: str = columns["text"]
+        self.text_offsets = np.asarray(columns["text_offsets"], dtype=np.int64)
+        self.speaker = np.asarray(columns["speaker"], dtype=np.int32)  # -1 = kein Sprecher
+        self.speakers: List[str] = list(columns["speakers"])
+        self.has_words = np.asarray(columns["has_words"], dtype=bool)  # Segment hatte "words" (auch leer)
+        self.word_offsets = np.asarray(columns["word_offsets"], dtype=np.int64)  # Wörter von Segment i: [w[i], w[i+1])
+        self.word_start = np.asarray(columns["word_start"], dtype=np.float64)
+        self.word_end = np.asarray(columns["word_end"], dtype=np.float64)
+        self.word_score = np.asarray(columns["word_score"], dtype=np.float64)
+        self.word_speaker = np.asarray(columns["word_speaker"], dtype=np.int32)
+        self.word_text_buffer: str = columns["word_text"]
+        self.word_text_offsets = np.asarray(columns["word_text_offsets"], dtype=np.int64)
 
-        _write_progress(progress_file, "100%")
-        if not progress_file:
-            print(f"\n{C_CYN}{'═'*60}{C_OFF}")
-            print(f"{C_GRN}✓ Transkription fertig.{C_OFF} Gespeichert in:")
-            print(f"  {C_BLD}{output_file}{C_OFF}")
-            print(f"{C_CYN}{'═'*60}{C_OFF}\n")
+    @classmethod
+    def from_segments(cls, segments: Any) -> "SegmentTable":
+        """Aus WhisperX-Segmenten (Liste von Dicts) aufbauen; eine SegmentTable bleibt, wie sie ist."""
+        if isinstance(segments, cls):
+            return segments
+        segments = list(segments or [])
+        speakers: Dict[str, int] = {}
 
-    except Exception as e:
-        logger.error(f"Transcription pipeline failed: {e}")
-        logger.info("=== Pipeline Ende (Fehler) ===")
-        logger.debug(traceback.format_exc())
-        if not progress_file:
-            print(f"\n{C_RED}✗ Fehler: {e}{C_OFF}")
-            print(f"{C_DIM}Details siehe Log-Datei.{C_OFF}\n")
-        sys.exit(1)
+        def _speaker(item: Dict[str, Any]) -> int:
+            name = item.get("speaker")
+            return -1 if not name else speakers.setdefault(name, len(speakers))
+
+        words = [w for seg in segments for w in seg.get("words") or []]
+        text, text_offsets = _text_buffer([str(seg.get("text", "")) for seg in segments])
+        word_text, word_text_offsets = _text_buffer([str(w.get("word", "")) for w in words])
+        word_offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+        if segments:
+            np.cumsum([len(seg.get("words") or []) for seg in segments], out=word_offsets[1:])
+        return cls({
+            "start": [seg.get("start", 0.0) for seg in segments],
+            "end": [seg.get("end", 0.0) for seg in segments],
+            "text": text, "text_offsets": text_offsets,
+            "speaker": [_speaker(seg) for seg in segments],
+            "has_words": ["words" in seg for seg in segments],
+            "word_offsets": word_offsets,
+            "word_start": _nan_array([w.get("start") for w in words]),
+            "word_end": _nan_array([w.get("end") for w in words]),
+            "word_score": _nan_array([w.get("score") for w in words]),
+            "word_speaker": [_speaker(w) for w in words],
+            "word_text": word_text, "word_text_offsets": word_text_offsets,
+            "speakers": list(speakers),
+        })
+
+    @classmethod
+    def concat(cls, tables: List["SegmentTable"]) -> "SegmentTable":
+        """Tabellen hintereinanderhängen (Streaming: eine pro Fenster); Sprecher-Indizes werden zusammengeführt."""
+        tables = [t for t in tables if len(t)] or [cls.from_segments([])]
+        if len(tables) == 1:
+            return tables[0]
+        speakers: Dict[str, int] = {}
+        speaker_cols, word_speaker_cols = [], []
+        for t in tables:
+            remap = np.array([speakers.setdefault(name, len(speakers)) for name in t.speakers] + [-1], dtype=np.int32)
+            speaker_cols.append(remap[t.speaker])  # -1 → letzter Eintrag → -1
+            word_speaker_cols.append(remap[t.word_speaker])
+
+        def _offsets(arrays: List["np.ndarray"]) -> "np.ndarray":
+            shifted, base = [np.zeros(1, dtype=np.int64)], 0
+            for offsets in arrays:
+                shifted.append(offsets[1:] + base)
+                base += int(offsets[-1])
+            return np.concatenate(shifted)
+
+        return cls({
+            "start": np.concatenate([t.start for t in tables]),
+            "end": np.concatenate([t.end for t in tables]),
+            "text": "".join(t.text_buffer for t in tables),
+            "text_offsets": _offsets([t.text_offsets for t in tables]),
+            "speaker": np.concatenate(speaker_cols),
+            "has_words": np.concatenate([t.has_words for t in tables]),
+            "word_offsets": _offsets([t.word_offsets for t in tables]),
+            "word_start": np.concatenate([t.word_start for t in tables]),
+            "word_end": np.concatenate([t.word_end for t in tables]),
+            "word_score": np.concatenate([t.word_score for t in tables]),
+            "word_speaker": np.concatenate(word_speaker_cols),
+            "word_text": "".join(t.word_text_buffer for t in tables),
+            "word_text_offsets": _offsets([t.word_text_offsets for t in tables]),
+            "speakers": list(speakers),
+        })
+
+    def __len__(self) -> int:
+        return self.start.shape[0]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def text(self, i: int) -> str:
+        return self.text_buffer[self.text_offsets[i]:self.text_offsets[i + 1]]
+
+    def words(self, i: int) -> List[Dict[str, Any]]:
+        words = []
+        for w in range(self.word_offsets[i], self.word_offsets[i + 1]):
+            word: Dict[str, Any] = {"word": self.word_text_buffer[self.word_text_offsets[w]:self.word_text_offsets[w + 1]]}
+            for key, column in (("start", self.word_start), ("end", self.word_end), ("score", self.word_score)):
+                if not np.isnan(column[w]):
+                    word[key] = float(column[w])
+            if self.word_speaker[w] >= 0:
+                word["speaker"] = self.speakers[self.word_speaker[w]]
+            words.append(word)
+        return words
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        segment: Dict[str, Any] = {"start": float(self.start[i]), "end": float(self.end[i]), "text": self.text(i)}
+        if self.speaker[i] >= 0:
+            segment["speaker"] = self.speakers[self.speaker[i]]
+        if self.has_words[i]:
+            segment["words"] = self.words(i)
+        return segment
+
+    def rows(self) -> Iterator[Tuple[float, float, Optional[str], str]]:
+        """(start, end, Sprecher, Text) pro Segment – ohne Dicts und ohne Wörter (Transkript-Speicher, Suche)."""
+        names = self.speakers + [None]  # Index -1 → None
+        for i, (start, end, speaker) in enumerate(zip(self.start.tolist(), self.end.tolist(), self.speaker.tolist())):
+            yield start, end, names[speaker], self.text(i)
+
+    def to_columns(self) -> Dict[str, Any]:
+        """JSON-fähige Spalten (Cache, Checkpoint): ein paar lange Listen statt eines Objekts pro Segment/Wort."""
+        def _floats(column: "np.ndarray") -> List[Optional[float]]:
+            # NaN ist kein gültiges JSON → None
+            return [None if v != v else v for v in column.tolist()]
+
+        return {
+            "start": self.start.tolist(), "end": self.end.tolist(),
+            "text": self.text_buffer, "text_offsets": self.text_offsets.tolist(),
+            "speaker": self.speaker.tolist(), "speakers": self.speakers, "has_words": self.has_words.tolist(),
+            "word_offsets": self.word_offsets.tolist(),
+            "word_start": _floats(self.word_start), "word_end": _floats(self.word_end),
+            "word_score": _floats(self.word_score), "word_speaker": self.word_speaker.tolist(),
+            "word_text": self.word_text_buffer, "word_text_offsets": self.word_text_offsets.tolist(),
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Any) -> "SegmentTable":
+        """Gegenstück zu to_columns; ältere Cache-/Checkpoint-Einträge (Liste von Dicts) gehen über from_segments."""
+        if not isinstance(columns, dict):
+            return cls.from_segments(columns)
+        columns = dict(columns)
+        for key in ("word_start", "word_end", "word_score"):
+            columns[key] = _nan_array(columns[key])
+        return cls(columns)
+
+
+def _segment_rows(segments: Any) -> Iterator[Tuple[float, float, Optional[str], str]]:
+    """(start, end, Sprecher, Text) aus einer SegmentTable oder einer Liste von Segment-Dicts."""
+    if isinstance(segments, SegmentTable):
+        return segments.rows()
+    return ((seg.get("start", 0.0), seg.get("end", 0.0), seg.get("speaker"), str(seg.get("text", "")))
+            for seg in segments or [])
 
 
 # ============================================================================
-# CLI Entry Point
+# Output Writers (txt, srt, vtt, json, tsv)
 # ============================================================================
 
-def parse_arguments() -> tuple[TranscriptionConfig, Optional[str]]:
-    """Parse command line arguments. Returns (config, progress_file_path or None)."""
-    if len(sys.argv) < 3:
-        print(f"{C_BLD}Verwendung:{C_OFF} transcribe.py <Eingabedatei> <Ausgabeordner> [Modell] [Sprache] [Fortschrittsdatei]")
-        print(f"\n{C_DIM}Modelle:{C_OFF} tiny, base, small (Standard), medium, large, large-v2, large-v3")
-        print(f"{C_DIM}Sprachen:{C_OFF} en, de, fr, es, it, pt, ru, ja, zh oder Auto (Standard)")
-        sys.exit(1)
-    
-    file_path = Path(sys.argv[1]).resolve()
-    output_path = Path(sys.argv[2]).resolve()
-    model_size = sys.argv[3] if len(sys.argv) > 3 else "small"
-    language = (sys.argv[4].strip() or None) if len(sys.argv) > 4 else None
-    progress_file = sys.argv[5] if len(sys.argv) > 5 else None
-    
-    # Auto-detect device and compute type
-    device, compute_type = detect_device()
-    
-    config = TranscriptionConfig(
-        file_path=file_path,
-        output_path=output_path,
-        model_size=model_size,
-        language=language,
-        device=device,
-        compute_type=compute_type
-    )
-    return config, progress_file
+def _clock(seconds: float, decimal: str) -> str:
+    """Sekunden → HH:MM:SS,mmm (SRT) bzw. HH:MM:SS.mmm (VTT)."""
+    ms = max(0, int(round(seconds * 1000)))
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal}{ms:03d}"
 
 
-def main() -> None:
-    """Main entry point"""
-    config, progress_file = parse_arguments()
-    logger = setup_logging()
-    logger.info("="*60)
-    logger.info("Video Whisper - Transcription Tool")
-    logger.info("="*60)
-    
-    log_stream = None
-    if progress_file:
-        log_dir = Path(__file__).resolve().parent / "logs"
-        log_dir.mkdir(exist_ok=True)
-        log_stream = open(log_dir / "whisper.log", "a", encoding="utf-8")
-        sys.stdout = sys.stderr = log_stream
-    
-    try:
-        run_transcription(config, logger, progress_file)
-    except KeyboardInterrupt:
-        logger.info("\n⚠ Transcription cancelled by user")
-        if not progress_file:
-            print(f"\n{C_YEL}⚠ Abgebrochen durch Benutzer.{C_OFF}\n")
-        sys.exit(130)
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}")
-        logger.debug(traceback.format_exc())
-        if not progress_file:
-            print(f"\n{C_RED}✗ Unerwarteter Fehler: {e}{C_OFF}\n")
-        sys.exit(1)
-    finally:
-        if log_stream is not None:
-            try:
-                log_stream.close()
-            except OSError:
-                pass
-            sys.stdout = sys.__stdout__
-            sys.stderr = sys.__stderr__
+def _json_default(value: Any) -> Any:
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class SegmentWriter:
+    """
+    Schreibt Segmente einzeln in eine geöffnete Datei (kein Gesamtdokument im Speicher).
+    write() pro Segment in Zeitreihenfolge, close() einmal am Ende (die Sprache steht erst dann sicher fest).
+    """
+
+    extension = ""
+
+    def __init__(self, out: TextIO, include_words: bool = False):
+        self.out = out
+        self.include_words = include_words
+        self.count = 0
+
+    def write(self, segment: Dict[str, Any]) -> None:
+        self._write(segment)
+        self.count += 1
+
+    def _write(self, segment: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def close(self, language: Optional[str]) -> None:
+        pass
+
+
+class TxtWriter(SegmentWriter):
+    """Bisheriges Format: "[start - end] Text", Leerzeile zwischen Segmenten, optional Wort-Zeitstempel."""
+
+    extension = "txt"
+
+    def _write(self, segment: Dict[str, Any]) -> None:
+        self.out.write(("\n" if self.count else "") + "\n".join(_format_segment(segment, self.include_words)) + "\n")
+
+    def close(self, language: Optional[str]) -> None:
+        if not self.count:
+            self.out.write("No transcription data available.")
+
+
+class SrtWriter(SegmentWriter):
+    extension = "srt"
+
+    def _write(self, segment: Dict[str, Any]) -> None:
+        start, end = _clock(segment.get("start", 0.0), ","), _clock(segment.get("end", 0.0), ",")
+        self.out.write(f"{self.count + 1}\n{start} --> {end}\n{_speaker_prefix(segment)}{segment.get('text', '').strip()}\n\n")
+
+
+class VttWriter(SegmentWriter):
+    extension = "vtt"
+
+    def __init__(self, out: TextIO, include_words: bool = False):
+        super().__init__(out, include_words)
+        self.out.write("WEBVTT\n\n")
+
+    def _write(self, segment: Dict[str, Any]) -> None:
+        start, end = _clock(segment.get("start", 0.0), "."), _clock(segment.get("end", 0.0), ".")
+        voice = f"<v {segment['speaker']}>" if segment.get("speaker") else ""  # WebVTT-Sprecher-Tag
+        self.out.write(f"{start} --> {end}\n{voice}{segment.get('text', '').strip()}\n\n")
+
+
+class TsvWriter(SegmentWriter):
+    """Wie Whisper: start/end in Millisekunden, Tabulator-getrennt."""
+
+    extension = "tsv"
+
+    def __init__(self, out: TextIO, include_words: bool = False):
+        super().__init__(out, include_words)
+        self.out.write("start\tend\ttext\n")
+
+    def _write(self, segment: Dict[str, Any]) -> None:
+        text = _speaker_prefix(segment) + " ".join(segment.get("text", "").split())  # Tabs/Zeilenumbrüche entfernen
+        start, end = int(round(segment.get("start", 0.0) * 1000)), int(round(segment.get("end", 0.0) * 1000))
+        self.out.write(f"{start}\t{end}\t{text}\n")
+
+
+class JsonWriter(SegmentWriter):
+    """{"segments": [...], "language": …} – Segmente werden einzeln serialisiert, die Sprache folgt am Ende."""
+
+    extension = "json"
+
+    def __init__(self, out: TextIO, include_words: bool = False):
+        super().__init__(out, include_words)
+        self.out.write('{"segments": [')
+
+    def _write(self, segment: Dict[str, Any]) -> None:
+        item: Dict[str, Any] = {
+            "start": segment.get("start", 0.0),
+            "end": segment.get("end", 0.0),
+            "text": segment.get("text", "").strip(),
+        }
+        if "speaker" in segment:
+            item["speaker"] = segment["speaker"]
+        if "words" in segment:
+            item["words"] = segment["words"]
+        self.out.write(("," if self.count else "") + "\n  " + json.dumps(item, ensure_ascii=False, default=_json_default))
+
+    def close(self, language: Optional[str]) -> None:
+        self.out.write(("\n" if self.count else "") + f'], "language": {json.dumps(language)}}}\n')
+
+
+OUTPUT_WRITERS: Dict[str, type] = {cls.extension: cls for cls in (TxtWriter, SrtWriter, VttWriter, JsonWriter, TsvWriter)}
+
+
+class TranscriptWriters:
+    """
+    Alle gewünschten Formate in einem Durchgang: jedes Segment geht sofort an jeden Writer
+    (eine Datei <Name>.<Format> pro Format im Ausgabeordner). Als Context-Manager benutzen.
+    """
+
+    def __init__(self, config: TranscriptionConfig, logger: logging.Logger):
+        self.config = config
+        self.logger = logger
+        self.paths = [config.output_path / f"{config.file_path.stem}.{fmt}" for fmt in config.formats]
+        self.writers: List[SegmentWriter] = []
+        self.language: Optional[str] = None
+        self._files: List[TextIO] = []
+
+    @property
+    def primary(self) -> Path:
+        """Hauptausgabe (Rückgabewert, Meldungen): .txt, falls gewünscht, sonst das erste Format."""
+        if "txt" in self.config.formats:
+            return self.paths[self.config.formats.index("txt")]
+        return self.paths[0]
+
+    @property
+    def count(self) -> int:
+        return self.writers[0].count if self.writers else 0
+
+    def __enter__(self) -> "TranscriptWriters":
+        self.config.output_path.mkdir(parents=True, exist_ok=True)
+        try:
+            for fmt, path in zip(self.config.formats, self.paths):
+                f = path.open("w", encoding="utf-8")
+                self._files.append(f)
+                self.writers.append(OUTPUT_WRITERS[fmt](f, self.config.align))
+        except Exception:
+            self._close_files()
+            raise
+        return self
+
+    def write(self, segments: List[Dict[str, Any]]) -> None:
+        for segment in segments:
+            for writer in self.writers:
+                writer.write(segment)
+        for f in self._files:
+            f.flush()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                for writer in self.writers:
+                    writer.close(self.language)
+        finally:
+            self._close_files()
+        if exc_type is None:
+            for path in self.paths:
+                self.logger.info(f"✓ Transcription saved: {path} ({path.stat().st_size} Bytes)")
+
+    def _close_files(self) -> None:
+        for f in self._files:
+            f.close()
+        self._files = []
+
+
+def write_transcription(result: Dict[str, Any], config: TranscriptionConfig, logger: logging.Logger) -> Path:
+    """Ergebnis in alle config.formats schreiben – ein Durchgang über die Segmente. Gibt die Hauptausgabe zurück."""
+    with TranscriptWriters(config, logger) as writers:
+        writers.language = result.get("language")
+        writers.write(result.get("segments") or [])
+    return writers.primary
+
+
+# ============================================================================
+# Transcription Cache
+# ============================================================================
+
+CACHE_DIR = Path(__file__).resolve().parent / "cache"
+DEFAULT_CACHE_MAX_MB = 512
+
+
+def file_content_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Inhalts-Hash der Datei (BLAKE2b) – unabhängig von Dateiname und Ordner."""
+    digest = hashlib.blake2b(digest_size=20)
+    with path.open("rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_entries(directory: Path) -> List[Path]:
+    """Einträge (*.json) eines Cache-Ordners, älteste Zugriffe (mtime) zuerst."""
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+
+
+def _evict_lru(directory: Path, max_bytes: int) -> int:
+    """Älteste Einträge löschen, bis die Gesamtgröße unter max_bytes liegt. Gibt die Anzahl zurück."""
+    entries = _cache_entries(directory)
+    total = sum(p.stat().st_size for p in entries)
+    removed = 0
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        total -= entry.stat().st_size
+        entry.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def _write_cache_entry(entry: Path, payload: Dict[str, Any]) -> None:
+    """Eintrag atomar schreiben (tmp + os.replace) – parallele Leser sehen nie eine halbe Datei."""
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = entry.with_suffix(".tmp")
+    tmp.write_text(
+        json.dumps(payload, ensure_ascii=False, default=lambda o: o.item() if hasattr(o, "item") else str(o)),
+        encoding="utf-8",
+    )
+    os.replace(tmp, entry)
+
+
+class TranscriptCache:
+    """
+    Persistenter Cache für Rohergebnisse von model.transcribe (ein JSON pro Eintrag).
+    Schlüssel: Inhalts-Hash der Datei + alle ergebnisrelevanten Einstellungen. Umbenannte Dateien
+    treffen denselben Eintrag. Größenbegrenzung per LRU (Zugriffszeit = mtime der Eintragsdatei).
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.directory = directory or (CACHE_DIR / "transcripts")
+        if max_bytes is None:
+            max_mb = float(os.environ.get("VIDEO_WHISPER_CACHE_MAX_MB", DEFAULT_CACHE_MAX_MB))
+            max_bytes = int(max_mb * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def settings_for(config: TranscriptionConfig) -> Dict[str, Any]:
+        settings: Dict[str, Any] = {
+            "model_size": config.model_size,
+            "language": config.language,
+            # "auto" (Standard der Kommandozeile) steht für die Vorgabe dieser Maschine – so kommt
+            # ein Cache-Treffer ohne torch-Import und Device-Erkennung aus
+            "compute_type": config.compute_type,
+        }
+        if config.stream:
+            settings["stream"] = [config.stream_window, config.stream_overlap]
+        if config.skip_silence:
+            settings["skip_silence"] = True
+        if config.align:
+            settings["align"] = True
+        if config.diarize:
+            settings["diarize"] = [diarize_model_source(), config.min_speakers, config.max_speakers]
+        return settings
+
+    def key_for(self, config: TranscriptionConfig, content_hash: str) -> str:
+        payload = json.dumps({"audio": content_hash, **self.settings_for(config)}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entry(key)
+        try:
+            data = json.loads(entry.read_text(encoding="utf-8"))
+            os.utime(entry)  # LRU: Zugriff vermerken
+            result = data["result"]
+            return {**result, "segments": SegmentTable.from_columns(result.get("segments") or [])}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def store(self, key: str, result: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        # Segmente spaltenweise: ein paar lange Listen statt eines JSON-Objekts pro Segment und Wort
+        columns = SegmentTable.from_segments(result.get("segments") or []).to_columns()
+        payload = {"meta": {**meta, "stored_at": time.time()}, "result": {**result, "segments": columns}}
+        _write_cache_entry(self._entry(key), payload)
+        self.evict()
+
+    def entries(self) -> List[Path]:
+        return _cache_entries(self.directory)
+
+    def evict(self) -> int:
+        """Älteste Einträge löschen, bis die Gesamtgröße unter max_bytes liegt. Gibt die Anzahl zurück."""
+        return _evict_lru(self.directory, self.max_bytes)
+
+    def clear(self) -> int:
+        entries = self.entries()
+        for entry in entries:
+            entry.unlink(missing_ok=True)
+        return len(entries)
+
+    def info(self) -> Dict[str, Any]:
+        entries = self.entries()
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "bytes": sum(p.stat().st_size for p in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+# ============================================================================
+# Checkpoints (lange Streaming-Läufe fortsetzen)
+# ============================================================================
+
+CHECKPOINT_VERSION = 2
+
+
+class StreamCheckpoint:
+    """
+    Zwischenstand eines Streaming-Laufs als <Name>.checkpoint.jsonl neben der Ausgabe: eine Kopfzeile
+    (Schlüssel), danach pro Fenster eine angehängte Zeile mit dessen fertigen Segmenten, den zurückgehaltenen
+    Segmenten, nächster Position und Sprache. Angehängt wird nur das neue Fenster – der Aufwand pro Fenster
+    bleibt konstant, egal wie lang das Transkript schon ist. Nach Erfolg gelöscht. Gilt nur für denselben
+    Inhalt mit denselben Einstellungen (Schlüssel wie im Cache) – ein Neustart setzt beim nächsten Fenster
+    fort, das Ergebnis ist dasselbe wie ohne Unterbrechung. Eine beim Abbruch halb geschriebene letzte
+    Zeile wird verworfen.
+    """
+
+    def __init__(self, config: TranscriptionConfig, content_hash: str):
+        self.path = config.output_path / f"{config.file_path.stem}.checkpoint.jsonl"
+        self._state: Optional[Dict[str, Any]] = None
+        self._loaded = False
+        self._valid_bytes = 0  # Länge des gültigen Anfangs (Kopfzeile + vollständige Fensterzeilen)
+        self._file: Optional[Any] = None
+        payload = json.dumps(
+            {"audio": content_hash, "checkpoint": CHECKPOINT_VERSION, **TranscriptCache.settings_for(config)},
+            sort_keys=True,
+        )
+        self.key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Gesicherter Stand oder None (keiner, anderer Inhalt/andere Einstellungen). Wird nur einmal gelesen.
+        state["segments"] ist eine SegmentTable mit den fertigen Segmenten aller gesicherten Fenster.
+        """
+        if self._loaded:
+            return self._state
+        self._loaded = True
+        try:
+            with open(self.path, "rb") as f:
+                header = f.readline()
+                if not header.endswith(b"\n") or json.loads(header).get("key") != self.key:
+                    return None
+                offset = len(header)
+                records = []
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        break
+                    offset += len(line)
+        except (OSError, ValueError, AttributeError):
+            return None
+        self._valid_bytes = offset
+        if records:
+            tables = [SegmentTable.from_columns(record.pop("segments")) for record in records]
+            self._state = {**records[-1], "segments": SegmentTable.concat(tables)}
+        return self._state
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Ein Fenster anhängen: {windows, position, language, silence_skipped, segments (nur neue), held}."""
+        if self._file is None:
+            self.load()
+            if self._valid_bytes:
+                # Fortsetzen: einen halb geschriebenen Rest abschneiden, dann weiter anhängen
+                self._file = open(self.path, "r+b")
+                self._file.truncate(self._valid_bytes)
+                self._file.seek(self._valid_bytes)
+            else:
+                self._file = open(self.path, "wb")
+                self._file.write(json.dumps({"key": self.key, "started_at": time.time()}).encode("utf-8") + b"\n")
+        line = json.dumps({**record, "saved_at": time.time()}, ensure_ascii=False, default=_json_default)
+        self._file.write(line.encode("utf-8") + b"\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+# ============================================================================
+# Language Detection (Kurzprobe vor der Transkription)
+# ============================================================================
+
+LANGUAGE_PROBE_SECONDS = 20.0  # so viele Sekunden Sprache gehen in die Erkennung
+LANGUAGE_PROBE_DECODE_SECONDS = 180.0  # höchstens so viel vom Dateianfang decodieren, um sie zu finden
+
+
+class LanguageCache:
+    """
+    Erkannte Sprachen in cache/languages.json – pro Inhalts-Hash und optional pro Quelle (z. B. YouTube-Kanal,
+    siehe --language-source). Eine kleine Datei, atomar geschrieben; vor jedem Schreiben neu gelesen,
+    damit parallele Läufe sich nicht gegenseitig Einträge löschen.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or (CACHE_DIR / "languages.json")
+        self.data = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        data: Dict[str, Dict[str, Any]] = {"files": {}, "sources": {}}
+        try:
+            loaded = json.loads(self.path.read_text(encoding="utf-8"))
+            for section in data:
+                data[section].update(loaded.get(section) or {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        return data
+
+    def lookup(self, content_hash: str, source: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Eintrag für den Inhalt, sonst für die Quelle; "via" sagt, welcher."""
+        entry = self.data["files"].get(content_hash) if content_hash else None
+        if entry:
+            return {**entry, "via": "file"}
+        entry = self.data["sources"].get(source) if source else None
+        if entry:
+            return {**entry, "via": "source"}
+        return None
+
+    def store(self, content_hash: str, source: Optional[str], language: str,
+              probability: Optional[float], method: str) -> None:
+        entry = {
+            "language": language,
+            "probability": round(probability, 3) if probability is not None else None,
+            "method": method,
+            "stored_at": time.time(),
+        }
+        self.data = self._read()
+        if content_hash:
+            self.data["files"][content_hash] = entry
+        if source:
+            self.data["sources"][source] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.data, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def language_probe(audio: "np.ndarray", seconds: float = LANGUAGE_PROBE_SECONDS) -> "np.ndarray":
+    """Die ersten Sekunden Sprache als ein Array – Stille und Pausen davor zählen nicht mit."""
+    limit = int(seconds * SAMPLE_RATE)
+    parts: List["np.ndarray"] = []
+    total = 0
+    for a, b in detect_speech_regions(audio):
+        take = min(b - a, limit - total)
+        parts.append(audio[a:a + take])
+        total += take
+        if total >= limit:
+            break
+    return np.concatenate(parts) if parts else audio[:0]
+
+
+def detect_language_probe(
+    model: Any,
+    source: Path,
+    logger: logging.Logger,
+) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Sprache aus einer Kurzprobe: Dateianfang decodieren, die ersten LANGUAGE_PROBE_SECONDS Sprache
+    an den Sprach-Detektor von faster-whisper geben. (Sprache, Wahrscheinlichkeit) oder (None, None).
+    """
+    try:
+        head = load_audio_pcm(source, logger, max_seconds=LANGUAGE_PROBE_DECODE_SECONDS)
+    except RuntimeError as e:
+        logger.warning(f"Sprach-Kurzprobe: Dateianfang nicht decodierbar ({e})")
+        return None, None
+    probe = language_probe(head)
+    if probe.shape[0] < SAMPLE_RATE:
+        logger.info("Sprach-Kurzprobe: keine Sprache am Dateianfang gefunden")
+        return None, None
+    # WhisperX-Pipeline → faster_whisper.WhisperModel (model.model) mit detect_language → (Sprache, p, alle)
+    detect = getattr(getattr(model, "model", None), "detect_language", None)
+    if detect is None:
+        logger.info("Sprach-Kurzprobe: Modell bietet keine Spracherkennung mit Wahrscheinlichkeit")
+        return None, None
+    try:
+        language, probability = detect(probe)[:2]
+    except Exception as e:
+        logger.warning(f"Sprach-Kurzprobe fehlgeschlagen (volle Erkennung): {e}")
+        logger.debug(traceback.format_exc())
+        return None, None
+    logger.info(f"Sprach-Kurzprobe: {language} ({float(probability):.0%}, {probe.shape[0] / SAMPLE_RATE:.1f} s Sprache)")
+    return language, float(probability)
+
+
+def _preload_align_model(language: str, device: str, logger: logging.Logger) -> None:
+    """Alignment-Modell im Hintergrund laden, während decodiert/transkribiert wird (align wartet darauf)."""
+
+    def _load() -> None:
+        try:
+            get_align_model(language, device, logger)
+        except Exception as e:
+            logger.warning(f"Alignment-Modell konnte nicht vorab geladen werden: {e}")
+
+    threading.Thread(target=_load, name="align-preload", daemon=True).start()
+
+
+# ============================================================================
+# Speaker Diarization (pyannote über WhisperX)
+# ============================================================================
+
+DEFAULT_DIARIZE_MODEL = "pyannote/speaker-diarization-3.1"
+
+# Diarisierungs-Pipelines pro (Modell, Device) – Batch- und Daemon-Läufe laden sie nur einmal
+_DIARIZE_CACHE: Dict[Tuple[str, str], Any] = {}
+_DIARIZE_CACHE_LOCK = threading.Lock()
+
+
+def diarize_model_source() -> str:
+    """
+    Modell aus $VIDEO_WHISPER_DIARIZE_MODEL: Hugging-Face-Name oder lokaler Pfad (config.yaml bzw. Ordner).
+    Ein lokaler Pfad wird offline geladen – kein Token, kein Netzwerk.
+    """
+    return os.environ.get("VIDEO_WHISPER_DIARIZE_MODEL", "").strip() or DEFAULT_DIARIZE_MODEL
+
+
+def get_diarize_pipeline(device: str, logger: logging.Logger) -> Any:
+    """Diarisierungs-Pipeline aus dem Prozess-Cache holen oder einmalig laden."""
+    _import_ml()
+    source = diarize_model_source()
+    key = (source, device)
+    with _DIARIZE_CACHE_LOCK:
+        cached = _DIARIZE_CACHE.get(key)
+        if cached is not None:
+            logger.info(f"Diarisierungs-Modell aus Cache: {key}")
+            return cached
+        local = Path(source).expanduser()
+        if local.exists():
+            # Lokale Modelle: pyannote liest eine config.yaml direkt von der Platte (Pfade darin lokal) –
+            # kein Token, keine Hub-Anfrage; die Prozessumgebung bleibt unverändert (Daemon, Kindprozesse)
+            source = str(local / "config.yaml" if local.is_dir() else local)
+        from whisperx.diarize import DiarizationPipeline
+
+        kwargs: Dict[str, Any] = {"model_name": source, "device": device}
+        token = None if local.exists() else (os.environ.get("HF_TOKEN") or None)
+        params = inspect.signature(DiarizationPipeline).parameters
+        kwargs["token" if "token" in params else "use_auth_token"] = token
+        if local.exists() and "local_files_only" in params:
+            kwargs["local_files_only"] = True
+        logger.info(f"Lade Diarisierungs-Modell: {source} ({device})")
+        cached = DiarizationPipeline(**kwargs)
+        _DIARIZE_CACHE[key] = cached
+        return cached
+
+
+def diarization_cache_key(config: TranscriptionConfig, content_hash: str, compact: bool) -> str:
+    payload = json.dumps({
+        "audio": content_hash, "diarize_model": diarize_model_source(), "compact": compact,
+        "min_speakers": config.min_speakers, "max_speakers": config.max_speakers,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+DEFAULT_DIARIZE_CACHE_MAX_MB = 64
+
+
+class DiarizationCache:
+    """
+    Sprecherwechsel und Embeddings pro Inhalt (cache/diarization/, ein JSON pro Eintrag:
+    {"meta": …, "diarization": {"turns": …, "embeddings": …}}). Schlüssel aus diarization_cache_key,
+    eigenes Größenlimit, LRU wie beim Transkriptions-Cache.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = DEFAULT_DIARIZE_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory or (CACHE_DIR / "diarization")
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entry(key)
+        try:
+            diarization = json.loads(entry.read_text(encoding="utf-8"))["diarization"]
+            os.utime(entry)  # LRU: Zugriff vermerken
+            return {"turns": diarization["turns"], "embeddings": diarization.get("embeddings") or {}}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def store(self, key: str, diarization: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        _write_cache_entry(self._entry(key), {"meta": {**meta, "stored_at": time.time()}, "diarization": diarization})
+        _evict_lru(self.directory, self.max_bytes)
+
+    def clear(self) -> int:
+        entries = _cache_entries(self.directory)
+        for entry in entries:
+            entry.unlink(missing_ok=True)
+        return len(entries)
+
+
+def _run_diarization(
+    audio: "np.ndarray",
+    config: TranscriptionConfig,
+    compact: bool,
+    logger: logging.Logger,
+) -> Dict[str, Any]:
+    """
+    Sprecherwechsel für das ganze Audio: {"turns": [[start, end, speaker], …], "embeddings": {speaker: [...]}}.
+    compact (CPU): nur die Sprachregionen (wie --skip-silence) diarisieren und die Zeiten zurückrechnen –
+    die Embedding-Berechnung skaliert mit der Audiolänge, Stille kostet dann nichts.
+    """
+    pipeline = get_diarize_pipeline(config.device, logger)
+    mapping: List[Tuple[float, float, float]] = []
+    if compact:
+        regions = detect_speech_regions(audio)
+        speech = sum(b - a for a, b in regions)
+        if regions and audio.shape[0] - speech >= SILENCE_MIN_SECONDS * SAMPLE_RATE:
+            position = 0
+            for a, b in regions:
+                mapping.append((position / SAMPLE_RATE, a / SAMPLE_RATE, (b - a) / SAMPLE_RATE))
+                position += b - a
+            audio = np.concatenate([audio[a:b] for a, b in regions])
+            logger.info(f"Diarisierung nur über Sprachregionen: {speech / SAMPLE_RATE:.1f} s statt "
+                        f"{mapping[-1][1] + mapping[-1][2]:.1f} s")
+
+    kwargs: Dict[str, Any] = {}
+    if config.min_speakers:
+        kwargs["min_speakers"] = config.min_speakers
+    if config.max_speakers:
+        kwargs["max_speakers"] = config.max_speakers
+    embeddings: Dict[str, Any] = {}
+    if "return_embeddings" in inspect.signature(pipeline.__call__).parameters:
+        frame, embeddings = pipeline(audio, return_embeddings=True, **kwargs)
+    else:
+        frame = pipeline(audio, **kwargs)
+    turns = [[float(row.start), float(row.end), str(row.speaker)] for row in frame.itertuples()]
+    if mapping:
+        starts_compact = [m[0] for m in mapping]
+        turns = [[_remap_time(a, starts_compact, mapping), _remap_time(b, starts_compact, mapping), spk]
+                 for a, b, spk in turns]
+    return {
+        "turns": turns,
+        "embeddings": {str(k): [float(x) for x in np.asarray(v).ravel()] for k, v in (embeddings or {}).items()},
+    }
+
+
+def _speaker_for(start: float, end: float, turns: List[List[Any]], turn_starts: List[float]) -> Optional[str]:
+    """Sprecher mit der größten Überschneidung im Intervall [start, end] (None ohne Überschneidung)."""
+    overlap: Dict[str, float] = {}
+    # Sprecherwechsel sind nach Start sortiert; nur die, die vor end beginnen, können überlappen
+    for turn_start, turn_end, speaker in turns[: bisect.bisect_left(turn_starts, end)]:
+        shared = min(end, turn_end) - max(start, turn_start)
+        if shared > 0:
+            overlap[speaker] = overlap.get(speaker, 0.0) + shared
+    return max(overlap, key=overlap.get) if overlap else None
+
+
+def assign_speakers(segments: List[Dict[str, Any]], turns: List[List[Any]]) -> List[Dict[str, Any]]:
+    """Segmenten (und ihren Wörtern) den Sprecher mit der größten zeitlichen Überschneidung zuordnen."""
+    turns = sorted(turns, key=lambda t: t[0])
+    turn_starts = [t[0] for t in turns]
+    assigned = []
+    for segment in segments:
+        segment = dict(segment)
+        speaker = _speaker_for(segment.get("start", 0.0), segment.get("end", 0.0), turns, turn_starts)
+        if speaker is not None:
+            segment["speaker"] = speaker
+        if "words" in segment:
+            words = []
+            for word in segment["words"]:
+                if "start" in word and "end" in word:
+                    word_speaker = _speaker_for(word["start"], word["end"], turns, turn_starts)
+                    if word_speaker is not None:
+                        word = {**word, "speaker": word_speaker}
+                words.append(word)
+            segment["words"] = words
+        assigned.append(segment)
+    return assigned
+
+
+def diarize_result(
+    result: Dict[str, Any],
+    audio: "np.ndarray",
+    config: TranscriptionConfig,
+    content_hash: str,
+    logger: logging.Logger,
+) -> Dict[str, Any]:
+    """
+    Sprecher zuordnen (nach Transkription/Alignment, mit dem Audio im Speicher).
+    Sprecherwechsel und Embeddings liegen pro Inhalt im Cache (cache/diarization/) – ein erneuter Lauf,
+    etwa mit anderem Modell oder anderen Formaten, diarisiert nicht noch einmal. Ohne content_hash kein Cache.
+    """
+    compact = config.device == "cpu"
+    cache = DiarizationCache() if content_hash else None
+    key = diarization_cache_key(config, content_hash, compact) if cache is not None else ""
+    diarization = cache.load(key) if cache is not None else None
+    if diarization is not None:
+        logger.info(f"Diarisierung aus Cache ({key[:12]}…)")
+    else:
+        try:
+            diarization = _run_diarization(audio, config, compact, logger)
+        except Exception as e:
+            logger.warning(f"Diarization failed (continuing without speakers): {e}")
+            logger.debug(traceback.format_exc())
+            return result
+        if cache is not None:
+            cache.store(key, diarization, {"audio_hash": content_hash, "diarize_model": diarize_model_source()})
+    speakers = sorted({turn[2] for turn in diarization["turns"]})
+    logger.info(f"Diarisierung: {len(speakers)} Sprecher, {len(diarization['turns'])} Sprecherwechsel")
+    return {**result, "segments": assign_speakers(result.get("segments", []), diarization["turns"])}
+
+
+# ============================================================================
+# Transcript Store (SQLite/FTS5 über alle Transkripte)
+# ============================================================================
+
+STORE_SCHEMA_VERSION = 1
+
+
+def store_path() -> Path:
+    """$VIDEO_WHISPER_STORE oder transcripts.db im Projektordner."""
+    override = os.environ.get("VIDEO_WHISPER_STORE", "").strip()
+    return Path(override).expanduser() if override else Path(__file__).resolve().parent / "transcripts.db"
+
+
+class TranscriptStore:
+    """
+    Alle Transkripte in einer SQLite-Datenbank: files (Quelle, Modell, Sprache, …) und segments
+    (Start/Ende in ms, Sprecher, Text), dazu ein FTS5-Index über den Text (External Content, per
+    Trigger aktuell gehalten). Jeder Lauf ersetzt nur die Segmente seiner Datei – kein Neuaufbau.
+    Ohne FTS5 in der SQLite-Bibliothek fällt die Suche auf LIKE zurück.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or store_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Batch-Worker schreiben parallel: WAL + Wartezeit statt "database is locked"
+        self.db = sqlite3.connect(str(self.path), timeout=30.0)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        self.fts = self._create_schema()
+
+    def _create_schema(self) -> bool:
+        with self.db:
+            self.db.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT NOT NULL UNIQUE,
+                    output TEXT,
+                    content_hash TEXT,
+                    model TEXT,
+                    language TEXT,
+                    segments INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS segments (
+                    id INTEGER PRIMARY KEY,
+                    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+                    start_ms INTEGER NOT NULL,
+                    end_ms INTEGER NOT NULL,
+                    speaker TEXT,
+                    text TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS segments_file ON segments(file_id, start_ms);
+            """)
+            self.db.execute(f"PRAGMA user_version={STORE_SCHEMA_VERSION}")
+            try:
+                self.db.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+                        text, content='segments', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN
+                        INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN
+                        INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                    END;
+                """)
+            except sqlite3.OperationalError:
+                return False
+        return True
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "TranscriptStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def put(self, source: Path, result: Dict[str, Any], output: Optional[Path] = None, model: Optional[str] = None,
+            content_hash: str = "") -> int:
+        """Segmente einer Datei eintragen (vorherige Einträge derselben Quelle werden ersetzt). Gibt die Anzahl zurück."""
+        rows = [
+            (int(round(start * 1000)), int(round(end * 1000)), speaker, " ".join(text.split()))
+            for start, end, speaker, text in _segment_rows(result.get("segments"))
+        ]
+        rows = [row for row in rows if row[3]]
+        with self.db:
+            self.db.execute(
+                "INSERT INTO files (source, output, content_hash, model, language, segments, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(source) DO UPDATE SET output=excluded.output, "
+                "content_hash=excluded.content_hash, model=excluded.model, language=excluded.language, "
+                "segments=excluded.segments, updated_at=excluded.updated_at",
+                (str(source), str(output) if output else None, content_hash or None, model,
+                 result.get("language"), len(rows), time.time()),
+            )
+            file_id = self.db.execute("SELECT id FROM files WHERE source = ?", (str(source),)).fetchone()[0]
+            self.db.execute("DELETE FROM segments WHERE file_id = ?", (file_id,))
+            self.db.executemany(
+                "INSERT INTO segments (file_id, start_ms, end_ms, speaker, text) VALUES (?, ?, ?, ?, ?)",
+                [(file_id, *row) for row in rows],
+            )
+        return len(rows)
+
+    def search(self, query: str, limit: int = 50, language: Optional[str] = None, source_like: Optional[str] = None,
+               raw: bool = False) -> List[Dict[str, Any]]:
+        """
+        Treffer als {source, output, start_ms, end_ms, speaker, text, language, model}, beste zuerst.
+        query ist eine Wortfolge (Phrasensuche); raw=True reicht sie als FTS5-Syntax durch (AND, OR, NEAR, prefix*).
+        """
+        where, params = [], []
+        if self.fts:
+            match = query if raw else '"' + query.replace('"', '""') + '"'
+            sql = ("SELECT f.source, f.output, s.start_ms, s.end_ms, s.speaker, s.text, f.language, f.model "
+                   "FROM segments_fts JOIN segments s ON s.id = segments_fts.rowid JOIN files f ON f.id = s.file_id "
+                   "WHERE segments_fts MATCH ?")
+            params.append(match)
+            order = "ORDER BY bm25(segments_fts), f.source, s.start_ms"
+        else:
+            sql = ("SELECT f.source, f.output, s.start_ms, s.end_ms, s.speaker, s.text, f.language, f.model "
+                   "FROM segments s JOIN files f ON f.id = s.file_id WHERE s.text LIKE ?")
+            params.append(f"%{query}%")
+            order = "ORDER BY f.source, s.start_ms"
+        if language:
+            where.append("f.language = ?")
+            params.append(language)
+        if source_like:
+            where.append("f.source LIKE ?")
+            params.append(f"%{source_like}%")
+        sql += "".join(f" AND {w}" for w in where) + f" {order} LIMIT ?"
+        params.append(limit)
+        keys = ("source", "output", "start_ms", "end_ms", "speaker", "text", "language", "model")
+        return [dict(zip(keys, row)) for row in self.db.execute(sql, params)]
+
+    def stats(self) -> Dict[str, Any]:
+        files, segments = self.db.execute("SELECT COUNT(*), COALESCE(SUM(segments), 0) FROM files").fetchone()
+        return {"path": str(self.path), "files": files, "segments": segments, "fts5": self.fts,
+                "bytes": self.path.stat().st_size if self.path.exists() else 0}
+
+
+def store_transcript(
+    result: Dict[str, Any],
+    config: TranscriptionConfig,
+    output_file: Path,
+    content_hash: str,
+    logger: logging.Logger,
+) -> None:
+    """Lauf in den Transkript-Speicher eintragen. Fehler kosten nur den Eintrag, nie die Transkription."""
+    try:
+        with TranscriptStore() as store:
+            count = store.put(config.file_path.resolve(), result, output_file, config.model_size, content_hash)
+        logger.info(f"Transkript-Speicher: {count} Segmente ({store.path})")
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Transkript-Speicher nicht aktualisiert: {e}")
+
+
+# ============================================================================
+# Run Report (Messwerte pro Phase)
+# ============================================================================
+
+RUN_HISTORY_FILE = Path(__file__).resolve().parent / "logs" / "runs.jsonl"
+RUN_REPORT_VERSION = 1
+
+
+def _peak_rss_mb() -> float:
+    """Spitzen-RSS seit dem letzten Zurücksetzen (VmHWM), sonst seit Prozessstart (ru_maxrss, KiB)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _reset_peak_rss() -> None:
+    """VmHWM zurücksetzen (Linux ≥ 4.0), damit jede Phase ihr eigenes Speichermaximum misst."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _children_cpu_seconds() -> float:
+    """CPU-Zeit beendeter Kindprozesse (FFmpeg/ffprobe)."""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _stage_record(name: str, wall: float, cpu: float, cpu_children: float, peak_rss_mb: float) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "cpu_children_s": round(cpu_children, 4),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+    }
+
+
+@contextlib.contextmanager
+def _measure(name: str, sink: List[Dict[str, Any]], reset_peak: bool = True) -> Iterator[None]:
+    """
+    Wandzeit, CPU-Zeit (Prozess + Kindprozesse) und Spitzen-RSS eines Blocks an sink anhängen.
+    reset_peak=False für Teilphasen innerhalb einer laufenden Phase (deren Spitze bleibt erhalten).
+    """
+    if reset_peak:
+        _reset_peak_rss()
+    wall0, cpu0, child0 = time.perf_counter(), time.process_time(), _children_cpu_seconds()
+    try:
+        yield
+    finally:
+        sink.append(_stage_record(
+            name,
+            time.perf_counter() - wall0,
+            time.process_time() - cpu0,
+            _children_cpu_seconds() - child0,
+            _peak_rss_mb(),
+        ))
+
+
+def _merge_stage_records(name: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Mehrere Messungen derselben Teilphase (z. B. Alignment pro Streaming-Fenster) zusammenfassen."""
+    return _stage_record(
+        name,
+        sum(r["wall_s"] for r in records),
+        sum(r["cpu_s"] for r in records),
+        sum(r["cpu_children_s"] for r in records),
+        max(r["peak_rss_mb"] for r in records),
+    )
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        from importlib.metadata import version
+
+        return version(name)
+    except Exception:
+        return None
+
+
+class RunReport:
+    """
+    Strukturierter Laufbericht einer Datei: pro Phase Wandzeit, CPU-Zeit und Spitzen-RSS,
+    dazu Audiodauer und Echtzeitfaktor. Wird an logs/runs.jsonl angehängt (Verlauf über
+    WhisperX-Updates hinweg) und mit config.report zusätzlich als <Name>.report.json gespeichert.
+    """
+
+    def __init__(self, config: TranscriptionConfig):
+        self.config = config
+        self.stages: List[Dict[str, Any]] = []
+        self.audio_seconds: Optional[float] = None
+        self.silence_skipped: Optional[float] = None
+        self.cache_hit = False
+        self.started = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._child0 = _children_cpu_seconds()
+
+    def stage(self, name: str) -> contextlib.AbstractContextManager:
+        return _measure(name, self.stages)
+
+    def stage_seconds(self, name: str) -> float:
+        return sum(s["wall_s"] for s in self.stages if s["name"] == name)
+
+    def to_dict(self, status: str, output_file: Optional[Path] = None, error: Optional[str] = None) -> Dict[str, Any]:
+        config = self.config
+        wall = time.perf_counter() - self.started
+        report: Dict[str, Any] = {
+            "version": RUN_REPORT_VERSION,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "status": status,
+            "file": str(config.file_path),
+            "output": str(output_file) if output_file else None,
+            "model": config.model_size,
+            "language": config.language,
+            "device": config.device,
+            "compute_type": config.compute_type,
+            "batch_size": config.batch_size,
+            "threads": config.threads,
+            "stream": config.stream,
+            "cache_hit": self.cache_hit,
+            "whisperx_version": _package_version("whisperx"),
+            "torch_version": _package_version("torch"),
+            "audio_seconds": round(self.audio_seconds, 2) if self.audio_seconds else None,
+            "silence_skipped_s": self.silence_skipped,
+            "wall_s": round(wall, 3),
+            "cpu_s": round(time.process_time() - self._cpu0, 3),
+            "cpu_children_s": round(_children_cpu_seconds() - self._child0, 3),
+            "peak_rss_mb": max((s["peak_rss_mb"] for s in self.stages), default=round(_peak_rss_mb(), 1)),
+            "realtime_factor": None,
+            "transcribe_realtime_factor": None,
+            "stages": self.stages,
+        }
+        if self.audio_seconds:
+            # Echtzeitfaktor = Rechenzeit / Audiozeit (kleiner ist besser)
+            report["realtime_factor"] = round(report["wall_s"] / self.audio_seconds, 4)
+            transcribe_s = self.stage_seconds("transcribe") or self.stage_seconds("stream")
+            if transcribe_s:
+                report["transcribe_realtime_factor"] = round(transcribe_s / self.audio_seconds, 4)
+        if error:
+            report["error"] = error
+        return report
+
+    def save(
+        self,
+        logger: logging.Logger,
+        status: str,
+        output_file: Optional[Path] = None,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Bericht an den Verlauf anhängen (und ggf. neben das Transkript schreiben). Fehler hier brechen nie den Lauf ab."""
+        report = self.to_dict(status, output_file, error)
+        line = json.dumps(report, ensure_ascii=False)
+        try:
+            RUN_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with RUN_HISTORY_FILE.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Laufbericht nicht in {RUN_HISTORY_FILE} geschrieben: {e}")
+        if self.config.report and output_file is not None:
+            report_file = output_file.with_name(f"{self.config.file_path.stem}.report.json")
+            try:
+                report_file.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+                logger.info(f"Laufbericht: {report_file}")
+            except OSError as e:
+                logger.warning(f"Laufbericht nicht geschrieben ({report_file}): {e}")
+        stages = ", ".join(f"{s['name']} {s['wall_s']:.2f}s" for s in self.stages)
+        rtf = f", RTF {report['realtime_factor']:.3f}" if report["realtime_factor"] else ""
+        logger.info(f"Laufbericht ({status}): {report['wall_s']:.2f} s gesamt{rtf}, Spitze {report['peak_rss_mb']:.0f} MB – {stages}")
+        return report
+
+
+# ============================================================================
+# Autotune Profile (batch_size / compute_type / threads pro Maschine)
+# ============================================================================
+
+PROFILE_FILE = Path(__file__).resolve().parent / ".video_whisper_profile.json"
+PROFILE_VERSION = 1
+
+# Grobe Aktivierungskosten pro Batch-Eintrag (MB) für den Speicherwächter, solange kein Profil
+# einen gemessenen Wert liefert
+_BATCH_ITEM_MB = {"tiny": 60, "base": 90, "small": 200, "medium": 450, "large": 800}
+_MEMORY_HEADROOM = 0.8  # höchstens 80 % des freien Speichers einplanen
+
+
+def _mem_total_mb() -> Optional[float]:
+    return _meminfo_mb("MemTotal")
+
+
+def _meminfo_mb(key: str) -> Optional[float]:
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def host_fingerprint() -> Dict[str, Any]:
+    """Merkmale, an denen ein Profil hängt: auf anderer Hardware wird es nicht verwendet."""
+    mem_total = _mem_total_mb()
+    return {
+        "hostname": os.uname().nodename,
+        "cpu_count": os.cpu_count(),
+        "mem_total_gb": round(mem_total / 1024) if mem_total else None,
+    }
+
+
+def _profile_key(model_size: str, device: str) -> str:
+    return f"{model_size}@{device}"
+
+
+def _read_profiles() -> Dict[str, Any]:
+    try:
+        data = json.loads(PROFILE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != PROFILE_VERSION or data.get("host") != host_fingerprint():
+        return {}
+    return data
+
+
+def load_profile(model_size: str, device: str) -> Optional[Dict[str, Any]]:
+    """Gespeichertes Autotune-Ergebnis für Modell + Device auf diesem Rechner (oder None)."""
+    return _read_profiles().get("profiles", {}).get(_profile_key(model_size, device))
+
+
+def save_profile(model_size: str, device: str, profile: Dict[str, Any]) -> None:
+    data = _read_profiles() or {"version": PROFILE_VERSION, "host": host_fingerprint(), "profiles": {}}
+    data["profiles"][_profile_key(model_size, device)] = profile
+    tmp = PROFILE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, PROFILE_FILE)
+
+
+def available_memory_mb(device: str) -> Optional[float]:
+    """Freier Speicher: VRAM bei CUDA, sonst MemAvailable aus /proc/meminfo."""
+    if device == "cuda" and torch is not None:
+        try:
+            free, _total = torch.cuda.mem_get_info()
+            return free / (1024 * 1024)
+        except Exception:
+            return None
+    return _meminfo_mb("MemAvailable")
+
+
+def guard_batch_size(config: TranscriptionConfig, logger: logging.Logger) -> TranscriptionConfig:
+    """
+    Speicherwächter (nach dem Laden des Modells): batch_size so weit halbieren, dass die geschätzten
+    Aktivierungen in den freien Speicher passen – statt mitten in der Transkription abzustürzen.
+    Pro Eintrag zählt der im Autotune gemessene Wert, sonst eine grobe Schätzung pro Modellgröße.
+    """
+    available = available_memory_mb(config.device)
+    if not available:
+        return config
+    profile = (load_profile(config.model_size, config.device) if config.use_profile else None) or {}
+    per_item = profile.get("batch_item_mb") or _BATCH_ITEM_MB.get(config.model_size.split("-")[0], 800)
+    budget = available * _MEMORY_HEADROOM
+    batch_size = config.batch_size
+    while batch_size > 1 and batch_size * per_item > budget:
+        batch_size //= 2
+    if batch_size == config.batch_size:
+        return config
+    logger.warning(
+        f"Speicherwächter: batch_size {config.batch_size} → {batch_size} "
+        f"(frei {available:.0f} MB, ca. {per_item:.0f} MB pro Eintrag)"
+    )
+    return replace(config, batch_size=batch_size)
+
+
+def synthetic_speech_clip(seconds: float) -> "np.ndarray":
+    """Reproduzierbarer, sprachähnlicher Testclip (gleitende Grundfrequenz, Silbenrhythmus, kurze Pausen)."""
+    t = np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    syllables = 0.55 + 0.45 * np.sin(2 * np.pi * 4 * t)
+    phrases = (np.mod(t, 6.0) < 5.2).astype(np.float32)  # alle 6 s eine kurze Pause
+    voice = (0.4 * np.sin(phase) + 0.15 * np.sin(2 * phase)) * syllables * phrases
+    noise = np.random.default_rng(42).normal(0, 0.01, t.shape[0])
+    return (voice + noise).astype(np.float32)
+
+
+def _calibrate(
+    model: Any,
+    audio: "np.ndarray",
+    config: TranscriptionConfig,
+) -> Dict[str, Any]:
+    """Einen Durchlauf messen: Audiosekunden pro Sekunde und Speicherzuwachs (RSS bzw. VRAM)."""
+    if config.device == "cuda":
+        torch.cuda.reset_peak_memory_stats()
+        base = torch.cuda.memory_allocated() / (1024 * 1024)
+    else:
+        _reset_peak_rss()
+        base = _peak_rss_mb()
+    start = time.perf_counter()
+    result = _model_transcribe_once(model, audio, config, config.language)
+    wall = time.perf_counter() - start
+    if config.device == "cuda":
+        peak = torch.cuda.max_memory_allocated() / (1024 * 1024)
+    else:
+        peak = _peak_rss_mb()
+    return {
+        "compute_type": config.compute_type,
+        "threads": config.threads,
+        "batch_size": config.batch_size,
+        "audio_per_wall": round(audio.shape[0] / SAMPLE_RATE / wall, 3) if wall > 0 else 0.0,
+        "memory_delta_mb": round(max(0.0, peak - base), 1),
+        "segments": len(result.get("segments", [])),
+    }
+
+
+def autotune(
+    model_size: str,
+    logger: logging.Logger,
+    clip: Optional[Path] = None,
+    quick: bool = False,
+    echo: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """
+    Kalibrierung: zuerst compute_type × Threads (batch_size fest), dann batch_size für den Sieger.
+    Der Clip ist so lang, dass auch die größte batch_size volle Batches bekommt (30-s-Chunks).
+    Kandidaten richten sich nach Device, Kernen, freiem Speicher und CPU-Flags.
+    """
+    _import_ml()
+    base = resolve_device(TranscriptionConfig(
+        file_path=clip or Path("<synthetisch>"), output_path=Path("."), model_size=model_size,
+        language="en" if clip is None else None, use_profile=False,
+    ))
+    device = base.device
+    if device == "cuda":
+        compute_types = ["float16", "int8_float16"]
+        thread_options = [0]
+        batch_options = [8, 16, 32] if quick else [8, 16, 32, 64]
+    else:
+        flags = cpu_flags()
+        # Ohne AVX2/VNNI ist int8 nicht automatisch schneller – float32 dann zuerst messen
+        fast_int8 = bool(flags & {"avx2", "avx512_vnni", "avx_vnni"}) or not flags
+        compute_types = ["int8", "float32"] if fast_int8 else ["float32", "int8"]
+        if quick:
+            compute_types = compute_types[:1]
+        cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+        physical = cores // 2 if "ht" in flags and cores > 1 else cores
+        thread_options = sorted({physical, cores}) if not quick else [physical]
+        batch_options = [2, 4, 8] if quick else [2, 4, 8, 16]
+
+    # Speicherwächter schon bei der Auswahl: unrealistische batch_size gar nicht erst probieren
+    per_item = _BATCH_ITEM_MB.get(model_size.split("-")[0], 800)
+    available = available_memory_mb(device)
+    if available:
+        batch_options = [b for b in batch_options if b * per_item <= available * _MEMORY_HEADROOM] or [1]
+
+    if clip is not None:
+        audio = load_audio_pcm(clip, logger)
+    else:
+        audio = synthetic_speech_clip(30.0 * max(batch_options))
+    audio_seconds = audio.shape[0] / SAMPLE_RATE
+    echo(f"Autotune: {model_size} auf {device}, Clip {audio_seconds:.0f} s, "
+         f"compute {compute_types}, Threads {thread_options}, batch_size {batch_options}")
+
+    results: List[Dict[str, Any]] = []
+    best: Optional[Dict[str, Any]] = None
+    best_model: Any = None
+    probe_batch = batch_options[len(batch_options) // 2]
+    for compute_type in compute_types:
+        for threads in thread_options:
+            config = replace(base, compute_type=compute_type, threads=threads, batch_size=probe_batch)
+            load_start = time.perf_counter()
+            try:
+                model = load_model(config, logger)
+            except Exception as e:
+                echo(f"  {compute_type:<13} threads={threads or '-':<3} nicht verfügbar: {e}")
+                continue
+            load_seconds = time.perf_counter() - load_start
+            _model_transcribe_once(model, audio[: 10 * SAMPLE_RATE], config, config.language)  # Aufwärmen
+            run = _calibrate(model, audio, config)
+            run["load_s"] = round(load_seconds, 2)
+            results.append(run)
+            echo(f"  {compute_type:<13} threads={threads or '-':<3} batch={probe_batch:<3} "
+                 f"{run['audio_per_wall']:.2f} s Audio/s  (Laden {load_seconds:.1f} s)")
+            if best is None or run["audio_per_wall"] > best["audio_per_wall"]:
+                best, best_model = run, model
+            else:
+                del model
+            _release_memory()
+    if best is None:
+        raise RuntimeError("Kein Kandidat ließ sich laden")
+
+    config = replace(base, compute_type=best["compute_type"], threads=best["threads"])
+    batch_runs = [best]
+    for batch_size in batch_options:
+        if batch_size == probe_batch:
+            continue
+        try:
+            run = _calibrate(best_model, audio, replace(config, batch_size=batch_size))
+        except (MemoryError, RuntimeError) as e:
+            if not _is_out_of_memory(e):
+                raise
+            echo(f"  batch={batch_size:<3} Speichermangel – größere Werte übersprungen")
+            _release_memory()
+            break
+        results.append(run)
+        batch_runs.append(run)
+        echo(f"  {config.compute_type:<13} threads={config.threads or '-':<3} batch={batch_size:<3} "
+             f"{run['audio_per_wall']:.2f} s Audio/s")
+    # Innerhalb von 3 % des Besten die kleinste batch_size nehmen (weniger Speicher, gleiche Geschwindigkeit)
+    top = max(r["audio_per_wall"] for r in batch_runs)
+    chosen = min((r for r in batch_runs if r["audio_per_wall"] >= top * 0.97), key=lambda r: r["batch_size"])
+
+    # Speicher pro Batch-Eintrag aus der Steigung zwischen kleinster und größter gemessener batch_size
+    batch_item_mb = None
+    by_batch = sorted(batch_runs, key=lambda r: r["batch_size"])
+    if len(by_batch) >= 2 and by_batch[-1]["batch_size"] > by_batch[0]["batch_size"]:
+        slope = (by_batch[-1]["memory_delta_mb"] - by_batch[0]["memory_delta_mb"]) / (
+            by_batch[-1]["batch_size"] - by_batch[0]["batch_size"])
+        if slope > 0:
+            batch_item_mb = round(slope, 1)
+    if not any(r["segments"] for r in results):
+        echo("  Hinweis: Im Clip wurde keine Sprache erkannt – für belastbare Werte --clip <Aufnahme> verwenden.")
+
+    profile = {
+        "compute_type": chosen["compute_type"],
+        "batch_size": chosen["batch_size"],
+        "threads": chosen["threads"],
+        "batch_item_mb": batch_item_mb,
+        "audio_per_wall": chosen["audio_per_wall"],
+        "clip": str(clip) if clip else f"synthetisch ({audio_seconds:.0f} s)",
+        "cpu_flags": sorted(cpu_flags() & {"avx2", "avx512f", "avx512_vnni", "avx_vnni", "f16c", "fma"}),
+        "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "runs": results,
+    }
+    save_profile(model_size, device, profile)
+    return profile
+
+
+# ============================================================================
+# Main Transcription Pipeline
+# ============================================================================
+
+def _format_eta(seconds: float) -> str:
+    seconds = int(max(0.0, seconds))
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60}:{rest % 60:02d}"
+
+
+class ProgressReporter:
+    """
+    Fortschritt aus echter Arbeit: verarbeitete Audiosekunden / Gesamtdauer, dazu Geschwindigkeit
+    (× Echtzeit), Echtzeitfaktor (Rechenzeit / Audiozeit) und ETA.
+    Ausgabe: Fortschrittsdatei für start.sh (" 42% · 3.1× · ETA 2:10"), optional JSON Lines
+    (ein Objekt pro Ereignis) und ohne Fortschrittsdatei ein tqdm-Balken auf der Konsole.
+    """
+
+    def __init__(
+        self,
+        progress_file: Optional[str],
+        json_file: Optional[Path] = None,
+        console: bool = False,
+        min_interval: float = 0.5,
+    ):
+        self.progress_file = progress_file
+        self.json_file = json_file
+        self.console = console
+        self.min_interval = min_interval
+        self.total: Optional[float] = None
+        self.done = 0.0
+        self.base = 0.0
+        self.started = 0.0
+        self._last_emit = 0.0
+        self._last_pct = -1
+        self._bar = None
+
+    def _json(self, event: Dict[str, Any]) -> None:
+        if not self.json_file:
+            return
+        try:
+            with open(self.json_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"time": round(time.time(), 3), **event}) + "\n")
+        except OSError:
+            pass
+
+    def stage(self, name: str, text: Optional[str] = None) -> None:
+        """Neue Phase (z. B. "load_model", "transcribe") – Text für die Fortschrittsdatei optional."""
+        if text:
+            _write_progress(self.progress_file, text, stage=name)
+        self._json({"event": "stage", "stage": name})
+
+    def start(self, total_seconds: Optional[float], done: float = 0.0) -> None:
+        """done > 0: fortgesetzter Lauf – Geschwindigkeit und ETA zählen nur die Audiozeit ab hier."""
+        self.total = total_seconds if total_seconds and total_seconds > 0 else None
+        self.done = self.base = done
+        self.started = time.perf_counter()
+        if self.console and self.total:
+            from tqdm import tqdm
+
+            self._bar = tqdm(total=round(self.total, 1), initial=round(done, 1), desc="  Audio", unit="s", ncols=80,
+                             leave=True, file=sys.stdout)
+        self._emit(force=True)
+
+    def update(self, audio_done: float) -> None:
+        """Verarbeitete Audiosekunden (absolut, monoton steigend)."""
+        if audio_done <= self.done:
+            return
+        if self.total:
+            audio_done = min(audio_done, self.total)
+        if self._bar is not None:
+            self._bar.update(round(audio_done - self.done, 1))
+        self.done = audio_done
+        self._emit()
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        info: Dict[str, Any] = {
+            "audio_done": round(self.done, 2),
+            "audio_total": round(self.total, 2) if self.total else None,
+            "elapsed": round(elapsed, 2),
+            "percent": None, "speed": None, "rtf": None, "eta": None,
+        }
+        if self.total:
+            info["percent"] = round(100.0 * self.done / self.total, 1)
+        if self.done > self.base and elapsed > 0:
+            info["speed"] = round((self.done - self.base) / elapsed, 3)
+            info["rtf"] = round(elapsed / (self.done - self.base), 3)
+            if self.total:
+                info["eta"] = round((self.total - self.done) / info["speed"], 1)
+        return info
+
+    def _emit(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        info = self.snapshot()
+        pct = int(info["percent"]) if info["percent"] is not None else -1
+        if not force and pct == self._last_pct and now - self._last_emit < self.min_interval:
+            return
+        self._last_emit = now
+        self._last_pct = pct
+        if info["percent"] is not None:
+            text = f" {pct}%"
+        else:
+            text = f" {self.done / 60:.1f} min"
+        if info["speed"]:
+            text += f" · {info['speed']:.1f}×"
+        if info["eta"] is not None and self.done > 0:
+            text += f" · ETA {_format_eta(info['eta'])}"
+        _write_progress(self.progress_file, text, stage="transcribe", **info)
+        self._json({"event": "progress", "stage": "transcribe", **info})
+
+    def finish(self) -> None:
+        if self.total:
+            self.update(self.total)
+        if self._bar is not None:
+            self._bar.close()
+            self._bar = None
+        self._json({"event": "done", **self.snapshot()})
+
+
+class _ProgressLineParser:
+    """
+    stdout-Ersatz während model.transcribe(print_progress=True): WhisperX meldet nach jedem
+    VAD-Chunk "Progress: 12.34%..." – daraus wird der Anteil (0–1) für den ProgressReporter.
+    Andere Ausgaben werden unverändert durchgereicht.
+    """
+
+    _PREFIX = "Progress:"
+
+    def __init__(self, on_fraction: Callable[[float], None], passthrough: TextIO):
+        self.on_fraction = on_fraction
+        self.passthrough = passthrough
+        self._buf = ""
+
+    def write(self, text: str) -> int:
+        self._buf += text
+        while "\n" in self._buf:
+            line, self._buf = self._buf.split("\n", 1)
+            stripped = line.strip()
+            if stripped.startswith(self._PREFIX):
+                try:
+                    pct = float(stripped[len(self._PREFIX):].strip().rstrip(".").rstrip("%"))
+                    self.on_fraction(min(1.0, pct / 100.0))
+                except ValueError:
+                    self.passthrough.write(line + "\n")
+            else:
+                self.passthrough.write(line + "\n")
+        return len(text)
+
+    def flush(self) -> None:
+        self.passthrough.flush()
+
+
+def probe_duration(source: Path) -> Optional[float]:
+    """Dauer in Sekunden per ffprobe (None, wenn nicht ermittelbar)."""
+    wav = open_native_wav(source)
+    if wav is not None:
+        with wav:
+            return wav.getnframes() / SAMPLE_RATE
+    try:
+        out = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", str(source)],
+            capture_output=True, text=True, timeout=30,
+        ).stdout.strip()
+        return float(out) if out else None
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def _silence_console_logging() -> None:
+    """Bibliotheken (z. B. Lightning) dürfen nicht auf die Konsole loggen – nur in Datei."""
+    root = logging.getLogger()
+    for h in root.handlers[:]:
+        if isinstance(h, logging.StreamHandler) and getattr(h, "stream", None) in (sys.stdout, sys.stderr):
+            root.removeHandler(h)
+
+
+def _transcribe_file_streaming(
+    config: TranscriptionConfig,
+    model: Any,
+    logger: logging.Logger,
+    progress_file: Optional[str] = None,
+    report: Optional[RunReport] = None,
+    content_hash: str = "",
+) -> Tuple[Path, Dict[str, Any]]:
+    """
+    Streaming-Pipeline: Fenster decodieren → transkribieren → Segmente sofort an alle Ausgabedateien anhängen.
+    Mit config.checkpoint wird der Stand nach jedem Fenster gesichert (StreamCheckpoint); ein abgebrochener
+    Lauf schreibt beim nächsten Aufruf die gesicherten Segmente neu und transkribiert nur den Rest.
+    """
+    logger.info(
+        f"Streaming-Modus: Fenster {config.stream_window:.0f} s, Überlappung {config.stream_overlap:.0f} s → "
+        f"{config.output_path} ({', '.join(config.formats)})"
+    )
+    if not progress_file and sys.stdout.isatty():
+        print(f"  {C_CYN}⟳{C_OFF} Transkribiere (Streaming) …", flush=True)
+    checkpoint: Optional[StreamCheckpoint] = None
+    if config.checkpoint:
+        config.output_path.mkdir(parents=True, exist_ok=True)
+        checkpoint = StreamCheckpoint(config, content_hash or file_content_hash(config.file_path))
+    reporter = ProgressReporter(progress_file, config.progress_json, console=not progress_file and sys.stdout.isatty())
+    state = checkpoint.load() if checkpoint is not None else None
+    if state and not progress_file and sys.stdout.isatty():
+        print(f"  {C_CYN}↻{C_OFF} Setze fort ab {_format_eta(state['position'])} (Checkpoint)", flush=True)
+    reporter.stage("transcribe", "Transkribiere…")
+    reporter.start(probe_duration(config.file_path), done=state["position"] if state else 0.0)
+
+    with TranscriptWriters(config, logger) as writers:
+        align_records: List[Dict[str, Any]] = []
+
+        def _align(segments: List[Dict[str, Any]], samples: "np.ndarray", language: str) -> List[Dict[str, Any]]:
+            # Teilphase innerhalb von "stream": Spitzen-RSS der Gesamtphase nicht zurücksetzen
+            with _measure("align", align_records, reset_peak=False):
+                aligned = align_segments(segments, samples, language, config.device, logger)
+            return aligned["segments"] if aligned else segments
+
+        result = transcribe_streaming(
+            model, config, logger, writers.write, reporter.update, reporter.update,
+            aligner=_align if config.align else None, checkpoint=checkpoint,
+        )
+        writers.language = result.get("language")
+    if checkpoint is not None:
+        checkpoint.remove()
+    if report is not None:
+        report.audio_seconds = reporter.done or None
+        if align_records:
+            report.stages.append(_merge_stage_records("align", align_records))
+    reporter.finish()
+    logger.info(f"Streaming: {writers.count} Segmente geschrieben")
+    return writers.primary, result
+
+
+def _transcribe_file(
+    config: TranscriptionConfig,
+    model_loader: Callable[[], Any],
+    logger: logging.Logger,
+    progress_file: Optional[str] = None,
+) -> Path:
+    """
+    Pipeline für eine Datei (Cache → Decodieren → Transkription → Speichern).
+    model_loader wird erst bei einem Cache-Fehlschlag aufgerufen – Treffer laden kein Modell.
+    Jeder Lauf (auch ein fehlgeschlagener) erzeugt einen Laufbericht (siehe RunReport).
+    """
+    report = RunReport(config)
+    try:
+        output_file = _run_file_stages(config, model_loader, logger, progress_file, report)
+    except Exception as e:
+        report.save(logger, "error", error=str(e))
+        raise
+    report.save(logger, "ok", output_file=output_file)
+    return output_file
+
+
+def _run_file_stages(
+    config: TranscriptionConfig,
+    model_loader: Callable[[], Any],
+    logger: logging.Logger,
+    progress_file: Optional[str],
+    report: RunReport,
+) -> Path:
+    config.validate()
+    logger.info("Configuration validated")
+    logger.info(f"Input: {config.file_path} ({config.file_path.stat().st_size / 1024 / 1024:.2f} MB)")
+    logger.info(f"Output dir: {config.output_path}")
+
+    cache: Optional[TranscriptCache] = None
+    cache_key = ""
+    content_hash = ""
+    if config.use_cache:
+        with report.stage("cache_lookup"):
+            cache = TranscriptCache()
+            content_hash = file_content_hash(config.file_path)
+            cache_key = cache.key_for(config, content_hash)
+            cached = cache.load(cache_key)
+        if cached is not None:
+            logger.info(f"Cache-Treffer ({cache_key[:12]}…): Modell und Transkription werden übersprungen")
+            report.cache_hit = True
+            if not progress_file:
+                print(f"  {C_GRN}✓{C_OFF} Aus Cache (gleicher Inhalt, gleiche Einstellungen)", flush=True)
+            with report.stage("write"):
+                output_file = write_transcription(cached, config, logger)
+            if config.store:
+                with report.stage("store"):
+                    store_transcript(cached, config, output_file, content_hash, logger)
+            return output_file
+
+    # Sprache "auto": bekannte Sprache (gleicher Inhalt oder gleiche Quelle) vor Modell und Decodieren einsetzen
+    language_cache: Optional[LanguageCache] = None
+    detect_language = config.language is None and config.language_probe
+    if detect_language and config.use_cache:
+        language_cache = LanguageCache()
+        known = language_cache.lookup(content_hash, config.language_source)
+        if known is not None:
+            via = "gleicher Inhalt" if known["via"] == "file" else f"Quelle {config.language_source}"
+            logger.info(f"Sprache aus Cache ({via}): {known['language']}")
+            report.config = config = replace(config, language=known["language"])
+
+    # Prozessweite Kosten nur beim ersten Bedarf: Importe (torch/whisperx) und Device-Erkennung
+    if not ml_imported():
+        with report.stage("imports"):
+            _import_ml()
+    if _DETECTED_DEVICE is None and "auto" in (config.device, config.compute_type):
+        with report.stage("detect_device"):
+            config = resolve_device(config)
+    report.config = config = resolve_device(config)
+
+    with report.stage("load_model"):
+        model = model_loader()
+    report.config = config = guard_batch_size(config, logger)
+
+    if detect_language and config.language is None:
+        with report.stage("detect_language"):
+            language, probability = detect_language_probe(model, config.file_path, logger)
+        if language and probability >= config.language_threshold:
+            report.config = config = replace(config, language=language)
+            if language_cache is not None:
+                language_cache.store(content_hash, config.language_source, language, probability, "probe")
+        elif language:
+            logger.info(f"Kurzprobe unter Schwelle ({probability:.0%} < {config.language_threshold:.0%}): "
+                        f"volle Erkennung in model.transcribe")
+    if config.align and config.language:
+        _preload_align_model(config.language, config.device, logger)
+
+    def _remember_language(result: Dict[str, Any]) -> None:
+        # Volle Erkennung: Ergebnis für diesen Inhalt behalten (ohne Wahrscheinlichkeit nicht für die Quelle)
+        if language_cache is not None and config.language is None and result.get("language"):
+            language_cache.store(content_hash, None, result["language"], None, "transcribe")
+
+    def _store(result: Dict[str, Any]) -> None:
+        if cache is not None:
+            meta = {"source": str(config.file_path), "audio_hash": content_hash, **cache.settings_for(config)}
+            with report.stage("cache_store"):
+                cache.store(cache_key, result, meta)
+            logger.info(f"Ergebnis im Cache abgelegt ({cache_key[:12]}…)")
+
+    if config.stream:
+        # Decodieren, Transkribieren und Schreiben laufen verschränkt – eine gemeinsame Phase
+        with report.stage("stream"):
+            output_file, result = _transcribe_file_streaming(config, model, logger, progress_file, report, content_hash)
+        report.silence_skipped = result.get("silence_skipped")
+        _remember_language(result)
+        _store(result)
+        if config.store:
+            with report.stage("store"):
+                store_transcript(result, config, output_file, content_hash, logger)
+        return output_file
+
+    # FFmpeg-Extraktion und load_audio sind eine Phase: FFmpeg decodiert per Pipe direkt in den Speicher
+    logger.info("Decodiere Audio per FFmpeg (16 kHz mono, direkt in den Speicher) …")
+    with report.stage("decode"):
+        audio = load_audio_pcm(config.file_path, logger)
+
+    if not progress_file and sys.stdout.isatty():
+        print(f"  {C_CYN}⟳{C_OFF} Transkribiere …", flush=True)
+    logger.info("Starte Transkription (model.transcribe)...")
+
+    duration = audio.shape[0] / SAMPLE_RATE
+    report.audio_seconds = duration
+    reporter = ProgressReporter(progress_file, config.progress_json, console=not progress_file and sys.stdout.isatty())
+    reporter.stage("transcribe", "Transkribiere…")
+    reporter.start(duration)
+    with report.stage("transcribe"):
+        result = transcribe_audio(
+            model, config, logger, audio=audio,
+            on_fraction=lambda frac: reporter.update(frac * duration),
+        )
+    reporter.finish()
+    if "batch_size" in result:
+        # Nach Speichermangel gesenkt – der Laufbericht nennt den tatsächlich verwendeten Wert
+        report.config = config = replace(config, batch_size=result.pop("batch_size"))
+    report.silence_skipped = result.get("silence_skipped")
+    progress = reporter.snapshot()
+    if progress["speed"]:
+        logger.info(f"Transkription: {duration:.1f} s Audio in {progress['elapsed']:.1f} s ({progress['speed']:.2f}× Echtzeit)")
+    if config.align:
+        language = result.get("language") or config.language
+        if language:
+            with report.stage("align"):
+                aligned = align_segments(result.get("segments", []), audio, language, config.device, logger)
+            if aligned:
+                result = {"segments": aligned["segments"], "language": language}
+        else:
+            logger.warning("Alignment übersprungen: Sprache unbekannt")
+    if config.diarize:
+        with report.stage("diarize"):
+            result = diarize_result(result, audio, config, content_hash, logger)
+    del audio
+    # Ab hier (Cache, Schreiben, Speicher) spaltenweise statt als Liste von Dicts
+    result = {**result, "segments": SegmentTable.from_segments(result.get("segments") or [])}
+    _remember_language(result)
+    _store(result)
+
+    # Formatieren und Schreiben in einem Durchgang, direkt in alle Ausgabedateien (kein Gesamt-String)
+    with report.stage("write"):
+        output_file = write_transcription(result, config, logger)
+    logger.info(f"Geschrieben: {len(result.get('segments', []))} Segmente ({', '.join(config.formats)})")
+    if config.store:
+        with report.stage("store"):
+            store_transcript(result, config, output_file, content_hash, logger)
+    return output_file
+
+
+def run_transcription(
+    config: TranscriptionConfig,
+    logger: logging.Logger,
+    progress_file: Optional[str] = None,
+) -> None:
+    """Main transcription pipeline. Wenn progress_file gesetzt: nur dort Fortschritt, keine Konsole."""
+    try:
+        _silence_console_logging()
+        logger.info("=== Pipeline start ===")
+        logger.info(f"Model: {config.model_size}, Device: {config.device}, Compute: {config.compute_type}")
+        config.validate()
+
+        def _load() -> Any:
+            _write_progress(progress_file, "Lade Modell…", stage="load_model")
+            if not progress_file and sys.stdout.isatty():
+                print(f"  {C_CYN}⟳{C_OFF} Lade Modell …", flush=True)
+            logger.info("Lade WhisperX-Modell (whisperx.load_model)...")
+            return load_model(config, logger)
+
+        output_file = _transcribe_file(config, _load, logger, progress_file)
+        logger.info("=== Pipeline Ende (Erfolg) ===")
+
+        _write_progress(progress_file, "100%", stage="done")
+        if not progress_file:
+            print(f"\n{C_CYN}{'═'*60}{C_OFF}")
+            print(f"{C_GRN}✓ Transkription fertig.{C_OFF} Gespeichert in:")
+            print(f"  {C_BLD}{output_file}{C_OFF}")
+            print(f"{C_CYN}{'═'*60}{C_OFF}\n")
+
+    except Exception as e:
+        logger.error(f"Transcription pipeline failed: {e}")
+        logger.info("=== Pipeline Ende (Fehler) ===")
+        logger.debug(traceback.format_exc())
+        if not progress_file:
+            print(f"\n{C_RED}✗ Fehler: {e}{C_OFF}")
+            print(f"{C_DIM}Details siehe Log-Datei.{C_OFF}\n")
+        sys.exit(1)
+
+
+# ============================================================================
+# Batch Mode
+# ============================================================================
+
+def collect_batch_inputs(sources: List[Path]) -> List[Path]:
+    """
+    Eingaben für den Batch-Modus auflösen (Reihenfolge bleibt erhalten, Duplikate entfallen):
+    Mediendatei → direkt; Ordner → alle Mediendateien darin (nicht rekursiv, sortiert);
+    sonstige Datei → Manifest mit einem Pfad pro Zeile (# = Kommentar, relativ zum Manifest).
+    """
+    files: List[Path] = []
+    seen = set()
+
+    def _add(path: Path) -> None:
+        path = path.resolve()
+        if path not in seen:
+            seen.add(path)
+            files.append(path)
+
+    for source in sources:
+        if source.is_dir():
+            for entry in sorted(source.iterdir()):
+                if entry.is_file() and entry.suffix.lower().lstrip(".") in MEDIA_EXTENSIONS:
+                    _add(entry)
+        elif source.suffix.lower().lstrip(".") in MEDIA_EXTENSIONS or not source.exists():
+            # Nicht vorhandene Pfade durchreichen: validate() meldet sie pro Datei
+            _add(source)
+        else:
+            for line in source.read_text(encoding="utf-8").splitlines():
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                entry = Path(line).expanduser()
+                _add(entry if entry.is_absolute() else source.parent / entry)
+    return files
+
+
+@dataclass
+class BatchItemResult:
+    """Ergebnis eines Batch-Eintrags (für die Zusammenfassung)"""
+    file_path: Path
+    seconds: float
+    output_file: Optional[Path] = None
+    error: Optional[str] = None
+    worker: int = 0  # PID des Worker-Prozesses (Pool-Modus)
+
+
+def _format_batch_summary(results: List[BatchItemResult], load_seconds: float, total_seconds: float) -> List[str]:
+    """Zusammenfassung der Zeiten pro Datei ins Log und (ohne Fortschrittsdatei) auf die Konsole."""
+    ok = sum(1 for r in results if r.error is None)
+    lines = [f"Batch: {ok}/{len(results)} erfolgreich, Modell geladen in {load_seconds:.1f} s, gesamt {total_seconds:.1f} s"]
+    width = max([len(r.file_path.name) for r in results] + [5])
+    for r in results:
+        status = "OK" if r.error is None else f"FEHLER: {r.error}"
+        lines.append(f"  {r.file_path.name:<{width}}  {r.seconds:8.1f} s  {status}")
+    return lines
+
+
+def run_batch(
+    configs: List[TranscriptionConfig],
+    logger: logging.Logger,
+    progress_file: Optional[str] = None,
+) -> int:
+    """Mehrere Dateien mit einem einzigen geladenen Modell transkribieren. Gibt die Anzahl Fehler zurück."""
+    _silence_console_logging()
+    batch_start = time.perf_counter()
+    logger.info(f"=== Batch start: {len(configs)} Dateien ===")
+    first = configs[0]
+    logger.info(f"Model: {first.model_size}, Device: {first.device}, Compute: {first.compute_type}")
+
+    load_seconds = 0.0
+
+    def _load() -> Any:
+        # Erst beim ersten Cache-Fehlschlag laden, danach aus dem Modell-Cache
+        nonlocal load_seconds
+        if model_cache_key(first) not in _MODEL_CACHE:
+            _write_progress(progress_file, "Lade Modell…", stage="load_model")
+            if not progress_file and sys.stdout.isatty():
+                print(f"  {C_CYN}⟳{C_OFF} Lade Modell …", flush=True)
+        load_start = time.perf_counter()
+        model = get_model(first, logger)
+        load_seconds += time.perf_counter() - load_start
+        return model
+
+    results: List[BatchItemResult] = []
+    for idx, config in enumerate(configs, start=1):
+        logger.info(f"--- Batch {idx}/{len(configs)}: {config.file_path} ---")
+        _write_progress(progress_file, f"Datei {idx}/{len(configs)}: {config.file_path.name}")
+        if not progress_file:
+            print(f"\n{C_BLD}[{idx}/{len(configs)}]{C_OFF} {config.file_path.name}", flush=True)
+        item_start = time.perf_counter()
+        try:
+            output_file = _transcribe_file(config, _load, logger, progress_file)
+            results.append(BatchItemResult(config.file_path, time.perf_counter() - item_start, output_file=output_file))
+            if not progress_file:
+                print(f"  {C_GRN}✓{C_OFF} {output_file}", flush=True)
+        except Exception as e:
+            logger.error(f"Batch-Eintrag fehlgeschlagen ({config.file_path.name}): {e}")
+            logger.debug(traceback.format_exc())
+            results.append(BatchItemResult(config.file_path, time.perf_counter() - item_start, error=str(e)))
+            if not progress_file:
+                print(f"  {C_RED}✗ Fehler: {e}{C_OFF}", flush=True)
+
+    summary = _format_batch_summary(results, load_seconds, time.perf_counter() - batch_start)
+    for line in summary:
+        logger.info(line)
+    if not progress_file:
+        print(f"\n{C_CYN}{'═'*60}{C_OFF}")
+        for line in summary:
+            print(line)
+        print(f"{C_CYN}{'═'*60}{C_OFF}\n")
+    failed = sum(1 for r in results if r.error is not None)
+    logger.info(f"=== Batch Ende ({failed} Fehler) ===")
+    _write_progress(progress_file, "100%", stage="done")
+    return failed
+
+
+# Zustand eines Pool-Worker-Prozesses (pro Prozess ein eigenes Modell über _MODEL_CACHE)
+_WORKER_LOGGER: Optional[logging.Logger] = None
+
+
+def _pool_worker_init(threads: int) -> None:
+    global _WORKER_LOGGER
+    _WORKER_LOGGER = setup_logging()
+    _silence_console_logging()
+    _import_ml()
+    torch.set_num_threads(max(1, threads))
+    _redirect_console_to_log()  # tqdm/Bibliotheken der Worker nicht auf die Konsole
+
+
+def _pool_transcribe(config: TranscriptionConfig) -> BatchItemResult:
+    logger = _WORKER_LOGGER or logging.getLogger(__name__)
+    start = time.perf_counter()
+    try:
+        output_file = _transcribe_file(config, lambda: get_model(config, logger), logger, None)
+        return BatchItemResult(config.file_path, time.perf_counter() - start, output_file=output_file, worker=os.getpid())
+    except Exception as e:
+        logger.error(f"Batch-Eintrag fehlgeschlagen ({config.file_path.name}): {e}")
+        logger.debug(traceback.format_exc())
+        return BatchItemResult(config.file_path, time.perf_counter() - start, error=str(e), worker=os.getpid())
+
+
+def _format_worker_throughput(results: List[BatchItemResult], workers: int, threads: int, total_seconds: float) -> List[str]:
+    """Durchsatz pro Worker (Dateien/h bezogen auf die Arbeitszeit des Workers) und gesamt."""
+    ok = sum(1 for r in results if r.error is None)
+    lines = [
+        f"Pool: {ok}/{len(results)} erfolgreich, {workers} Worker × {threads} Threads, gesamt {total_seconds:.1f} s "
+        f"– {len(results) / total_seconds * 3600:.1f} Dateien/h"
+    ]
+    by_worker: Dict[int, List[BatchItemResult]] = {}
+    for r in results:
+        by_worker.setdefault(r.worker, []).append(r)
+    for n, (pid, items) in enumerate(sorted(by_worker.items()), start=1):
+        busy = sum(r.seconds for r in items)
+        rate = len(items) / busy * 3600 if busy > 0 else 0.0
+        lines.append(f"  Worker {n} (PID {pid}): {len(items)} Dateien, {busy:.1f} s aktiv, {rate:.1f} Dateien/h")
+    return lines
+
+
+def run_batch_parallel(
+    configs: List[TranscriptionConfig],
+    logger: logging.Logger,
+    workers: int,
+    progress_file: Optional[str] = None,
+) -> int:
+    """
+    Batch über einen Prozess-Pool: jeder Worker lädt sein eigenes Modell einmal und nutzt
+    config.threads Threads (Kern-Budget / Worker). Ergebnisse in Eingabereihenfolge. Gibt die Anzahl Fehler zurück.
+    """
+    _silence_console_logging()
+    threads = configs[0].threads or 1
+    batch_start = time.perf_counter()
+    logger.info(f"=== Batch start (Pool): {len(configs)} Dateien, {workers} Worker × {threads} Threads ===")
+
+    # Vor dem Start der Worker setzen: OpenMP/MKL lesen die Variablen beim Import von torch
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+    _write_progress(progress_file, f"Starte {workers} Worker…")
+    results: List[BatchItemResult] = []
+    ctx = multiprocessing.get_context("spawn")  # kein fork nach torch-Import
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx, initializer=_pool_worker_init, initargs=(threads,)
+    ) as pool:
+        try:
+            for idx, result in enumerate(pool.map(_pool_transcribe, configs), start=1):
+                results.append(result)
+                _write_progress(progress_file, f"Datei {idx}/{len(configs)} fertig")
+                if not progress_file:
+                    status = f"{C_GRN}✓{C_OFF} {result.output_file}" if result.error is None else f"{C_RED}✗ {result.error}{C_OFF}"
+                    print(f"{C_BLD}[{idx}/{len(configs)}]{C_OFF} {result.file_path.name}  {result.seconds:.1f} s  {status}", flush=True)
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    total_seconds = time.perf_counter() - batch_start
+    summary = _format_batch_summary(results, 0.0, total_seconds)[1:]
+    summary = _format_worker_throughput(results, workers, threads, total_seconds) + summary
+    for line in summary:
+        logger.info(line)
+    if not progress_file:
+        print(f"\n{C_CYN}{'═'*60}{C_OFF}")
+        for line in summary:
+            print(line)
+        print(f"{C_CYN}{'═'*60}{C_OFF}\n")
+    failed = sum(1 for r in results if r.error is not None)
+    logger.info(f"=== Batch Ende ({failed} Fehler) ===")
+    _write_progress(progress_file, "100%", stage="done")
+    return failed
+
+
+# ============================================================================
+# CLI Entry Point
+# ============================================================================
+
+def _add_pipeline_options(parser: argparse.ArgumentParser) -> None:
+    """Optionen, die Einzel-, Batch- und Daemon-Modus gemeinsam haben."""
+    parser.add_argument("--stream", action="store_true",
+                        help="Streaming-Modus: Audio fensterweise decodieren/transkribieren (konstanter Speicher)")
+    parser.add_argument("--window", type=float, default=300.0, help="Streaming: Fensterlänge in s (Standard: 300)")
+    parser.add_argument("--overlap", type=float, default=10.0, help="Streaming: Überlappung in s (Standard: 10)")
+    parser.add_argument("--no-checkpoint", action="store_true",
+                        help="Streaming: keinen Checkpoint (<Name>.checkpoint.jsonl) schreiben oder fortsetzen")
+    parser.add_argument("--no-cache", action="store_true", help="Transkriptions-Cache (cache/) weder lesen noch schreiben")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="CPU-Threads für das Modell (Standard: Autotune-Profil, sonst WhisperX-Vorgabe)")
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help=f"batch_size für model.transcribe (Standard: Autotune-Profil, sonst {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--no-profile", action="store_true", help="Autotune-Profil ignorieren")
+    parser.add_argument("--progress-json", default=None,
+                        help="Fortschritt zusätzlich als JSON Lines in diese Datei schreiben (Prozent, Echtzeitfaktor, ETA)")
+    parser.add_argument("--skip-silence", action="store_true",
+                        help="Lange Stille (ab 1 s) vor der Transkription aussparen; Zeitstempel bleiben auf der Originalzeitachse")
+    parser.add_argument("--align", action="store_true",
+                        help="Wort-Zeitstempel per Alignment (zusätzliches Modell pro Sprache, kostet Zeit)")
+    parser.add_argument("--no-language-probe", action="store_true",
+                        help="Sprache \"auto\": keine Kurzprobe, Erkennung nur in model.transcribe (wie früher)")
+    parser.add_argument("--language-threshold", type=float, default=TranscriptionConfig.language_threshold,
+                        help=f"Mindest-Wahrscheinlichkeit der Kurzprobe (Standard: {TranscriptionConfig.language_threshold:g})")
+    parser.add_argument("--language-source", default=None,
+                        help="Quelle (z. B. Kanal) für den Sprach-Cache: neue Dateien derselben Quelle übernehmen deren Sprache")
+    parser.add_argument("--no-store", action="store_true",
+                        help="Nicht in den durchsuchbaren Transkript-Speicher (transcripts.db) eintragen")
+    parser.add_argument("--diarize", action="store_true",
+                        help="Sprecher zuordnen (pyannote; Modell: $VIDEO_WHISPER_DIARIZE_MODEL, lokaler Pfad = offline)")
+    parser.add_argument("--min-speakers", type=int, default=0, help="Diarisierung: mindestens so viele Sprecher")
+    parser.add_argument("--max-speakers", type=int, default=0, help="Diarisierung: höchstens so viele Sprecher")
+    parser.add_argument("--formats", default="txt",
+                        help="Ausgabeformate, kommagetrennt: txt, srt, vtt, json, tsv (Standard: txt)")
+    parser.add_argument("--report", action="store_true",
+                        help="Laufbericht (Zeit/CPU/Speicher pro Phase) als <Name>.report.json neben das Transkript schreiben")
+
+
+def _pipeline_config_kwargs(args: argparse.Namespace, base: Optional[Path] = None) -> Dict[str, Any]:
+    base = base or Path.cwd()
+    return {
+        "stream": args.stream,
+        "stream_window": args.window,
+        "stream_overlap": args.overlap,
+        "checkpoint": not args.no_checkpoint,
+        "use_cache": not args.no_cache,
+        "threads": args.threads,
+        "batch_size": max(0, args.batch_size),
+        "use_profile": not args.no_profile,
+        "progress_json": (base / args.progress_json).resolve() if args.progress_json else None,
+        "report": args.report,
+        "skip_silence": args.skip_silence,
+        "align": args.align,
+        "language_probe": not args.no_language_probe,
+        "language_threshold": args.language_threshold,
+        "language_source": args.language_source or None,
+        "store": not args.no_store,
+        "diarize": args.diarize,
+        "min_speakers": args.min_speakers,
+        "max_speakers": args.max_speakers,
+        "formats": tuple(dict.fromkeys(f.strip().lower() for f in args.formats.split(",") if f.strip())),
+    }
+
+
+def _print_usage() -> None:
+    print(f"{C_BLD}Verwendung:{C_OFF} transcribe.py <Eingabedatei> <Ausgabeordner> [Modell] [Sprache] [Fortschrittsdatei] [Optionen]")
+    print(f"\n{C_DIM}Modelle:{C_OFF} tiny, base, small (Standard), medium, large, large-v2, large-v3")
+    print(f"{C_DIM}Sprachen:{C_OFF} en, de, fr, es, it, pt, ru, ja, zh oder Auto (Standard)")
+    print(f"{C_DIM}Batch:{C_OFF} transcribe.py --batch <Ausgabeordner> <Datei|Ordner|Manifest> … [--model M] [--language L] [--workers N --cores C]")
+    print(f"{C_DIM}Cache:{C_OFF} transcribe.py --cache info|clear|evict")
+    print(f"{C_DIM}Prüfen:{C_OFF} transcribe.py --check [--deep]")
+    print(f"{C_DIM}Autotune:{C_OFF} transcribe.py --autotune [--model M] [--clip DATEI] [--quick] [--show]")
+    print(f"{C_DIM}Optionen:{C_OFF} transcribe.py --help")
+
+
+def parse_arguments(
+    argv: Optional[List[str]] = None,
+    cwd: Optional[Path] = None,
+) -> tuple[TranscriptionConfig, Optional[str]]:
+    """
+    Parse command line arguments. Returns (config, progress_file_path or None).
+    cwd: Basis für relative Pfade (Daemon: Arbeitsverzeichnis des Clients).
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if len(argv) < 2 and not any(a in ("-h", "--help") for a in argv):
+        _print_usage()
+        sys.exit(1)
+
+    parser = argparse.ArgumentParser(prog="transcribe.py", description="Audio/Video mit WhisperX transkribieren.")
+    parser.add_argument("input", help="Eingabedatei")
+    parser.add_argument("output", help="Ausgabeordner")
+    parser.add_argument("model", nargs="?", default="small", help="Modell (Standard: small)")
+    parser.add_argument("language", nargs="?", default="", help="Sprache (leer = automatische Erkennung)")
+    parser.add_argument("progress_file", nargs="?", default=None,
+                        help="Fortschrittsdatei (für start.sh), FIFO oder unix:<Pfad> (Datagramm-Socket, JSON)")
+    _add_pipeline_options(parser)
+    args = parser.parse_intermixed_args(argv)
+
+    base = cwd or Path.cwd()
+    progress_file = args.progress_file
+    if progress_file and not progress_file.startswith(PROGRESS_SOCKET_PREFIX):
+        progress_file = str(base / progress_file)
+
+    # device/compute_type bleiben "auto" – erkannt wird erst beim Laden des Modells (torch-Import)
+    config = TranscriptionConfig(
+        file_path=(base / args.input).resolve(),
+        output_path=(base / args.output).resolve(),
+        model_size=args.model or "small",
+        language=args.language.strip() or None,
+        **_pipeline_config_kwargs(args, base),
+    )
+    return config, progress_file
+
+
+def parse_batch_arguments(argv: List[str]) -> tuple[List[TranscriptionConfig], Optional[str], int]:
+    """Parse arguments for --batch mode. Returns (one config per input file, progress_file_path or None, workers)."""
+    parser = argparse.ArgumentParser(
+        prog="transcribe.py --batch",
+        description="Mehrere Dateien mit einem geladenen Modell transkribieren.",
+    )
+    parser.add_argument("output", help="Ausgabeordner")
+    parser.add_argument("inputs", nargs="+", help="Mediendateien, Ordner (z. B. medien/) oder Manifest-Dateien (ein Pfad pro Zeile)")
+    parser.add_argument("-m", "--model", default="small", help="Modell (Standard: small)")
+    parser.add_argument("-l", "--language", default="", help="Sprache (leer = automatische Erkennung)")
+    parser.add_argument("--progress-file", default=None, help="Fortschrittsdatei (wie 5. Argument im Einzelmodus)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Parallele Worker-Prozesse mit je eigenem Modell (Standard: 1 = sequentiell)")
+    parser.add_argument("--cores", type=int, default=0,
+                        help="Kern-Budget, das auf die Worker verteilt wird (Threads = Kerne / Worker; Standard: alle)")
+    _add_pipeline_options(parser)
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers muss >= 1 sein")
+    if args.workers > 1 or args.cores:
+        # Kern-Budget aufteilen, sonst überbuchen torch/CTranslate2 die Maschine (jeder nimmt alle Kerne)
+        cores = args.cores or os.cpu_count() or 1
+        args.threads = max(1, cores // args.workers)
+
+    files = collect_batch_inputs([Path(p).expanduser() for p in args.inputs])
+    if not files:
+        parser.error("keine Mediendateien gefunden")
+
+    output_path = Path(args.output).resolve()
+    configs = [
+        TranscriptionConfig(
+            file_path=file_path,
+            output_path=output_path,
+            model_size=args.model,
+            language=args.language.strip() or None,
+            **_pipeline_config_kwargs(args),
+        )
+        for file_path in files
+    ]
+    return configs, args.progress_file, min(args.workers, len(configs))
+
+
+def _redirect_console_to_log() -> Any:
+    """Mit Fortschrittsdatei: stdout/stderr ins Log umleiten (Spinner in start.sh bleibt sauber)."""
+    log_dir = Path(__file__).resolve().parent / "logs"
+    log_dir.mkdir(exist_ok=True)
+    log_stream = open(log_dir / "whisper.log", "a", encoding="utf-8")
+    sys.stdout = sys.stderr = log_stream
+    return log_stream
+
+
+def _restore_console(log_stream: Any) -> None:
+    if log_stream is not None:
+        try:
+            log_stream.close()
+        except OSError:
+            pass
+        sys.stdout = sys.__stdout__
+        sys.stderr = sys.__stderr__
+
+
+def main_batch(argv: List[str]) -> None:
+    """Entry point for --batch"""
+    configs, progress_file, workers = parse_batch_arguments(argv)
+    logger = setup_logging()
+    logger.info("="*60)
+    logger.info(f"Video Whisper - Batch ({len(configs)} Dateien)")
+    logger.info("="*60)
+
+    log_stream = _redirect_console_to_log() if progress_file else None
+    try:
+        if workers > 1:
+            failed = run_batch_parallel(configs, logger, workers, progress_file)
+        else:
+            failed = run_batch(configs, logger, progress_file)
+    except KeyboardInterrupt:
+        logger.info("\n⚠ Batch cancelled by user")
+        if not progress_file:
+            print(f"\n{C_YEL}⚠ Abgebrochen durch Benutzer.{C_OFF}\n")
+        sys.exit(130)
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        logger.debug(traceback.format_exc())
+        if not progress_file:
+            print(f"\n{C_RED}✗ Unerwarteter Fehler: {e}{C_OFF}\n")
+        sys.exit(1)
+    finally:
+        _restore_console(log_stream)
+    sys.exit(1 if failed else 0)
+
+
+def main_cache(argv: List[str]) -> None:
+    """Entry point for --cache: Cache anzeigen, leeren oder auf Maximalgröße kürzen"""
+    parser = argparse.ArgumentParser(prog="transcribe.py --cache", description="Transkriptions-Cache verwalten.")
+    parser.add_argument("action", choices=["info", "clear", "evict"], nargs="?", default="info")
+    args = parser.parse_args(argv)
+    cache = TranscriptCache()
+    if args.action == "clear":
+        print(f"{C_GRN}✓{C_OFF} {cache.clear()} Einträge gelöscht ({cache.directory})")
+        diarization = DiarizationCache()
+        print(f"{C_GRN}✓{C_OFF} {diarization.clear()} Diarisierungen gelöscht ({diarization.directory})")
+    elif args.action == "evict":
+        print(f"{C_GRN}✓{C_OFF} {cache.evict()} Einträge entfernt (Limit {cache.max_bytes / 1024 / 1024:.0f} MB)")
+    else:
+        info = cache.info()
+        print(f"{C_BLD}Cache:{C_OFF} {info['directory']}")
+        print(f"  Einträge: {info['entries']}")
+        print(f"  Größe:    {info['bytes'] / 1024 / 1024:.1f} MB von {info['max_bytes'] / 1024 / 1024:.0f} MB")
+        for entry in reversed(cache.entries()[-10:]):
+            try:
+                meta = json.loads(entry.read_text(encoding="utf-8")).get("meta", {})
+            except (OSError, ValueError):
+                meta = {}
+            print(f"  {C_DIM}{entry.stem[:12]}{C_OFF}  {meta.get('model_size', '?'):<9} {meta.get('language') or 'auto':<5} "
+                  f"{Path(meta.get('source', '?')).name}")
+
+
+def main_autotune(argv: List[str]) -> None:
+    """--autotune: Kalibrierung laufen lassen und als Profil speichern (spätere Läufe laden es automatisch)."""
+    parser = argparse.ArgumentParser(
+        prog="transcribe.py --autotune",
+        description="batch_size, compute_type und Threads für diesen Rechner bestimmen.",
+    )
+    parser.add_argument("-m", "--model", default="small", help="Modell (Standard: small)")
+    parser.add_argument("--clip", default=None, help="Eigene Aufnahme statt des synthetischen Clips (repräsentativer)")
+    parser.add_argument("--quick", action="store_true", help="Weniger Kandidaten (schneller, ungenauer)")
+    parser.add_argument("--show", action="store_true", help="Gespeichertes Profil anzeigen, nichts messen")
+    args = parser.parse_args(argv)
+    if args.model not in TranscriptionConfig.SUPPORTED_MODELS:
+        parser.error(f"unbekanntes Modell: {args.model}")
+
+    if args.show:
+        data = _read_profiles()
+        if not data:
+            print(f"Kein Profil für diesen Rechner ({PROFILE_FILE})")
+            sys.exit(1)
+        for key, profile in data.get("profiles", {}).items():
+            print(f"{key}: compute_type={profile['compute_type']} batch_size={profile['batch_size']} "
+                  f"threads={profile['threads'] or '-'} ({profile['audio_per_wall']:.2f} s Audio/s, {profile['tuned_at']})")
+        sys.exit(0)
+
+    logger = setup_logging()
+    _silence_console_logging()
+    clip = Path(args.clip).expanduser().resolve() if args.clip else None
+    if clip is not None and not clip.is_file():
+        parser.error(f"Clip nicht gefunden: {clip}")
+    try:
+        profile = autotune(args.model, logger, clip=clip, quick=args.quick)
+    except Exception as e:
+        logger.error(f"Autotune fehlgeschlagen: {e}")
+        logger.debug(traceback.format_exc())
+        print(f"{C_RED}✗ Autotune fehlgeschlagen: {e}{C_OFF}", file=sys.stderr)
+        sys.exit(1)
+    logger.info(f"Autotune-Profil gespeichert: {profile['compute_type']}, batch_size={profile['batch_size']}, threads={profile['threads']}")
+    print(f"\n{C_GRN}✓{C_OFF} Profil gespeichert ({PROFILE_FILE.name}): compute_type={profile['compute_type']}, "
+          f"batch_size={profile['batch_size']}, threads={profile['threads'] or '-'}")
+
+
+def main_check(argv: List[str]) -> None:
+    """
+    --check: Installation prüfen, ohne torch/whisperx zu importieren (Millisekunden statt Sekunden).
+    Ersetzt in start.sh/install.sh den separaten "python -c 'import whisperx'"-Aufruf.
+    --deep importiert zusätzlich torch und whisperx (findet auch kaputte Binär-Abhängigkeiten).
+    Exit 0 = einsatzbereit, 1 = Paket fehlt bzw. Import fehlgeschlagen.
+    """
+    parser = argparse.ArgumentParser(prog="transcribe.py --check", description="Installation prüfen.")
+    parser.add_argument("--deep", action="store_true", help="torch/whisperx wirklich importieren (langsam)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Nichts ausgeben, nur Exit-Code")
+    args = parser.parse_args(argv)
+
+    problems: List[str] = []
+    lines: List[str] = []
+    for name in ("whisperx", "torch"):
+        if importlib.util.find_spec(name) is None:
+            problems.append(f"{name} fehlt in dieser Python-Umgebung")
+        else:
+            lines.append(f"{name} {_package_version(name) or '?'}")
+    ffmpeg = shutil.which("ffmpeg")
+    lines.append(f"ffmpeg {ffmpeg}" if ffmpeg else "ffmpeg nicht gefunden (Warnung: wird zum Decodieren gebraucht)")
+    if args.deep and not problems:
+        try:
+            _import_ml()
+            lines.append("Import torch/whisperx: OK")
+        except Exception as e:
+            problems.append(f"Import fehlgeschlagen: {e}")
+
+    if not args.quiet:
+        for line in lines:
+            print(f"  {C_DIM}{line}{C_OFF}")
+        for problem in problems:
+            print(f"  {C_RED}✗ {problem}{C_OFF}", file=sys.stderr)
+        if not problems:
+            print(f"  {C_GRN}✓{C_OFF} Installation einsatzbereit")
+    sys.exit(1 if problems else 0)
+
+
+def main() -> None:
+    """Main entry point"""
+    if len(sys.argv) > 1 and sys.argv[1] == "--check":
+        main_check(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--autotune":
+        main_autotune(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        main_batch(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--cache":
+        main_cache(sys.argv[2:])
+        return
+
+    config, progress_file = parse_arguments()
+    logger = setup_logging()
+    logger.info("="*60)
+    logger.info("Video Whisper - Transcription Tool")
+    logger.info("="*60)
+    
+    log_stream = _redirect_console_to_log() if progress_file else None
+    
+    try:
+        run_transcription(config, logger, progress_file)
+    except KeyboardInterrupt:
+        logger.info("\n⚠ Transcription cancelled by user")
+        if not progress_file:
+            print(f"\n{C_YEL}⚠ Abgebrochen durch Benutzer.{C_OFF}\n")
+        sys.exit(130)
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        logger.debug(traceback.format_exc())
+        if not progress_file:
+            print(f"\n{C_RED}✗ Unerwarteter Fehler: {e}{C_OFF}\n")
+        sys.exit(1)
+    finally:
+        _restore_console(log_stream)
 
 
 if __name__ == "__main__":